@@ -0,0 +1,103 @@
+"""
+bcrypt cost configuration and offline calibration.
+
+passlib's default work factor is the same on a laptop and on a small
+cloud VM, so login either burns more CPU than intended or protects less
+than it could. The cost is pinned per deployment with BCRYPT_ROUNDS and
+becomes the default for new hashes and the minimum accepted cost: hashes
+made below it are reported as stale and re-hashed on the user's next
+successful login, while hashes at or above it are left alone.
+
+The cost is deliberately not calibrated at API startup - workers timing
+themselves on a busy host disagree, and each would re-hash the others'
+hashes. Run `python -m app.core.bcrypt_cost --target-ms 250` on a
+representative host and set the BCRYPT_ROUNDS it prints.
+"""
+import argparse
+import os
+import time
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+
+from app.core.security import pwd_context
+
+load_dotenv()
+
+BCRYPT_ROUNDS = os.getenv("BCRYPT_ROUNDS")
+# Calibration never goes below this, however slow the host
+BCRYPT_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", "10"))
+BCRYPT_MAX_ROUNDS = 16
+
+_CALIBRATION_SECRET = "calibration-password"
+
+
+def measure_hash_ms(rounds: int, samples: int = 3) -> float:
+    """Fastest of `samples` bcrypt hashes at the given cost, in milliseconds."""
+    handler = pwd_context.handler("bcrypt").using(rounds=rounds)
+    best = float("inf")
+    for _ in range(samples):
+        started = time.perf_counter()
+        handler.hash(_CALIBRATION_SECRET)
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best
+
+
+def calibrate_rounds(
+    target_ms: float,
+    min_rounds: int = BCRYPT_MIN_ROUNDS,
+    max_rounds: int = BCRYPT_MAX_ROUNDS,
+    measure: Callable[[int], float] = measure_hash_ms
+) -> int:
+    """
+    Pick the highest cost whose hash time stays within target_ms.
+
+    Only min_rounds is timed; each extra round doubles bcrypt's work, so
+    higher costs are extrapolated rather than measured.
+    """
+    rounds = min_rounds
+    estimate = measure(rounds)
+    while rounds < max_rounds and estimate * 2 <= target_ms:
+        rounds += 1
+        estimate *= 2
+    return rounds
+
+
+def apply_rounds(rounds: int) -> None:
+    """Make `rounds` the cost for new hashes and the lowest non-stale cost."""
+    pwd_context.update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+    )
+
+
+def configure_password_hashing() -> Optional[int]:
+    """
+    Apply BCRYPT_ROUNDS.
+
+    Returns:
+        The cost in effect, or None if it is not set (passlib default,
+        no re-hashing)
+    """
+    if not BCRYPT_ROUNDS:
+        return None
+
+    rounds = int(BCRYPT_ROUNDS)
+    apply_rounds(rounds)
+    return rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calibrate the bcrypt cost for this host")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--min-rounds", type=int, default=BCRYPT_MIN_ROUNDS)
+    args = parser.parse_args()
+
+    for rounds in range(args.min_rounds, args.min_rounds + 3):
+        print(f"rounds={rounds:<3} {measure_hash_ms(rounds):8.1f} ms")
+    rounds = calibrate_rounds(args.target_ms, min_rounds=args.min_rounds)
+    print(f"\nBCRYPT_ROUNDS={rounds}  (target {args.target_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
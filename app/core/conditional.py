@@ -0,0 +1,47 @@
+"""
+Conditional GET for user-scoped list endpoints.
+
+`list_cache_headers` is a route dependency that answers a matching
+If-None-Match with 304 Not Modified after a single primary-key lookup of
+the user's change sequence - before the route touches any item table.
+Otherwise it returns the ETag headers for the fresh response.
+"""
+from typing import Dict
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.services.sync import current_change_seq, etag_matches, list_etag
+
+# Clients may store the list but must revalidate; shared caches must not store it
+LIST_CACHE_CONTROL = "private, no-cache"
+
+
+def list_cache_headers(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+) -> Dict[str, str]:
+    """
+    Return ETag/Cache-Control headers for the current user's lists.
+
+    The headers are also set on the route's response; routes that return
+    a Response object directly must pass them along themselves.
+
+    Raises:
+        HTTPException: 304 if the client's cached copy is current
+    """
+    # Read the version before the data: a concurrent write can then only
+    # make the tag older than the body, which costs a refetch, never a stale 304
+    etag = list_etag(user_id, current_change_seq(db, user_id))
+    headers = {"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return headers
@@ -0,0 +1,248 @@
+"""
+Idempotency-Key support for non-idempotent POST endpoints.
+
+A client that times out and retries a POST cannot tell whether the first
+attempt went through. Sending the same `Idempotency-Key` header on every
+attempt makes the retry safe:
+
+- while the first attempt is still running, duplicates wait for it
+  (single-flight) instead of starting the work again
+- once it has succeeded, duplicates get its stored response replayed
+  for IDEMPOTENCY_TTL_SECONDS, marked with `Idempotent-Replayed: true`
+
+Keys are scoped to the authenticated user and the endpoint, and bound to
+a digest of the request body: reusing a key for a different request is
+rejected with 422. Only successful (2xx) responses are stored - a failed
+attempt did no lasting work, so its retry runs again.
+
+State is per process, like the other caches here; with several workers a
+retry that lands on a different worker is not deduplicated.
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from app.core.metrics import ROUTE_TEMPLATE_SCOPE_KEY
+from app.core.security import decode_token
+
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+
+# (user id, method, path, client key)
+StoreKey = Tuple[str, str, str, str]
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """A completed response, kept for replay."""
+    fingerprint: bytes
+    status: int
+    headers: Tuple[Tuple[bytes, bytes], ...]
+    body: bytes
+
+
+class IdempotencyStore:
+    """
+    Bounded LRU store of completed responses with a per-entry TTL.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[StoreKey, Tuple[float, StoredResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: StoreKey, now: Optional[float] = None) -> Optional[StoredResponse]:
+        """Return the stored response if present and fresh, else None."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if now >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def put(self, key: StoreKey, response: StoredResponse, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Singleton instance
+idempotency_store = IdempotencyStore(
+    ttl_seconds=IDEMPOTENCY_TTL_SECONDS,
+    max_entries=IDEMPOTENCY_MAX_ENTRIES
+)
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware applying Idempotency-Key semantics to `paths`.
+
+    Only POST requests to the listed paths that carry both the header and
+    a valid bearer token are affected; everything else passes straight
+    through. The request body is buffered to fingerprint it. Register it
+    inside MetricsMiddleware so that replays are measured too.
+    """
+
+    def __init__(self, app, paths: Iterable[str], store: Optional[IdempotencyStore] = None):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.store = store or idempotency_store
+        # Requests currently running: key -> (fingerprint, done event)
+        self._in_flight: Dict[StoreKey, Tuple[bytes, asyncio.Event]] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        # Paths are exact, so a request answered here (replayed or rejected)
+        # is still labelled with its route in the request metrics
+        scope[ROUTE_TEMPLATE_SCOPE_KEY] = scope["path"]
+
+        headers = dict(scope["headers"])
+        client_key = headers.get(IDEMPOTENCY_HEADER)
+        user_id = _bearer_user_id(headers.get(b"authorization"))
+        if client_key is None or user_id is None:
+            # No key, or unauthenticated (the route answers 401 itself)
+            await self.app(scope, receive, send)
+            return
+
+        if not client_key or len(client_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            await _reject(scope, receive, send, 400, "Invalid Idempotency-Key header")
+            return
+
+        body = await _read_body(receive)
+        fingerprint = _fingerprint(headers.get(b"content-type", b""), body)
+        key = (user_id, scope["method"], scope["path"], client_key.decode("latin-1"))
+
+        while True:
+            stored = self.store.get(key)
+            if stored is not None:
+                if stored.fingerprint != fingerprint:
+                    await _reject(scope, receive, send, 422, "Idempotency-Key was used for a different request")
+                    return
+                await _replay(stored, send)
+                return
+
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                break
+            if in_flight[0] != fingerprint:
+                await _reject(scope, receive, send, 422, "Idempotency-Key was used for a different request")
+                return
+            # Wait for the first attempt, then replay it (or run, if it failed)
+            await in_flight[1].wait()
+
+        done = asyncio.Event()
+        self._in_flight[key] = (fingerprint, done)
+        try:
+            await self._run_and_store(scope, receive, send, body, key, fingerprint)
+        finally:
+            del self._in_flight[key]
+            done.set()
+
+    async def _run_and_store(
+        self, scope, receive, send, body: bytes, key: StoreKey, fingerprint: bytes
+    ) -> None:
+        start: Optional[dict] = None
+        chunks: List[bytes] = []
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # The body was consumed up front; only a disconnect can follow
+            return await receive()
+
+        async def capture_send(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False) and 200 <= start["status"] < 300:
+                    self.store.put(key, StoredResponse(
+                        fingerprint=fingerprint,
+                        status=start["status"],
+                        headers=tuple(start.get("headers", ())),
+                        body=b"".join(chunks),
+                    ))
+            await send(message)
+
+        await self.app(scope, replay_receive, capture_send)
+
+
+def _bearer_user_id(authorization: Optional[bytes]) -> Optional[str]:
+    if not authorization:
+        return None
+    scheme, _, token = authorization.decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    user_id = decode_token(token.strip())
+    return str(user_id) if user_id else None
+
+
+def _fingerprint(content_type: bytes, body: bytes) -> bytes:
+    """Digest of the request, ignoring the multipart boundary."""
+    # Clients pick a fresh random boundary per attempt, so a retried
+    # upload is byte-for-byte different even when its parts are not
+    media_type, _, params = content_type.partition(b";")
+    if media_type.strip().lower() == b"multipart/form-data":
+        for param in params.split(b";"):
+            name, _, value = param.strip().partition(b"=")
+            if name.lower() == b"boundary" and value:
+                body = body.replace(value.strip(b'"'), b"")
+    return hashlib.blake2b(media_type.strip().lower() + b"\n" + body, digest_size=16).digest()
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def _replay(stored: StoredResponse, send) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": stored.status,
+        "headers": list(stored.headers) + [REPLAYED_HEADER],
+    })
+    await send({"type": "http.response.body", "body": stored.body, "more_body": False})
+
+
+async def _reject(scope, receive, send, status_code: int, detail: str) -> None:
+    await JSONResponse({"detail": detail}, status_code=status_code)(scope, receive, send)
@@ -0,0 +1,239 @@
+"""
+In-process request, database and vision-call metrics.
+
+Records, without any external collector:
+- request latency per route template, method and status
+- queries and database time per request
+- vision API call durations by outcome
+
+and renders them in the Prometheus text exposition format for /metrics.
+
+Per-request query counts work by putting a mutable `RequestStats` in a
+context variable at the start of each request. Sync routes run in a
+worker thread with a copy of the context, but the copy refers to the
+same object, so the SQLAlchemy cursor hooks can add to it from there.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+VISION_BUCKETS = (0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0, 30.0, 60.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Scope key set by middleware that answers a request without routing it
+# (e.g. an idempotent replay), naming the route template it stands in for
+ROUTE_TEMPLATE_SCOPE_KEY = "metrics.route_template"
+
+
+@dataclass
+class RequestStats:
+    """Database work done while serving one request."""
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Stats of the request being served, or None outside a request."""
+    return _request_stats.get()
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label tuple."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[0]) if series else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+
+        for labels, counts, total in series:
+            label_text = ",".join(
+                f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels)
+            )
+            prefix = label_text + "," if label_text else ""
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+            suffix = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return "\n".join(lines)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """The application's histograms."""
+
+    def __init__(self):
+        self.request_duration = Histogram(
+            "http_request_duration_seconds",
+            "Time to serve a request, including streaming the body.",
+            ("method", "route", "status"),
+            LATENCY_BUCKETS,
+        )
+        self.request_queries = Histogram(
+            "http_request_db_queries",
+            "Database queries issued per request.",
+            ("method", "route"),
+            QUERY_COUNT_BUCKETS,
+        )
+        self.request_db_time = Histogram(
+            "http_request_db_seconds",
+            "Time spent executing database queries per request.",
+            ("method", "route"),
+            LATENCY_BUCKETS,
+        )
+        self.vision_duration = Histogram(
+            "vision_call_duration_seconds",
+            "Duration of vision API calls.",
+            ("outcome",),
+            VISION_BUCKETS,
+        )
+
+    @property
+    def histograms(self) -> Tuple[Histogram, ...]:
+        return (self.request_duration, self.request_queries, self.request_db_time, self.vision_duration)
+
+    def reset(self) -> None:
+        for histogram in self.histograms:
+            histogram.clear()
+
+    def render(self) -> str:
+        return "\n".join(histogram.render() for histogram in self.histograms) + "\n"
+
+    @contextmanager
+    def time_vision_call(self) -> Iterator[None]:
+        """Record the duration of the enclosed vision call, labelled ok/error."""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        finally:
+            self.vision_duration.observe(time.perf_counter() - started, outcome)
+
+
+# Singleton instance
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing each HTTP request and its database work.
+
+    Pure ASGI rather than BaseHTTPMiddleware so that streamed responses
+    are timed until their last chunk. Requests are labelled with the
+    route template (e.g. /api/inventory/{item_id}), never the raw path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_stats.reset(token)
+            route_path = _route_template(scope)
+            method = scope.get("method", "")
+            metrics.request_duration.observe(
+                time.perf_counter() - started, method, route_path, str(status_code)
+            )
+            metrics.request_queries.observe(stats.queries, method, route_path)
+            metrics.request_db_time.observe(stats.db_seconds, method, route_path)
+
+
+def _route_template(scope) -> str:
+    """The matched route's full path template, or "unmatched"."""
+    # The FastAPI pinned in requirements.txt keeps an included router's
+    # route unprefixed in scope["route"] and records the prefixed one it
+    # served under scope["fastapi"]; re-check this when upgrading FastAPI
+    effective = (scope.get("fastapi") or {}).get("effective_route_context")
+    if effective is not None:
+        return effective.path_format
+    return (
+        getattr(scope.get("route"), "path_format", None)
+        or scope.get(ROUTE_TEMPLATE_SCOPE_KEY)
+        or "unmatched"
+    )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started_at"].pop()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_query_timer(exception_context):
+    # after_cursor_execute does not fire for a failed statement
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started_at"):
+        connection.info["query_started_at"].pop()
@@ -0,0 +1,88 @@
+"""
+Dedicated, bounded executor for password hashing.
+
+bcrypt takes tens to hundreds of milliseconds per call. Running it in
+Starlette's shared threadpool lets a burst of logins starve every other
+sync route. Hashing therefore runs on its own small thread pool (the
+bcrypt extension releases the GIL, so threads give real parallelism),
+and requests are rejected once too many are queued instead of piling up.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from dotenv import load_dotenv
+
+from app.core.security import hash_password, verify_and_update_password, verify_password
+
+load_dotenv()
+
+# Threads that may hash concurrently, and how many calls may be running or queued
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "16"))
+
+T = TypeVar("T")
+
+
+class HashingOverloadedError(RuntimeError):
+    """Raised when the hashing queue is full."""
+
+
+class PasswordHashingExecutor:
+    """Thread pool with a hard limit on running + queued hashing calls."""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hash"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run a hashing function on the pool and await its result.
+
+        Raises:
+            HashingOverloadedError: If max_pending calls are already in flight
+        """
+        if not self._slots.acquire(blocking=False):
+            raise HashingOverloadedError("Password hashing queue is full")
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        # Release on completion, even if the awaiting request was cancelled
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+
+# Singleton instance
+password_hashing_executor = PasswordHashingExecutor(
+    max_workers=PASSWORD_HASH_WORKERS,
+    max_pending=PASSWORD_HASH_MAX_PENDING
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the dedicated hashing pool."""
+    return await password_hashing_executor.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the dedicated hashing pool."""
+    return await password_hashing_executor.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password, re-hashing a stale hash, on the dedicated hashing pool."""
+    return await password_hashing_executor.run(
+        verify_and_update_password, plain_password, hashed_password
+    )
@@ -0,0 +1,134 @@
+"""
+Refresh-token issuing, rotation and revocation.
+
+Login returns a short-lived access token plus a refresh token. Each
+refresh consumes the presented token and issues a new pair in the same
+family. Reusing a consumed token revokes the whole family, which signs
+out both the attacker and the victim and forces a fresh login.
+"""
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.core.revocation import revocation_filter
+from app.core.security import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    REFRESH_TOKEN_EXPIRE_DAYS,
+    TokenClaims,
+    create_access_token,
+)
+from app.core.user_cache import get_user_record
+from app.models.auth_token import RefreshToken, RevokedToken
+from app.schemas.auth import Token
+
+
+class RefreshTokenError(Exception):
+    """Raised when a refresh token is unknown, expired, reused or revoked."""
+
+
+def _hash_token(raw_token: str) -> str:
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+
+def issue_token_pair(db: Session, user_id: UUID, family_id: Optional[UUID] = None) -> Token:
+    """
+    Create an access token and a new refresh token, and commit.
+
+    A new family is started unless one is given (rotation).
+    """
+    family_id = family_id or uuid4()
+    raw_refresh_token = secrets.token_urlsafe(32)
+
+    db.add(RefreshToken(
+        user_id=user_id,
+        family_id=family_id,
+        token_hash=_hash_token(raw_refresh_token),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    db.commit()
+
+    return Token(
+        access_token=create_access_token(user_id=user_id, family_id=family_id),
+        refresh_token=raw_refresh_token,
+        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+
+def rotate_refresh_token(db: Session, raw_refresh_token: str) -> Token:
+    """
+    Exchange a refresh token for a new token pair.
+
+    Raises:
+        RefreshTokenError: If the token is invalid. A reused token also
+            revokes its whole family before raising.
+    """
+    token = db.query(RefreshToken).filter(
+        RefreshToken.token_hash == _hash_token(raw_refresh_token)
+    ).first()
+    if token is None:
+        raise RefreshTokenError("Invalid refresh token")
+
+    now = datetime.now(timezone.utc)
+    if token.revoked_at is not None or _as_utc(token.expires_at) <= now:
+        raise RefreshTokenError("Refresh token expired or revoked")
+
+    # Conditional update: of two concurrent refreshes only one can win
+    consumed = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == token.id, RefreshToken.used_at.is_(None))
+        .values(used_at=now)
+    ).rowcount
+    if not consumed:
+        revoke_family(db, token.family_id)
+        raise RefreshTokenError("Refresh token reuse detected")
+
+    user = get_user_record(db, token.user_id)
+    if user is None or not user.is_active:
+        db.rollback()
+        raise RefreshTokenError("User account is disabled")
+
+    return issue_token_pair(db, token.user_id, family_id=token.family_id)
+
+
+def revoke_family(db: Session, family_id: UUID) -> None:
+    """
+    Revoke every refresh token in a family and the access tokens issued
+    from it, and commit.
+    """
+    now = datetime.now(timezone.utc)
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    )
+    # Access tokens from this family are all expired after one lifetime
+    db.execute(insert(RevokedToken).values(
+        token_key=str(family_id),
+        expires_at=now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+    ))
+    db.commit()
+    revocation_filter.add([str(family_id)])
+
+
+def revoke_access_token(db: Session, claims: TokenClaims) -> None:
+    """Revoke a single access token (and its family, if any), and commit."""
+    if claims.token_id:
+        db.execute(insert(RevokedToken).values(
+            token_key=claims.token_id,
+            expires_at=datetime.fromtimestamp(claims.expires_at, timezone.utc),
+        ))
+        db.commit()
+        revocation_filter.add([claims.token_id])
+
+    if claims.family_id:
+        revoke_family(db, UUID(claims.family_id))
+
+
+def _as_utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; treat them as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
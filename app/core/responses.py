@@ -0,0 +1,34 @@
+"""
+Fast JSON responses for hot list endpoints.
+
+Serializes with orjson, which handles UUID, date and datetime natively,
+and accepts SQLAlchemy rows as-is so column-projected queries never
+build ORM objects or Pydantic models.
+"""
+from decimal import Decimal
+
+import orjson
+from fastapi.responses import Response
+from sqlalchemy.engine import Row
+
+
+def _default(obj):
+    """Fallback for types orjson does not know."""
+    if isinstance(obj, Row):
+        return tuple(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dump_json(content) -> bytes:
+    """Serialize to JSON bytes with orjson."""
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson."""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dump_json(content)
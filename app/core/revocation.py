@@ -0,0 +1,184 @@
+"""
+In-process revocation filter for access tokens.
+
+Revoked token ids (jti) and refresh-token family ids live in the
+`revoked_tokens` table. Querying it on every request would add a DB
+round trip to every authenticated call. Instead each process keeps a
+Bloom filter of revoked ids. It is topped up from the table every
+REVOCATION_SYNC_SECONDS and rebuilt every REVOCATION_REBUILD_SECONDS,
+which drops expired entries.
+
+A Bloom filter has no false negatives, so most tokens are cleared
+without touching the database. Only positives, meaning real revocations
+or rare false positives, are confirmed with a query. Revocations made
+in this process are added to the filter immediately. Other processes
+see them within one sync interval.
+"""
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.auth_token import RevokedToken
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "10"))
+REVOCATION_REBUILD_SECONDS = float(os.getenv("REVOCATION_REBUILD_SECONDS", "3600"))
+REVOCATION_FILTER_CAPACITY = int(os.getenv("REVOCATION_FILTER_CAPACITY", "100000"))
+REVOCATION_FALSE_POSITIVE_RATE = 0.01
+
+# Incremental syncs re-read this far back so slow commits are not missed
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys (double hashing on blake2b)."""
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(64, int(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationFilter:
+    """Bloom filter of revoked token keys, kept in sync with the database."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        sync_seconds: float,
+        rebuild_seconds: float,
+        capacity: int
+    ):
+        self.session_factory = session_factory
+        self.sync_seconds = sync_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything; the next check triggers a full rebuild."""
+        self._bloom = BloomFilter(self.capacity, REVOCATION_FALSE_POSITIVE_RATE)
+        self._synced_through: Optional[datetime] = None
+        self._last_sync = float("-inf")
+        self._last_rebuild = float("-inf")
+
+    def add(self, keys: Iterable[str]) -> None:
+        """Add keys revoked by this process (after they were committed)."""
+        for key in keys:
+            self._bloom.add(key)
+
+    def is_revoked(self, keys: Iterable[str]) -> bool:
+        """True if any of the keys has been revoked."""
+        keys = [key for key in keys if key]
+        if not keys:
+            return False
+
+        self._maybe_sync()
+        candidates = [key for key in keys if key in self._bloom]
+        if not candidates:
+            return False
+
+        # Positive: confirm against the database to rule out a false positive
+        db = self.session_factory()
+        try:
+            return db.execute(
+                select(RevokedToken.id)
+                .where(
+                    RevokedToken.token_key.in_(candidates),
+                    RevokedToken.expires_at > datetime.now(timezone.utc)
+                )
+                .limit(1)
+            ).first() is not None
+        finally:
+            db.close()
+
+    def _maybe_sync(self) -> None:
+        now = time.monotonic()
+        if now - self._last_sync < self.sync_seconds:
+            return
+        if not self._lock.acquire(blocking=False):
+            return  # Another request is already syncing
+
+        try:
+            if now - self._last_rebuild >= self.rebuild_seconds:
+                self._rebuild()
+                self._last_rebuild = now
+            else:
+                self._load_recent()
+        except SQLAlchemyError:
+            # Keep serving the last known state; retry on the next interval
+            logger.warning("Failed to sync token revocations", exc_info=True)
+        finally:
+            self._last_sync = now
+            self._lock.release()
+
+    def _rebuild(self) -> None:
+        db = self.session_factory()
+        try:
+            keys = db.execute(
+                select(RevokedToken.token_key)
+                .where(RevokedToken.expires_at > datetime.now(timezone.utc))
+            ).scalars().all()
+            synced_through = db.execute(select(func.max(RevokedToken.revoked_at))).scalar()
+        finally:
+            db.close()
+
+        bloom = BloomFilter(max(self.capacity, 2 * len(keys)), REVOCATION_FALSE_POSITIVE_RATE)
+        for key in keys:
+            bloom.add(key)
+        self._bloom = bloom
+        self._synced_through = synced_through
+
+    def _load_recent(self) -> None:
+        query = select(RevokedToken.token_key, RevokedToken.revoked_at)
+        if self._synced_through is not None:
+            query = query.where(RevokedToken.revoked_at >= self._synced_through - SYNC_OVERLAP)
+
+        db = self.session_factory()
+        try:
+            rows = db.execute(query).all()
+        finally:
+            db.close()
+
+        for key, revoked_at in rows:
+            self._bloom.add(key)
+            if self._synced_through is None or revoked_at > self._synced_through:
+                self._synced_through = revoked_at
+
+
+# Singleton instance
+revocation_filter = RevocationFilter(
+    session_factory=SessionLocal,
+    sync_seconds=REVOCATION_SYNC_SECONDS,
+    rebuild_seconds=REVOCATION_REBUILD_SECONDS,
+    capacity=REVOCATION_FILTER_CAPACITY
+)
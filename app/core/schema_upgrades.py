@@ -0,0 +1,67 @@
+"""
+In-place upgrades for tables created by an earlier release.
+
+`Base.metadata.create_all` creates missing tables but never alters an
+existing one, so a column or index added to a table that already shipped
+would be missing on a deployed database. Those changes are listed here as
+idempotent PostgreSQL DDL and applied at startup, right after create_all;
+SQLite databases are only ever created fresh (tests, local development).
+
+If the API's database role may not alter tables, apply the same
+statements by hand before deploying:
+
+    python -m app.core.schema_upgrades --print | psql "$DATABASE_URL"
+
+Append new statements; never edit ones that have shipped.
+"""
+import argparse
+from typing import Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+SCHEMA_UPGRADES: Tuple[str, ...] = (
+    # Delta sync: per-user change sequence on both item tables
+    "ALTER TABLE inventory_items ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()",
+    "ALTER TABLE inventory_items ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT 0",
+    "ALTER TABLE draft_items ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT 0",
+    "CREATE INDEX IF NOT EXISTS ix_inventory_items_user_id_change_seq ON inventory_items (user_id, change_seq)",
+    "CREATE INDEX IF NOT EXISTS ix_draft_items_user_id_change_seq ON draft_items (user_id, change_seq)",
+    # Expiry range scans and the alert scheduler
+    "CREATE INDEX IF NOT EXISTS ix_inventory_items_user_id_expiry_date ON inventory_items (user_id, expiry_date)",
+    "CREATE INDEX IF NOT EXISTS ix_inventory_items_expiry_date ON inventory_items (expiry_date)",
+    # Name search
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_inventory_items_name_trgm ON inventory_items USING gin (name gin_trgm_ops)",
+    # Commit-ordered incremental loads of analytics events
+    "ALTER TABLE inventory_events ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT 0",
+    "CREATE INDEX IF NOT EXISTS ix_inventory_events_user_id_change_seq ON inventory_events (user_id, change_seq)",
+    "DROP INDEX IF EXISTS ix_inventory_events_user_id_id",
+)
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """Apply SCHEMA_UPGRADES in one transaction (PostgreSQL only)."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        for statement in SCHEMA_UPGRADES:
+            conn.execute(text(statement))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply or print in-place schema upgrades")
+    parser.add_argument("--print", action="store_true", help="Print the SQL instead of applying it")
+    args = parser.parse_args()
+
+    if args.print:
+        for statement in SCHEMA_UPGRADES:
+            print(f"{statement};")
+        return
+
+    from app.core.database import engine
+    upgrade_schema(engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,25 +4,43 @@ Security module for JWT authentication and password hashing.
 This module provides:
 - Password hashing using bcrypt
 - JWT token creation and validation
-- FastAPI dependency for protected routes
+- A bounded cache of already-verified tokens
+- FastAPI dependencies for protected routes
 """
+import hashlib
 import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
+from app.core.database import get_db
+from app.core.revocation import revocation_filter
+from app.core.user_cache import CachedUser, get_user_record
+
 load_dotenv()
 
 # JWT Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "fallback-secret-key-for-dev")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+# Users allowed on operator endpoints (e.g. vision usage), comma-separated ids
+ADMIN_USER_IDS = frozenset(
+    user_id.strip() for user_id in os.getenv("ADMIN_USER_IDS", "").split(",") if user_id.strip()
+)
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -41,13 +59,29 @@ def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def create_access_token(user_id: UUID, expires_delta: Optional[timedelta] = None) -> str:
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and re-hash it if its cost is no longer the configured one.
+
+    Returns:
+        (valid, new_hash) - new_hash is None unless the stored hash should be replaced
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def create_access_token(
+    user_id: UUID,
+    expires_delta: Optional[timedelta] = None,
+    family_id: Optional[UUID] = None
+) -> str:
     """
     Create a JWT access token.
 
     Args:
         user_id: The user's UUID to encode in the token
         expires_delta: Optional custom expiration time
+        family_id: Refresh-token family the token was issued from, so that
+            revoking the family also revokes its access tokens
 
     Returns:
         Encoded JWT token string
@@ -59,47 +93,139 @@ def create_access_token(user_id: UUID, expires_delta: Optional[timedelta] = None
 
     to_encode = {
         "sub": str(user_id),
-        "exp": expire
+        "exp": expire,
+        "jti": uuid.uuid4().hex,
     }
+    if family_id is not None:
+        to_encode["fam"] = str(family_id)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-def decode_token(token: str) -> Optional[UUID]:
+@dataclass(frozen=True)
+class TokenClaims:
+    """Verified claims of an access token."""
+    user_id: UUID
+    expires_at: float
+    token_id: Optional[str] = None  # jti
+    family_id: Optional[str] = None  # fam
+
+    @property
+    def revocation_keys(self) -> tuple:
+        """Identifiers under which this token may have been revoked."""
+        return tuple(key for key in (self.token_id, self.family_id) if key)
+
+
+class VerifiedTokenCache:
     """
-    Decode and validate a JWT token.
+    Bounded LRU cache of verified tokens.
 
-    Args:
-        token: The JWT token string
+    Maps a digest of the token (the raw bearer token is never stored) to
+    its verified claims. An entry is dropped as soon as
+    it is looked up at or after its `exp`, so an expired token is never
+    served from the cache.
+    """
 
-    Returns:
-        The user_id UUID if valid, None otherwise
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, TokenClaims]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str, now: Optional[float] = None) -> Optional[TokenClaims]:
+        """Return the cached claims for a still-valid token, else None."""
+        key = self._digest(token)
+        now = time.time() if now is None else now
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is None:
+                return None
+            if now >= claims.expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, token: str, claims: TokenClaims) -> None:
+        """Cache verified claims until their expiry timestamp."""
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Singleton instance
+verified_token_cache = VerifiedTokenCache(max_entries=TOKEN_CACHE_MAX_ENTRIES)
+
+
+def decode_token_claims(token: str) -> Optional[TokenClaims]:
     """
+    Decode and validate a JWT token, returning its claims.
+
+    Tokens verified before are answered from `verified_token_cache`
+    without re-parsing or re-checking the signature.
+    """
+    claims = verified_token_cache.get(token)
+    if claims is not None:
+        return claims
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id_str: str = payload.get("sub")
         if user_id_str is None:
             return None
-        return UUID(user_id_str)
-    except (JWTError, ValueError):
+        claims = TokenClaims(
+            user_id=UUID(user_id_str),
+            expires_at=float(payload.get("exp", 0)),
+            token_id=payload.get("jti"),
+            family_id=payload.get("fam"),
+        )
+    except (JWTError, ValueError, TypeError):
         return None
 
+    if claims.expires_at:
+        verified_token_cache.put(token, claims)
+    return claims
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> UUID:
-    """
-    FastAPI dependency to get the current authenticated user.
 
-    This replaces the old X-User-Id header stub authentication.
-    Use this as a dependency in protected routes.
+def decode_token(token: str) -> Optional[UUID]:
+    """
+    Decode and validate a JWT token.
 
     Args:
-        token: JWT token extracted from Authorization header
+        token: The JWT token string
 
     Returns:
-        The authenticated user's UUID
+        The user_id UUID if valid, None otherwise
+    """
+    claims = decode_token_claims(token)
+    return claims.user_id if claims else None
+
+
+def get_current_token_claims(token: str = Depends(oauth2_scheme)) -> TokenClaims:
+    """
+    FastAPI dependency returning the verified, unrevoked claims of the
+    request's access token.
+
+    Revocation is checked against the in-process filter, which is synced
+    from the database on a short interval - no per-request query. A sync
+    or a positive's confirmation does query, so this is a sync dependency
+    and runs in the threadpool, off the event loop.
 
     Raises:
-        HTTPException: If token is invalid or expired
+        HTTPException: If token is invalid, expired or revoked
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -107,8 +233,61 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> UUID:
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    user_id = decode_token(token)
-    if user_id is None:
+    claims = decode_token_claims(token)
+    if claims is None or revocation_filter.is_revoked(claims.revocation_keys):
         raise credentials_exception
 
+    return claims
+
+
+async def get_current_user(claims: TokenClaims = Depends(get_current_token_claims)) -> UUID:
+    """
+    FastAPI dependency to get the current authenticated user.
+
+    This replaces the old X-User-Id header stub authentication.
+    Use this as a dependency in protected routes.
+
+    Returns:
+        The authenticated user's UUID
+
+    Raises:
+        HTTPException: If token is invalid, expired or revoked
+    """
+    return claims.user_id
+
+
+def get_current_user_record(
+    user_id: UUID = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> CachedUser:
+    """
+    FastAPI dependency returning the current user's record.
+
+    Served from `user_record_cache`, so only the first request after a
+    miss, an expiry or an account change queries the users table.
+
+    Raises:
+        HTTPException: 401 if the token is invalid, 404 if the user no longer exists
+    """
+    user = get_user_record(db, user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return user
+
+
+async def get_admin_user(user_id: UUID = Depends(get_current_user)) -> UUID:
+    """
+    FastAPI dependency for operator-only routes: the current user, if in ADMIN_USER_IDS.
+
+    Raises:
+        HTTPException: 401 if the token is invalid, 403 if the user is not an admin
+    """
+    if str(user_id) not in ADMIN_USER_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
     return user_id
@@ -0,0 +1,114 @@
+"""
+In-memory attempt throttling for authentication endpoints.
+
+Limits are checked before any password hashing happens, so a
+credential-stuffing burst is turned away cheaply instead of consuming
+the CPU the rest of the API needs. State is per process.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Attempts per client IP (login + register) and failed logins per account
+LOGIN_IP_MAX_ATTEMPTS = int(os.getenv("LOGIN_IP_MAX_ATTEMPTS", "20"))
+LOGIN_IP_WINDOW_SECONDS = int(os.getenv("LOGIN_IP_WINDOW_SECONDS", "60"))
+LOGIN_ACCOUNT_MAX_FAILURES = int(os.getenv("LOGIN_ACCOUNT_MAX_FAILURES", "5"))
+LOGIN_ACCOUNT_WINDOW_SECONDS = int(os.getenv("LOGIN_ACCOUNT_WINDOW_SECONDS", "900"))
+
+
+class SlidingWindowLimiter:
+    """
+    Allows at most `limit` hits per key within a sliding time window.
+
+    Tracks at most `max_keys` keys; the least recently used are dropped
+    first, which bounds memory under an attack from many addresses.
+    """
+
+    def __init__(self, limit: int, window_seconds: float, max_keys: int = 100_000):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._hits: "OrderedDict[str, deque]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def retry_after(self, key: str, now: Optional[float] = None) -> float:
+        """Seconds until another hit is allowed (0 if allowed now)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            hits = self._prune(key, now)
+            if hits is None or len(hits) < self.limit:
+                return 0.0
+            return hits[0] + self.window_seconds - now
+
+    def hit(self, key: str, now: Optional[float] = None) -> None:
+        """Record a hit for a key."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            hits = self._prune(key, now)
+            if hits is None:
+                hits = self._hits[key] = deque()
+                if len(self._hits) > self.max_keys:
+                    self._hits.popitem(last=False)
+            hits.append(now)
+            self._hits.move_to_end(key)
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """Forget one key, or every key if none is given."""
+        with self._lock:
+            if key is None:
+                self._hits.clear()
+            else:
+                self._hits.pop(key, None)
+
+    def _prune(self, key: str, now: float) -> Optional[deque]:
+        hits = self._hits.get(key)
+        if hits is None:
+            return None
+        while hits and hits[0] <= now - self.window_seconds:
+            hits.popleft()
+        if not hits:
+            del self._hits[key]
+            return None
+        return hits
+
+
+class LoginThrottle:
+    """Per-IP attempt limit combined with a per-account failure limit."""
+
+    def __init__(self):
+        self.ip_attempts = SlidingWindowLimiter(LOGIN_IP_MAX_ATTEMPTS, LOGIN_IP_WINDOW_SECONDS)
+        self.account_failures = SlidingWindowLimiter(
+            LOGIN_ACCOUNT_MAX_FAILURES, LOGIN_ACCOUNT_WINDOW_SECONDS
+        )
+
+    def check(self, ip: str, email: Optional[str] = None) -> float:
+        """
+        Record an attempt from `ip` and return seconds to wait (0 = proceed).
+        Rejected attempts still count against the IP.
+        """
+        wait = self.ip_attempts.retry_after(ip)
+        self.ip_attempts.hit(ip)
+        if email is not None:
+            wait = max(wait, self.account_failures.retry_after(email.lower()))
+        return wait
+
+    def record_failure(self, email: str) -> None:
+        self.account_failures.hit(email.lower())
+
+    def record_success(self, email: str) -> None:
+        self.account_failures.reset(email.lower())
+
+    def reset(self) -> None:
+        """Clear all throttling state."""
+        self.ip_attempts.reset()
+        self.account_failures.reset()
+
+
+# Singleton instance
+login_throttle = LoginThrottle()
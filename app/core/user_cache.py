@@ -0,0 +1,147 @@
+"""
+Read-through cache of user records.
+
+Routes that need more than the user id (e.g. /auth/me) would otherwise
+query the users table on every request. Records are cached as frozen
+`CachedUser` snapshots - never as ORM instances, which are bound to the
+session that loaded them - for a short TTL, and dropped explicitly
+once a transaction that updated or deleted a User row through the ORM
+commits.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from app.models.user import User
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Immutable snapshot of a user row (without the password hash)."""
+    id: UUID
+    email: str
+    is_active: bool
+    created_at: Optional[datetime]
+
+
+class UserRecordCache:
+    """
+    Bounded LRU cache of user snapshots with a per-entry TTL.
+
+    The TTL bounds staleness for changes made outside this process;
+    changes made here are invalidated immediately.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[UUID, Tuple[float, CachedUser]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: UUID, now: Optional[float] = None) -> Optional[CachedUser]:
+        """Return the cached snapshot if present and fresh, else None."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, record = entry
+            if now >= expires_at:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return record
+
+    def put(self, record: CachedUser, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._entries[record.id] = (now + self.ttl_seconds, record)
+            self._entries.move_to_end(record.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Singleton instance
+user_record_cache = UserRecordCache(
+    ttl_seconds=USER_CACHE_TTL_SECONDS,
+    max_entries=USER_CACHE_MAX_ENTRIES
+)
+
+
+def get_user_record(db: Session, user_id: UUID) -> Optional[CachedUser]:
+    """
+    Load a user snapshot, from the cache when possible.
+
+    Returns:
+        The user's snapshot, or None if no such user exists
+    """
+    record = user_record_cache.get(user_id)
+    if record is not None:
+        return record
+
+    row = db.execute(
+        select(User.id, User.email, User.is_active, User.created_at)
+        .where(User.id == user_id)
+    ).first()
+    if row is None:
+        return None
+
+    record = CachedUser(
+        id=row.id,
+        email=row.email,
+        is_active=bool(row.is_active),
+        created_at=row.created_at,
+    )
+    user_record_cache.put(record)
+    return record
+
+
+_CHANGED_USERS = "changed_user_ids"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_user(mapper, connection, target: User) -> None:
+    """Note a user row changed through the ORM; evicted once the change commits."""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    """
+    Drop the snapshots of users changed in the committed transaction.
+    Evicting at flush time instead would let a concurrent request
+    re-cache the old row before the commit.
+    """
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        user_record_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session: Session) -> None:
+    """Rolled-back changes leave the cached snapshots valid."""
+    session.info.pop(_CHANGED_USERS, None)
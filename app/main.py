@@ -1,25 +1,74 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import Response
 
+from app.core.bcrypt_cost import configure_password_hashing
 from app.core.database import engine, Base
-from app.models import user, draft_item, inventory_item  # noqa: F401
-from app.routers import auth, draft_items, inventory_items, ingestion
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, metrics
+from app.core.schema_upgrades import upgrade_schema
+from app.models import user, draft_item, inventory_item, expiry_bucket, sync_state, auth_token, notification, inventory_event, restock, vision_call  # noqa: F401
+from app.routers import alerts, analytics, auth, catalog, draft_items, inventory_items, ingestion, recipes, shopping_list, sync, vision_usage
+from app.services.alerts import ALERT_SCHEDULER_ENABLED, expiry_alerts
+from app.services.ingestion.accounting import vision_usage as vision_usage_recorder
 
-# Create all tables on startup
+# Create all tables on startup, then add columns and indexes that
+# existing tables predate (create_all never alters a table)
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
+
+# Pin the bcrypt cost (BCRYPT_ROUNDS, calibrated offline with python -m app.core.bcrypt_cost)
+configure_password_hashing()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Expiry alerts are written to the notification outbox by a background thread
+    if ALERT_SCHEDULER_ENABLED:
+        expiry_alerts.start()
+    # Buffered vision call records are written in batches by a background thread too
+    vision_usage_recorder.start()
+    yield
+    expiry_alerts.stop()
+    # Writes out the records still buffered, which would otherwise be lost
+    vision_usage_recorder.stop()
+
 
 app = FastAPI(
     title="SnapShelf Exp3",
     version="0.1.0",
-    description="AI-assisted food waste reduction through trusted inventory management"
+    description="AI-assisted food waste reduction through trusted inventory management",
+    lifespan=lifespan
 )
 
+# Retries carrying the same Idempotency-Key coalesce or replay instead of re-running
+app.add_middleware(IdempotencyMiddleware, paths=("/api/ingest/image", "/api/draft-items"))
+
+# Per-route latency, query counts and DB time for /metrics. Added last, so
+# it is outermost and also measures responses replayed by the middleware above
+app.add_middleware(MetricsMiddleware)
+
 # Register routers
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(draft_items.router, prefix="/api")
 app.include_router(inventory_items.router, prefix="/api")
 app.include_router(ingestion.router, prefix="/api")
+app.include_router(sync.router, prefix="/api")
+app.include_router(alerts.router, prefix="/api")
+app.include_router(analytics.router, prefix="/api")
+app.include_router(recipes.router, prefix="/api")
+app.include_router(shopping_list.router, prefix="/api")
+app.include_router(catalog.router, prefix="/api")
+app.include_router(vision_usage.router, prefix="/api")
 
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    """Prometheus text exposition of request, query and vision-call histograms."""
+    return Response(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
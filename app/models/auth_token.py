@@ -0,0 +1,42 @@
+from sqlalchemy import Column, String, DateTime, BigInteger, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+from app.core.database import Base
+
+
+class RefreshToken(Base):
+    """
+    Long-lived, single-use refresh token.
+
+    Tokens are rotated on every use; all tokens descending from one login
+    share a family_id. Presenting an already-used token means it leaked,
+    so the whole family is revoked.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    token_hash = Column(String, nullable=False, unique=True, index=True)  # SHA-256, never the raw token
+
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    used_at = Column(DateTime(timezone=True), nullable=True)  # Set when rotated
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class RevokedToken(Base):
+    """
+    Revoked access-token id (jti) or refresh-token family id.
+
+    Access tokens are stateless, so revocation is an id list. It is
+    loaded into an in-process Bloom filter and checked per request.
+    Rows can be deleted once `expires_at` has passed.
+    """
+    __tablename__ = "revoked_tokens"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    token_key = Column(String, nullable=False, index=True)  # jti hex or family UUID
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
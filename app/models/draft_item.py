@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Numeric, Date, Float, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Numeric, Date, Float, Text, BigInteger, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -11,6 +11,10 @@ class DraftItem(Base):
     Must be explicitly promoted to InventoryItem by user confirmation.
     """
     __tablename__ = "draft_items"
+    __table_args__ = (
+        # Serves delta sync ("changed since cursor")
+        Index("ix_draft_items_user_id_change_seq", "user_id", "change_seq"),
+    )
 
     # Identity
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
@@ -34,3 +38,6 @@ class DraftItem(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    # Delta sync - per-user change sequence at the last mutation
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Date, DateTime, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class InventoryExpiryBucket(Base):
+    """
+    Per-user count of inventory items expiring on a given date.
+    Maintained incrementally on confirm, update and delete so the
+    expiry summary never has to scan the inventory table.
+    """
+    __tablename__ = "inventory_expiry_buckets"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    expiry_date = Column(Date, primary_key=True)
+    item_count = Column(Integer, nullable=False, default=0)
+
+
+class ExpirySummaryState(Base):
+    """
+    Marks a user whose buckets have been built from the inventory table.
+    A user without a row may hold items from before the summary existed,
+    so their buckets are rebuilt (and the row added) on their next write
+    or summary read.
+    """
+    __tablename__ = "inventory_expiry_summary_states"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    backfilled_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
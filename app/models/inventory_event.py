@@ -0,0 +1,52 @@
+from sqlalchemy import Column, String, Date, DateTime, Numeric, BigInteger, Integer, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class InventoryEvent(Base):
+    """
+    An inventory item (or part of it) leaving the inventory as consumed or wasted.
+    Keeps a copy of the item's attributes so analytics survive the item's deletion.
+    """
+    __tablename__ = "inventory_events"
+    __table_args__ = (
+        # Serves incremental loads of a user's events ("after change_seq N")
+        Index("ix_inventory_events_user_id_change_seq", "user_id", "change_seq"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    inventory_item_id = Column(UUID(as_uuid=True), nullable=False)
+    kind = Column(String, nullable=False)  # "consumed" | "wasted"
+
+    name = Column(String, nullable=False)
+    category = Column(String, nullable=False)
+    storage_location = Column(String, nullable=False)
+    quantity = Column(Numeric(10, 2), nullable=False)
+    unit = Column(String, nullable=False)
+    expiry_date = Column(Date, nullable=False)
+    days_before_expiry = Column(Integer, nullable=False)  # Negative once expired
+
+    occurred_on = Column(Date, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # The user's change sequence of the recording transaction; unlike the id
+    # it becomes visible in commit order (0 for events recorded before it existed)
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+
+class WasteRollup(Base):
+    """
+    Per-user consumed/wasted event counts for one week or month, broken
+    down along one dimension (category, storage location or days before
+    expiry). Maintained incrementally whenever an event is recorded.
+    """
+    __tablename__ = "waste_rollups"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    period = Column(String, primary_key=True)  # "week" | "month"
+    period_start = Column(Date, primary_key=True)
+    dimension = Column(String, primary_key=True)  # "category" | "storage_location" | "days_before_expiry"
+    bucket = Column(String, primary_key=True)
+    consumed_count = Column(Integer, nullable=False, default=0)
+    wasted_count = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Numeric, Date, ForeignKey
+from sqlalchemy import DDL, Column, String, DateTime, Numeric, Date, BigInteger, ForeignKey, Index, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -12,6 +12,19 @@ class InventoryItem(Base):
     Used for alerts, analytics, and recipe recommendations.
     """
     __tablename__ = "inventory_items"
+    __table_args__ = (
+        # Serves per-user "expiring soon" range scans and expiry-sorted listing
+        Index("ix_inventory_items_user_id_expiry_date", "user_id", "expiry_date"),
+        # Serves delta sync ("changed since cursor")
+        Index("ix_inventory_items_user_id_change_seq", "user_id", "change_seq"),
+        # Serves the alert scheduler's window loads across all users
+        Index("ix_inventory_items_expiry_date", "expiry_date"),
+        # Serves name search (ILIKE '%q%' and similarity); other databases search in-process
+        Index(
+            "ix_inventory_items_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
 
     # Identity
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
@@ -27,4 +40,15 @@ class InventoryItem(Base):
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    # Note: No updated_at - core fields are immutable after creation (except quantity)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    # Delta sync - per-user change sequence at the last mutation
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+
+# The trigram index needs pg_trgm
+event.listen(
+    InventoryItem.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
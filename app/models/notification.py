@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, Date, DateTime, BigInteger, Integer, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class NotificationOutbox(Base):
+    """
+    Alert waiting to be delivered to a user's device.
+    Written by the expiry alert scheduler when an alert falls due;
+    clients fetch pending rows and acknowledge them once shown.
+    """
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        # One alert of each kind per item and expiry date, however many workers fire it
+        UniqueConstraint("inventory_item_id", "expiry_date", "kind", name="uq_notification_outbox_item_alert"),
+        Index("ix_notification_outbox_user_id_id", "user_id", "id"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # No foreign key: the alert outlives the item it was about
+    inventory_item_id = Column(UUID(as_uuid=True), nullable=False)
+    kind = Column(String, nullable=False)  # "expiring"
+    item_name = Column(String, nullable=False)
+    expiry_date = Column(Date, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    delivered_at = Column(DateTime(timezone=True), nullable=True)  # Set when the client acknowledges
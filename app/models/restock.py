@@ -0,0 +1,51 @@
+from sqlalchemy import Column, String, Date, DateTime, Float, Numeric, BigInteger, Integer, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class QuantityChange(Base):
+    """
+    Some quantity of an inventory item used up: a quantity decrease, a
+    deletion or a recorded consumption. Raw name and unit are kept; the
+    restock batch normalizes them, so writers stay a single insert.
+    """
+    __tablename__ = "quantity_changes"
+    __table_args__ = (
+        # Serves the restock batch's "this user's history since day N" reads
+        Index("ix_quantity_changes_user_id_occurred_on", "user_id", "occurred_on"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # No foreign key: the history outlives the item
+    inventory_item_id = Column(UUID(as_uuid=True), nullable=False)
+    name = Column(String, nullable=False)
+    unit = Column(String, nullable=False)
+    quantity = Column(Numeric(10, 2), nullable=False)  # Amount removed, in `unit`
+
+    occurred_on = Column(Date, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class RestockForecast(Base):
+    """
+    Nightly forecast of when a user runs out of a product (normalized
+    name and base unit), from its recent consumption rate and the stock
+    on hand when the batch ran. Replaced wholesale on every run.
+    """
+    __tablename__ = "restock_forecasts"
+    __table_args__ = (
+        Index("ix_restock_forecasts_user_id_run_out_on", "user_id", "run_out_on"),
+    )
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    product = Column(String, primary_key=True)  # Normalized name
+    unit = Column(String, primary_key=True)  # Base unit (Grams, Milliliters, Pieces or as entered)
+    name = Column(String, nullable=False)  # Most recently used display name
+
+    daily_rate = Column(Float, nullable=False)  # Base units per day, recency weighted
+    on_hand = Column(Float, nullable=False)  # Base units in the inventory at computed_on
+    run_out_on = Column(Date, nullable=False)
+    last_consumed_on = Column(Date, nullable=False)
+    computed_on = Column(Date, nullable=False)
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, DateTime, BigInteger, Integer, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class UserChangeCursor(Base):
+    """
+    Per-user monotonic change sequence.
+    Every draft/inventory mutation takes the next value, so a client
+    holding cursor N only needs rows with change_seq > N.
+    """
+    __tablename__ = "user_change_cursors"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    seq = Column(BigInteger, nullable=False, default=0)
+    # Tombstones up to this sequence were pruned; older cursors need a full resync
+    pruned_through = Column(BigInteger, nullable=False, default=0)
+
+
+class SyncTombstone(Base):
+    """
+    Record of a deleted draft or inventory item, kept so delta sync
+    can tell clients to drop rows they still hold.
+    """
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index("ix_sync_tombstones_user_id_change_seq", "user_id", "change_seq"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    entity = Column(String, nullable=False)  # "inventory" | "draft"
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, Date, DateTime, BigInteger, Integer, SmallInteger, Boolean, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class VisionCall(Base):
+    """
+    One vision detection call (or detection cache hit), for cost and latency accounting.
+    Append-only, and without foreign keys so the log outlives users.
+    """
+    __tablename__ = "vision_calls"
+    __table_args__ = (
+        # Every aggregate is over a range of days
+        Index("ix_vision_calls_called_on", "called_on"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), nullable=True)  # None outside a request
+    model = Column(String(64), nullable=False)
+    prompt_version = Column(String(16), nullable=True)  # None for backends without a prompt
+
+    input_tokens = Column(Integer, nullable=True)  # None when the provider reported no usage
+    output_tokens = Column(Integer, nullable=True)
+    image_bytes = Column(Integer, nullable=False)  # Base64-encoded size sent to the provider
+    latency_ms = Column(Integer, nullable=False)
+    item_count = Column(SmallInteger, nullable=False)
+
+    cache_hit = Column(Boolean, nullable=False)
+    hedge = Column(Boolean, nullable=False)  # A second request sent because the first was slow or failed
+    success = Column(Boolean, nullable=False)
+
+    called_on = Column(Date, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
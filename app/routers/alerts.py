@@ -0,0 +1,55 @@
+"""
+Expiry alert outbox router.
+"""
+from datetime import datetime, timezone
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.models.notification import NotificationOutbox
+from app.schemas.alert import AlertAck, AlertAckResult, AlertResponse
+
+router = APIRouter(prefix="/alerts", tags=["alerts"])
+
+
+@router.get("", response_model=List[AlertResponse])
+def list_pending_alerts(
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Alerts written by the scheduler that the client has not acknowledged yet, oldest first.
+    """
+    return db.query(NotificationOutbox).filter(
+        NotificationOutbox.user_id == user_id,
+        NotificationOutbox.delivered_at.is_(None)
+    ).order_by(NotificationOutbox.id).all()
+
+
+@router.post("/ack", response_model=AlertAckResult)
+def acknowledge_alerts(
+    request: AlertAck,
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Mark alerts as delivered so they are not returned again.
+    """
+    result = db.execute(
+        update(NotificationOutbox)
+        .where(
+            NotificationOutbox.id.in_(set(request.ids)),
+            NotificationOutbox.user_id == user_id,
+            NotificationOutbox.delivered_at.is_(None)
+        )
+        .values(delivered_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    return AlertAckResult(acknowledged=result.rowcount)
@@ -0,0 +1,75 @@
+"""
+Waste analytics router.
+"""
+from datetime import date, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.schemas.analytics import WasteBucket, WastePeriod, WasteRangeReport
+from app.services.analytics import columnar_event_cache, get_waste_rollups
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+DIMENSION_PATTERN = "^(category|storage_location|days_before_expiry)$"
+MAX_RANGE_DAYS = 366 * 5
+
+
+@router.get("/waste", response_model=WasteRangeReport)
+def get_waste_for_range(
+    start: Optional[date] = Query(None, description="First day (default: 29 days before end)"),
+    end: Optional[date] = Query(None, description="Last day, inclusive (default: today)"),
+    dimension: str = Query("category", pattern=DIMENSION_PATTERN),
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Consumed and wasted counts for any date range, split along one dimension.
+    Aggregated from in-memory event columns rather than the events table.
+    """
+    end = end or date.today()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_RANGE_DAYS} days")
+
+    totals = columnar_event_cache.range_totals(db, user_id, start, end, dimension)
+    return WasteRangeReport(
+        start=start,
+        end=end,
+        dimension=dimension,
+        consumed=totals.consumed,
+        wasted=totals.wasted,
+        buckets=[WasteBucket(bucket=b.bucket, consumed=b.consumed, wasted=b.wasted) for b in totals.buckets],
+    )
+
+
+@router.get("/waste/rollups", response_model=List[WastePeriod])
+def list_waste_rollups(
+    period: str = Query("week", pattern="^(week|month)$"),
+    dimension: str = Query("category", pattern=DIMENSION_PATTERN),
+    periods: int = Query(12, ge=1, le=104, description="How many weeks or months back"),
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Weekly or monthly rollups, newest first. Periods without events are omitted.
+    """
+    by_period = get_waste_rollups(db, user_id, period, dimension, periods)
+    return [
+        WastePeriod(
+            period_start=start,
+            consumed=sum(row.consumed_count for row in rows),
+            wasted=sum(row.wasted_count for row in rows),
+            buckets=[
+                WasteBucket(bucket=row.bucket, consumed=row.consumed_count, wasted=row.wasted_count)
+                for row in rows
+            ],
+        )
+        for start, rows in by_period.items()
+    ]
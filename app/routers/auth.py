@@ -1,65 +1,127 @@
 """
 Authentication router for user registration and login.
 """
-from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.security import hash_password, verify_password, create_access_token, get_current_user
+from app.core.password_hashing import (
+    HashingOverloadedError,
+    hash_password_async,
+    verify_and_update_password_async,
+)
+from app.core.refresh_tokens import (
+    RefreshTokenError,
+    issue_token_pair,
+    revoke_access_token,
+    rotate_refresh_token,
+)
+from app.core.security import TokenClaims, get_current_token_claims, get_current_user_record
+from app.core.throttling import login_throttle
+from app.core.user_cache import CachedUser
 from app.models.user import User
-from app.schemas.auth import UserRegister, UserLogin, Token, UserResponse
+from app.schemas.auth import UserRegister, UserLogin, Token, RefreshRequest, UserResponse
 
 router = APIRouter(tags=["auth"])
 
 
+def _enforce_throttle(request: Request, email: str | None = None) -> None:
+    """Reject the attempt with 429 if the client IP or account is throttled."""
+    client_ip = request.client.host if request.client else "unknown"
+    wait = login_throttle.check(client_ip, email)
+    if wait > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts. Please try again later.",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+
+
+def _hashing_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy. Please try again shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _find_user(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _create_user(db: Session, email: str, hashed_password: str) -> Token:
+    new_user = User(email=email, hashed_password=hashed_password)
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+    return issue_token_pair(db, new_user.id)
+
+
+def _complete_login(db: Session, user: User, new_hash: Optional[str]) -> Token:
+    if new_hash:
+        # Persisted with the token pair; the user cache is invalidated on update
+        user.hashed_password = new_hash
+    return issue_token_pair(db, user.id)
+
+
 @router.post("/register", response_model=Token, status_code=201)
-def register(
+async def register(
     user_data: UserRegister,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Register a new user.
 
-    Creates a new user account and returns a JWT token.
+    Creates a new user account and returns an access/refresh token pair.
+    Hashing is awaited on the dedicated password-hashing pool and only
+    the database work runs in the shared threadpool, so a burst of
+    registrations cannot tie up threads the sync routes need.
     """
+    _enforce_throttle(request)
+
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    if await run_in_threadpool(_find_user, db, user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
     # Create new user
-    hashed_pwd = hash_password(user_data.password)
-    new_user = User(
-        email=user_data.email,
-        hashed_password=hashed_pwd
-    )
+    try:
+        hashed_pwd = await hash_password_async(user_data.password)
+    except HashingOverloadedError:
+        raise _hashing_unavailable()
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-
-    # Generate token
-    access_token = create_access_token(user_id=new_user.id)
-
-    return Token(access_token=access_token)
+    # Create the user and generate tokens
+    return await run_in_threadpool(_create_user, db, user_data.email, hashed_pwd)
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     credentials: UserLogin,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
-    Authenticate a user and return a JWT token.
+    Authenticate a user and return an access/refresh token pair.
+
+    Attempts are throttled per client IP and per account before any
+    password hashing happens. A hash made below the configured cost is
+    transparently replaced. As in `register`, only the database work
+    runs in the shared threadpool.
     """
+    _enforce_throttle(request, credentials.email)
+
     # Find user by email
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await run_in_threadpool(_find_user, db, credentials.email)
 
     if not user:
+        login_throttle.record_failure(credentials.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -67,7 +129,15 @@ def login(
         )
 
     # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
+    try:
+        password_valid, new_hash = await verify_and_update_password_async(
+            credentials.password, user.hashed_password
+        )
+    except HashingOverloadedError:
+        raise _hashing_unavailable()
+
+    if not password_valid:
+        login_throttle.record_failure(credentials.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -82,24 +152,50 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Generate token
-    access_token = create_access_token(user_id=user.id)
+    login_throttle.record_success(credentials.email)
 
-    return Token(access_token=access_token)
+    # Generate tokens
+    return await run_in_threadpool(_complete_login, db, user, new_hash)
 
 
-@router.get("/me", response_model=UserResponse)
-async def get_current_user_profile(
-    current_user_id: UUID = Depends(get_current_user),
+@router.post("/refresh", response_model=Token)
+def refresh(
+    request: RefreshRequest,
     db: Session = Depends(get_db)
 ):
     """
-    Get the current authenticated user's profile.
+    Exchange a refresh token for a new access/refresh token pair.
+
+    Refresh tokens are single-use. Presenting one twice revokes every
+    token issued from the same login.
     """
-    user = db.query(User).filter(User.id == current_user_id).first()
-    if not user:
+    try:
+        return rotate_refresh_token(db, request.refresh_token)
+    except RefreshTokenError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+@router.post("/logout", status_code=204)
+def logout(
+    claims: TokenClaims = Depends(get_current_token_claims),
+    db: Session = Depends(get_db)
+):
+    """
+    Revoke the current access token and its refresh-token family.
+    """
+    revoke_access_token(db, claims)
+    return None
+
+
+@router.get("/me", response_model=UserResponse)
+async def get_current_user_profile(
+    user: CachedUser = Depends(get_current_user_record)
+):
+    """
+    Get the current authenticated user's profile.
+    """
     return user
@@ -0,0 +1,26 @@
+"""
+Food catalog router.
+"""
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.security import get_current_user
+from app.schemas.catalog import CatalogSuggestionResponse
+from app.services.catalog import DEFAULT_TOP_K, autocomplete
+
+router = APIRouter(prefix="/catalog", tags=["catalog"])
+
+
+@router.get("/autocomplete", response_model=List[CatalogSuggestionResponse])
+def autocomplete_food_names(
+    prefix: str = Query(..., min_length=1, max_length=64),
+    limit: int = Query(8, ge=1, le=DEFAULT_TOP_K),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Most popular catalog foods with a word starting with `prefix`, with default category and unit.
+    Served from the memory-mapped catalog trie; no database access.
+    """
+    return autocomplete(prefix, limit)
@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Optional
 from uuid import UUID
 
+from app.core.conditional import list_cache_headers
 from app.core.database import get_db
+from app.core.responses import FastJSONResponse
 from app.core.security import get_current_user
 from app.models.draft_item import DraftItem
 from app.models.inventory_item import InventoryItem
-from app.schemas.draft_item import DraftItemCreate, DraftItemUpdate, DraftItemResponse
+from app.schemas.draft_item import DraftItemCreate, DraftItemUpdate, DraftItemResponse, DraftImportResult
 from app.schemas.inventory_item import InventoryItemCreate, InventoryItemResponse
+from app.services.alerts import expiry_alerts
+from app.services.bulk_import import apply_expiry_prediction, detect_import_format, import_draft_items
+from app.services.compact import DRAFT_COLUMNS, DRAFT_DEFAULT_FIELDS, compact_rows, resolve_fields
 from app.services.expiry_prediction import expiry_prediction_service
+from app.services.export import EXPORT_MEDIA_TYPES, stream_export
+from app.services.inventory import record_expiry_change
+from app.services.sync import DRAFT_ENTITY, next_change_seq, record_tombstones
 
 router = APIRouter(prefix="/draft-items", tags=["draft-items"])
 
@@ -38,20 +47,11 @@ def create_draft_item(
         )
 
         # Enrich draft with prediction
-        draft_data["expiration_date"] = prediction.expiry_date
-
-        # Update confidence if not set or lower than prediction
-        if draft_data.get("confidence_score") is None:
-            draft_data["confidence_score"] = prediction.confidence
-
-        # Add prediction source to notes if not already present
-        if draft_data.get("notes"):
-            draft_data["notes"] += f"\n[Auto-predicted: {prediction.reasoning}]"
-        else:
-            draft_data["notes"] = f"[Auto-predicted: {prediction.reasoning}]"
+        apply_expiry_prediction(draft_data, prediction)
 
     db_draft = DraftItem(
         user_id=user_id,
+        change_seq=next_change_seq(db, user_id),
         **draft_data
     )
     db.add(db_draft)
@@ -60,16 +60,89 @@ def create_draft_item(
     return db_draft
 
 
-@router.get("", response_model=List[DraftItemResponse])
+@router.post("/import", response_model=DraftImportResult)
+def import_draft_items_file(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON"),
+    import_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$"),
+    predict_expiry: bool = True,
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Bulk-create draft items from an uploaded CSV or NDJSON file.
+
+    Records use the same fields as POST /draft-items. The file is read
+    incrementally and written in chunks, so large imports run at a fixed
+    memory ceiling. Invalid rows are skipped and reported by line number.
+    If the file stops being readable (not UTF-8, malformed CSV), rows
+    before that point are kept and `aborted` gives the line it stopped at.
+    The format is taken from ?format= or inferred from the file name.
+    """
+    import_format = import_format or detect_import_format(file.filename, file.content_type)
+    if import_format is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Could not determine file format. Use a .csv or .ndjson file, or pass ?format="
+        )
+
+    return import_draft_items(db, user_id, file.file, import_format, predict_expiry=predict_expiry)
+
+
+@router.get("", response_model=List[DraftItemResponse], dependencies=[Depends(list_cache_headers)])
 def list_draft_items(
     db: Session = Depends(get_db),
     user_id: UUID = Depends(get_current_user)
 ):
-    """List all draft items for the current user"""
+    """
+    List all draft items for the current user.
+    Supports If-None-Match: unchanged polls get 304 without reading drafts.
+    """
     drafts = db.query(DraftItem).filter(DraftItem.user_id == user_id).all()
     return drafts
 
 
+@router.get("/compact", response_class=FastJSONResponse)
+def list_draft_items_compact(
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    cache_headers: Dict[str, str] = Depends(list_cache_headers),
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Lightweight draft listing: `{"fields": [...], "rows": [[...], ...]}`.
+    Selects only the requested columns and serializes rows directly.
+    """
+    try:
+        names = resolve_fields(fields, DRAFT_COLUMNS, DRAFT_DEFAULT_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rows = compact_rows(db, DRAFT_COLUMNS, names, DraftItem.user_id == user_id)
+    return FastJSONResponse({"fields": names, "rows": rows}, headers=cache_headers)
+
+
+@router.get("/export")
+def export_draft_items(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns (default: all)"),
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Export all draft items as NDJSON or CSV, streamed in batches.
+    """
+    try:
+        names = resolve_fields(fields, DRAFT_COLUMNS, tuple(DRAFT_COLUMNS))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        stream_export(db, DRAFT_COLUMNS, names, export_format, DraftItem.user_id == user_id),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="draft-items.{export_format}"'},
+    )
+
+
 @router.get("/{draft_id}", response_model=DraftItemResponse)
 def get_draft_item(
     draft_id: UUID,
@@ -108,6 +181,7 @@ def update_draft_item(
     update_data = updates.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(draft, field, value)
+    draft.change_seq = next_change_seq(db, user_id)
 
     db.commit()
     db.refresh(draft)
@@ -130,6 +204,7 @@ def delete_draft_item(
         raise HTTPException(status_code=404, detail="Draft item not found")
 
     db.delete(draft)
+    record_tombstones(db, user_id, DRAFT_ENTITY, [draft.id], next_change_seq(db, user_id))
     db.commit()
     return None
 
@@ -154,18 +229,24 @@ def confirm_draft_item(
     if not draft:
         raise HTTPException(status_code=404, detail="Draft item not found")
 
+    seq = next_change_seq(db, user_id)
+
     # Create trusted inventory item
     inventory_item = InventoryItem(
         user_id=user_id,
+        change_seq=seq,
         **confirmation.model_dump()
     )
 
     db.add(inventory_item)
+    record_expiry_change(db, user_id, added=[inventory_item.expiry_date])
 
     # Delete the draft (it's been confirmed)
     db.delete(draft)
+    record_tombstones(db, user_id, DRAFT_ENTITY, [draft.id], seq)
 
     db.commit()
     db.refresh(inventory_item)
+    expiry_alerts.schedule(inventory_item.id, inventory_item.expiry_date)
 
     return inventory_item
@@ -1,5 +1,7 @@
 from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import List
@@ -9,6 +11,7 @@ from app.core.security import get_current_user
 from app.models.draft_item import DraftItem
 from app.schemas.draft_item import DraftItemResponse
 from app.services.ingestion.image_ingestion import image_ingestion_service
+from app.services.sync import next_change_seq
 
 
 router = APIRouter(prefix="/ingest", tags=["ingestion"])
@@ -52,10 +55,12 @@ async def ingest_image(
             detail=f"Failed to read image file: {str(e)}"
         )
 
-    # Process image
-    result = image_ingestion_service.ingest_from_image(
+    # Process image - the vision call blocks for seconds, so keep it off the event loop
+    result = await run_in_threadpool(
+        image_ingestion_service.ingest_from_image,
         image_bytes=image_bytes,
-        storage_location=storage_location
+        storage_location=storage_location,
+        user_id=user_id
     )
 
     if not result.success:
@@ -65,9 +70,12 @@ async def ingest_image(
         )
 
     # Create a DraftItem for each detected food item
-    created_drafts = []
+    seq = next_change_seq(db, user_id)
+    draft_rows = []
     for item in result.detected_items:
         draft_data = {
+            "user_id": user_id,
+            "change_seq": seq,
             "name": item.name,
             "category": item.category,
             "location": storage_location,
@@ -94,14 +102,12 @@ async def ingest_image(
             notes_parts.append(f"[Quantity confidence: {confidence_pct}%]")
         draft_data["notes"] = "\n".join(notes_parts)
 
-        # Save to database
-        db_draft = DraftItem(
-            user_id=user_id,
-            **draft_data
-        )
-        db.add(db_draft)
-        db.commit()
-        db.refresh(db_draft)
-        created_drafts.append(db_draft)
+        draft_rows.append(draft_data)
+
+    # Save all drafts in one INSERT ... RETURNING and a single commit
+    created_drafts = db.execute(insert(DraftItem).returning(DraftItem), draft_rows).scalars().all()
+    # Serialize before commit expires the returned rows
+    response = [DraftItemResponse.model_validate(draft) for draft in created_drafts]
+    db.commit()
 
-    return created_drafts
+    return response
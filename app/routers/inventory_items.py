@@ -1,32 +1,322 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, timedelta
+from decimal import Decimal
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, delete, update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Optional
 from uuid import UUID
 
+from app.core.conditional import list_cache_headers
 from app.core.database import get_db
+from app.core.responses import FastJSONResponse
 from app.core.security import get_current_user
 from app.models.inventory_item import InventoryItem
 from app.schemas.inventory_item import (
     InventoryItemResponse,
     InventoryItemUpdateQuantity,
-    InventoryItemUpdate
+    InventoryItemUpdate,
+    InventoryBulkDelete,
+    InventoryBulkQuantityUpdate,
+    InventoryBulkLocationUpdate,
+    InventoryMerge,
+    InventoryBulkResult,
+    InventoryEventCreate,
+    InventoryEventResponse,
+    InventoryGroupResponse,
+    InventoryExpirySummary,
+    InventorySearchResult,
 )
+from app.services.inventory import backfill_expiry_summary, grouped_inventory, get_expiry_summary, record_expiry_change
+from app.services.alerts import expiry_alerts
+from app.services.analytics import CONSUMED, record_inventory_event
+from app.services.compact import (
+    INVENTORY_COLUMNS,
+    INVENTORY_DEFAULT_FIELDS,
+    compact_rows,
+    resolve_fields,
+)
+from app.services.export import EXPORT_MEDIA_TYPES, stream_export
+from app.services.restock import record_bulk_decreases, record_quantity_change, record_removed_items
+from app.services.search import search_inventory
+from app.services.sync import INVENTORY_ENTITY, next_change_seq, record_tombstones
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
 
-@router.get("", response_model=List[InventoryItemResponse])
+@router.get("", response_model=List[InventoryItemResponse], dependencies=[Depends(list_cache_headers)])
 def list_inventory_items(
     db: Session = Depends(get_db),
     user_id: UUID = Depends(get_current_user)
 ):
-    """List all confirmed inventory items for the current user"""
+    """
+    List all confirmed inventory items for the current user.
+    Supports If-None-Match: unchanged polls get 304 without reading items.
+    """
     items = db.query(InventoryItem).filter(
         InventoryItem.user_id == user_id
     ).order_by(InventoryItem.expiry_date).all()
     return items
 
 
+@router.get("/compact", response_class=FastJSONResponse)
+def list_inventory_items_compact(
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    cache_headers: Dict[str, str] = Depends(list_cache_headers),
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Lightweight inventory listing: `{"fields": [...], "rows": [[...], ...]}`.
+
+    Selects only the requested columns and serializes rows directly,
+    skipping ORM objects and per-item validation. Sorted by expiry.
+    """
+    try:
+        names = resolve_fields(fields, INVENTORY_COLUMNS, INVENTORY_DEFAULT_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rows = compact_rows(
+        db, INVENTORY_COLUMNS, names,
+        InventoryItem.user_id == user_id,
+        order_by=InventoryItem.expiry_date
+    )
+    return FastJSONResponse({"fields": names, "rows": rows}, headers=cache_headers)
+
+
+@router.get("/export")
+def export_inventory_items(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns (default: all)"),
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Export the full inventory as NDJSON or CSV, sorted by expiry.
+
+    Rows are streamed from a server-side cursor in batches, so memory use
+    does not grow with the size of the inventory.
+    """
+    try:
+        names = resolve_fields(fields, INVENTORY_COLUMNS, tuple(INVENTORY_COLUMNS))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        stream_export(
+            db, INVENTORY_COLUMNS, names, export_format,
+            InventoryItem.user_id == user_id,
+            order_by=InventoryItem.expiry_date
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="inventory.{export_format}"'},
+    )
+
+
+@router.get("/grouped", response_model=List[InventoryGroupResponse], dependencies=[Depends(list_cache_headers)])
+def list_grouped_inventory_items(
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    List inventory merged by name, expiry date and unit group.
+    Quantities are summed in base units (grams, milliliters, pieces).
+    """
+    return grouped_inventory(db, user_id)
+
+
+@router.get("/expiring", response_model=List[InventoryItemResponse])
+def list_expiring_inventory_items(
+    within: int = Query(3, ge=0, le=365, description="Days from today"),
+    include_expired: bool = Query(False, description="Also return already-expired items"),
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    List items expiring within the given number of days, soonest first.
+    Served by the (user_id, expiry_date) index.
+    """
+    today = date.today()
+    query = db.query(InventoryItem).filter(
+        InventoryItem.user_id == user_id,
+        InventoryItem.expiry_date <= today + timedelta(days=within)
+    )
+    if not include_expired:
+        query = query.filter(InventoryItem.expiry_date >= today)
+
+    return query.order_by(InventoryItem.expiry_date).all()
+
+
+@router.get("/search", response_model=List[InventorySearchResult])
+def search_inventory_items(
+    q: str = Query(..., min_length=1, max_length=100, description="Name or part of a name"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Find items by name: word-prefix matches first, then other substrings,
+    then close spellings; ties go to the item expiring soonest.
+    Backed by a trigram index (pg_trgm on Postgres, in-process otherwise).
+    """
+    return [
+        InventorySearchResult(
+            **InventoryItemResponse.model_validate(hit.item).model_dump(),
+            match=hit.match,
+            similarity=hit.similarity,
+        )
+        for hit in search_inventory(db, user_id, q, limit)
+    ]
+
+
+@router.get("/summary", response_model=InventoryExpirySummary)
+def get_inventory_expiry_summary(
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Expiry badge counts (expired, today, 3 days, 7 days) and earliest expiry.
+    Read from incrementally maintained per-date buckets.
+    """
+    # A user never backfilled may have items from before the summary existed
+    if backfill_expiry_summary(db, user_id):
+        db.commit()
+    return get_expiry_summary(db, user_id)
+
+
+@router.post("/bulk/delete", response_model=InventoryBulkResult)
+def bulk_delete_inventory_items(
+    request: InventoryBulkDelete,
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Delete several inventory items in a single statement.
+    Ids that do not exist or belong to another user are ignored.
+    """
+    deleted = db.execute(
+        delete(InventoryItem)
+        .where(
+            InventoryItem.id.in_(set(request.ids)),
+            InventoryItem.user_id == user_id
+        )
+        .returning(
+            InventoryItem.id, InventoryItem.user_id, InventoryItem.name,
+            InventoryItem.unit, InventoryItem.quantity, InventoryItem.expiry_date
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    record_expiry_change(db, user_id, removed=[row.expiry_date for row in deleted])
+    record_removed_items(db, deleted)
+    if deleted:
+        record_tombstones(
+            db, user_id, INVENTORY_ENTITY, [row.id for row in deleted], next_change_seq(db, user_id)
+        )
+    db.commit()
+    expiry_alerts.cancel(row.id for row in deleted)
+
+    return InventoryBulkResult(affected=len(deleted), ids=[row.id for row in deleted])
+
+
+@router.patch("/bulk/quantity", response_model=InventoryBulkResult)
+def bulk_update_inventory_quantity(
+    request: InventoryBulkQuantityUpdate,
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Set the quantity of several inventory items in a single statement.
+    Each item may get a different quantity (e.g. partial consumption).
+    """
+    # Later entries win if the same id is sent twice
+    quantities = {entry.id: entry.quantity for entry in request.items}
+    record_bulk_decreases(db, user_id, quantities)
+
+    updated_ids = db.execute(
+        update(InventoryItem)
+        .where(
+            InventoryItem.id.in_(list(quantities)),
+            InventoryItem.user_id == user_id
+        )
+        .values(
+            quantity=case(quantities, value=InventoryItem.id),
+            change_seq=next_change_seq(db, user_id)
+        )
+        .returning(InventoryItem.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+
+    return InventoryBulkResult(affected=len(updated_ids), ids=updated_ids)
+
+
+@router.patch("/bulk/location", response_model=InventoryBulkResult)
+def bulk_update_inventory_location(
+    request: InventoryBulkLocationUpdate,
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Move several inventory items to another storage location in a single statement.
+    """
+    updated_ids = db.execute(
+        update(InventoryItem)
+        .where(
+            InventoryItem.id.in_(set(request.ids)),
+            InventoryItem.user_id == user_id
+        )
+        .values(
+            storage_location=request.storage_location,
+            change_seq=next_change_seq(db, user_id)
+        )
+        .returning(InventoryItem.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+
+    return InventoryBulkResult(affected=len(updated_ids), ids=updated_ids)
+
+
+@router.post("/merge", response_model=InventoryItemResponse)
+def merge_inventory_items(
+    request: InventoryMerge,
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Fold several inventory items into the one with the lowest id (the group representative),
+    which takes the given total quantity and unit.
+    Nothing is recorded as consumed - the other items are only removed.
+    """
+    items = sorted(
+        db.query(InventoryItem).filter(
+            InventoryItem.id.in_(set(request.ids)),
+            InventoryItem.user_id == user_id
+        ).all(),
+        key=lambda item: item.id
+    )
+
+    if not items:
+        raise HTTPException(status_code=404, detail="Inventory item not found")
+
+    kept, removed = items[0], items[1:]
+    seq = next_change_seq(db, user_id)
+    kept.quantity = request.quantity
+    kept.unit = request.unit
+    kept.change_seq = seq
+    if removed:
+        for item in removed:
+            db.delete(item)
+        record_expiry_change(db, user_id, removed=[item.expiry_date for item in removed])
+        record_tombstones(db, user_id, INVENTORY_ENTITY, [item.id for item in removed], seq)
+    db.commit()
+    db.refresh(kept)
+    expiry_alerts.cancel(item.id for item in removed)
+
+    return kept
+
+
 @router.get("/{item_id}", response_model=InventoryItemResponse)
 def get_inventory_item(
     item_id: UUID,
@@ -64,7 +354,9 @@ def update_inventory_quantity(
     if not item:
         raise HTTPException(status_code=404, detail="Inventory item not found")
 
+    record_quantity_change(db, item, item.quantity - Decimal(str(update.quantity)))
     item.quantity = update.quantity
+    item.change_seq = next_change_seq(db, user_id)
     db.commit()
     db.refresh(item)
 
@@ -90,13 +382,23 @@ def update_inventory_item(
     if not item:
         raise HTTPException(status_code=404, detail="Inventory item not found")
 
+    previous_expiry = item.expiry_date
+
     # Update only provided fields
     update_data = update.model_dump(exclude_unset=True)
+    if update_data.get("quantity") is not None:
+        record_quantity_change(db, item, item.quantity - Decimal(str(update_data["quantity"])))
     for field, value in update_data.items():
         setattr(item, field, value)
 
+    if item.expiry_date != previous_expiry:
+        record_expiry_change(db, user_id, added=[item.expiry_date], removed=[previous_expiry])
+    item.change_seq = next_change_seq(db, user_id)
+
     db.commit()
     db.refresh(item)
+    if item.expiry_date != previous_expiry:
+        expiry_alerts.schedule(item.id, item.expiry_date)
 
     return item
 
@@ -119,6 +421,61 @@ def delete_inventory_item(
         raise HTTPException(status_code=404, detail="Inventory item not found")
 
     db.delete(item)
+    record_quantity_change(db, item, item.quantity)
+    record_expiry_change(db, user_id, removed=[item.expiry_date])
+    record_tombstones(db, user_id, INVENTORY_ENTITY, [item.id], next_change_seq(db, user_id))
     db.commit()
+    expiry_alerts.cancel([item_id])
 
     return None
+
+
+@router.post("/{item_id}/events", response_model=InventoryEventResponse, status_code=201)
+def record_inventory_item_event(
+    item_id: UUID,
+    event: InventoryEventCreate,
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Record some or all of an item as consumed or wasted.
+    The quantity is taken off the item; an item with nothing left is removed.
+    """
+    item = db.query(InventoryItem).filter(
+        InventoryItem.id == item_id,
+        InventoryItem.user_id == user_id
+    ).first()
+
+    if not item:
+        raise HTTPException(status_code=404, detail="Inventory item not found")
+
+    quantity = item.quantity if event.quantity is None else Decimal(str(event.quantity))
+    if quantity > item.quantity:
+        raise HTTPException(status_code=400, detail="Quantity exceeds what is left of the item")
+
+    seq = next_change_seq(db, user_id)
+    recorded = record_inventory_event(db, item, event.kind, quantity, seq)
+    if event.kind == CONSUMED:
+        record_quantity_change(db, item, quantity)
+    remaining = item.quantity - quantity
+    if remaining > 0:
+        item.quantity = remaining
+        item.change_seq = seq
+    else:
+        db.delete(item)
+        record_expiry_change(db, user_id, removed=[item.expiry_date])
+        record_tombstones(db, user_id, INVENTORY_ENTITY, [item.id], seq)
+    db.commit()
+    if remaining <= 0:
+        expiry_alerts.cancel([item_id])
+
+    return InventoryEventResponse(
+        id=recorded.id,
+        inventory_item_id=item_id,
+        kind=recorded.kind,
+        quantity=float(quantity),
+        unit=recorded.unit,
+        days_before_expiry=recorded.days_before_expiry,
+        occurred_on=recorded.occurred_on,
+        remaining_quantity=float(max(remaining, 0)),
+    )
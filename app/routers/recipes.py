@@ -0,0 +1,28 @@
+"""
+Recipe suggestion router.
+"""
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.schemas.recipe import RecipeSuggestionResponse
+from app.services.recipes import suggest_recipes
+
+router = APIRouter(prefix="/recipes", tags=["recipes"])
+
+
+@router.get("/suggested", response_model=List[RecipeSuggestionResponse])
+def list_suggested_recipes(
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Recipes that use up the most of the inventory, weighted toward items expiring soonest.
+    Cached until the inventory changes or the day rolls over.
+    """
+    return suggest_recipes(db, user_id, limit)
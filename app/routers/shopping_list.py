@@ -0,0 +1,43 @@
+"""
+Shopping list router.
+"""
+from datetime import date
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.schemas.shopping_list import RestockSuggestionResponse
+from app.services.restock import get_restock_suggestions
+
+router = APIRouter(prefix="/shopping-list", tags=["shopping-list"])
+
+
+@router.get("/suggested", response_model=List[RestockSuggestionResponse])
+def list_suggested_restocks(
+    within: int = Query(7, ge=0, le=365, description="Days from today"),
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Products forecast to run out within the given number of days, soonest first.
+    Reads the nightly restock forecasts; nothing is computed per request.
+    """
+    today = date.today()
+    return [
+        RestockSuggestionResponse(
+            name=forecast.name,
+            product=forecast.product,
+            unit=forecast.unit,
+            daily_rate=forecast.daily_rate,
+            on_hand=forecast.on_hand,
+            run_out_on=forecast.run_out_on,
+            days_left=max((forecast.run_out_on - today).days, 0),
+            last_consumed_on=forecast.last_consumed_on,
+            computed_on=forecast.computed_on,
+        )
+        for forecast in get_restock_suggestions(db, user_id, within, today)
+    ]
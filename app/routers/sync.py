@@ -0,0 +1,28 @@
+"""
+Delta sync router.
+"""
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.schemas.sync import SyncResponse
+from app.services.sync import changes_since
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("", response_model=SyncResponse)
+def sync(
+    since: int = Query(0, ge=0, description="Cursor from the previous sync (0 = full snapshot)"),
+    db: Session = Depends(get_db),
+    user_id: UUID = Depends(get_current_user)
+):
+    """
+    Return drafts and inventory items created, updated or deleted after `since`.
+
+    Store the returned `cursor` and pass it on the next call. When nothing
+    has changed the response carries only the unchanged cursor.
+    """
+    return changes_since(db, user_id, since)
@@ -0,0 +1,47 @@
+"""
+Vision call accounting router (operators only).
+"""
+from datetime import date, timedelta
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.security import get_admin_user
+from app.schemas.vision_usage import VisionUsageGroup, VisionUsageReport
+from app.services.ingestion.accounting import aggregate_vision_calls, vision_usage
+
+router = APIRouter(prefix="/vision-usage", tags=["vision-usage"])
+
+MAX_RANGE_DAYS = 366
+
+
+@router.get("", response_model=VisionUsageReport)
+def get_vision_usage(
+    group_by: str = Query("day", pattern="^(day|user|prompt_version|model)$"),
+    start: Optional[date] = Query(None, description="First day (default: 29 days before end)"),
+    end: Optional[date] = Query(None, description="Last day, inclusive (default: today)"),
+    db: Session = Depends(get_db),
+    admin_id: UUID = Depends(get_admin_user)
+):
+    """
+    Vision calls, cache hits, tokens, payload bytes and latency per day,
+    user, prompt version or model. Restricted to ADMIN_USER_IDS.
+    """
+    end = end or date.today()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_RANGE_DAYS} days")
+
+    # Include this worker's buffered calls
+    vision_usage.flush(db)
+    return VisionUsageReport(
+        start=start,
+        end=end,
+        group_by=group_by,
+        groups=[VisionUsageGroup.model_validate(totals) for totals in aggregate_vision_calls(db, group_by, start, end)],
+    )
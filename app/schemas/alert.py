@@ -0,0 +1,30 @@
+"""
+Notification outbox schemas.
+"""
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from typing import List
+from uuid import UUID
+
+
+class AlertResponse(BaseModel):
+    """A pending alert from the notification outbox"""
+    id: int
+    inventory_item_id: UUID
+    kind: str
+    item_name: str
+    expiry_date: date
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class AlertAck(BaseModel):
+    """Alerts the client has shown and no longer needs"""
+    ids: List[int] = Field(..., min_length=1, max_length=500)
+
+
+class AlertAckResult(BaseModel):
+    """Number of alerts marked delivered - unknown or foreign ids are ignored"""
+    acknowledged: int
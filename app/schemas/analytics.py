@@ -0,0 +1,34 @@
+"""
+Waste analytics schemas.
+"""
+from pydantic import BaseModel
+from datetime import date
+from typing import List
+
+
+class WasteBucket(BaseModel):
+    """Consumed and wasted counts for one category, location or days-before-expiry bucket"""
+    bucket: str
+    consumed: int
+    wasted: int
+
+    class Config:
+        from_attributes = True
+
+
+class WastePeriod(BaseModel):
+    """One week or month of rollups"""
+    period_start: date
+    consumed: int
+    wasted: int
+    buckets: List[WasteBucket]
+
+
+class WasteRangeReport(BaseModel):
+    """Counts for an arbitrary date range, split along one dimension"""
+    start: date
+    end: date
+    dimension: str
+    consumed: int
+    wasted: int
+    buckets: List[WasteBucket]
@@ -2,6 +2,7 @@
 Authentication schemas for user registration and login.
 """
 from pydantic import BaseModel, EmailStr, Field
+from typing import Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -22,6 +23,13 @@ class Token(BaseModel):
     """Schema for JWT token response."""
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # Access token lifetime in seconds
+
+
+class RefreshRequest(BaseModel):
+    """Schema for exchanging a refresh token for a new token pair."""
+    refresh_token: str
 
 
 class TokenData(BaseModel):
@@ -0,0 +1,15 @@
+"""
+Food catalog schemas.
+"""
+from pydantic import BaseModel
+
+
+class CatalogSuggestionResponse(BaseModel):
+    """A catalog food with the defaults to pre-fill when it is picked"""
+    name: str
+    category: str
+    unit: str
+    popularity: int
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import date, datetime
 from uuid import UUID
 
@@ -13,7 +13,7 @@ class DraftItemBase(BaseModel):
     category: Optional[str] = None
     location: Optional[str] = None
     notes: Optional[str] = None
-    source: Optional[str] = None  # "ai" | "manual" | "barcode" | "image" | "receipt"
+    source: Optional[str] = None  # "ai" | "manual" | "barcode" | "image" | "receipt" | "import"
     confidence_score: Optional[float] = Field(None, ge=0.0, le=1.0)
 
 
@@ -44,3 +44,24 @@ class DraftItemResponse(DraftItemBase):
 
     class Config:
         from_attributes = True
+
+
+class DraftImportError(BaseModel):
+    """A row that could not be imported"""
+    line: int
+    error: str
+
+    class Config:
+        from_attributes = True
+
+
+class DraftImportResult(BaseModel):
+    """Schema for bulk import response - errors lists at most the first 100 failures"""
+    imported: int
+    failed: int
+    errors: List[DraftImportError]
+    # Where reading stopped if the file became unreadable; earlier rows were imported
+    aborted: Optional[DraftImportError] = None
+
+    class Config:
+        from_attributes = True
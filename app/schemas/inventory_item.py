@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from typing import List
 from datetime import date, datetime
 from uuid import UUID
 from decimal import Decimal
@@ -39,6 +40,92 @@ class InventoryItemResponse(InventoryItemBase):
     id: UUID
     user_id: UUID
     created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class InventoryBulkDelete(BaseModel):
+    """Schema for deleting several inventory items in one request"""
+    ids: List[UUID] = Field(..., min_length=1, max_length=500)
+
+
+class InventoryBulkQuantityEntry(BaseModel):
+    """New quantity for a single item within a bulk update"""
+    id: UUID
+    quantity: float = Field(..., gt=0)
+
+
+class InventoryBulkQuantityUpdate(BaseModel):
+    """Schema for setting the quantity of several inventory items at once"""
+    items: List[InventoryBulkQuantityEntry] = Field(..., min_length=1, max_length=500)
+
+
+class InventoryBulkLocationUpdate(BaseModel):
+    """Schema for moving several inventory items to another storage location"""
+    ids: List[UUID] = Field(..., min_length=1, max_length=500)
+    storage_location: str = Field(..., min_length=1)
+
+
+class InventoryMerge(BaseModel):
+    """Schema for folding several inventory items (e.g. one grouped row) into one"""
+    ids: List[UUID] = Field(..., min_length=2, max_length=500)
+    quantity: float = Field(..., gt=0, description="Total quantity of the merged item")
+    unit: str = Field(..., min_length=1)
+
+
+class InventoryBulkResult(BaseModel):
+    """Outcome of a bulk operation - ids that were not found are omitted"""
+    affected: int
+    ids: List[UUID]
+
+
+class InventoryEventCreate(BaseModel):
+    """Schema for recording part or all of an item as consumed or wasted"""
+    kind: str = Field(..., pattern="^(consumed|wasted)$")
+    quantity: float | None = Field(None, gt=0, description="Default: everything that is left")
+
+
+class InventoryEventResponse(BaseModel):
+    """Schema for a recorded consumption/waste event"""
+    id: int
+    inventory_item_id: UUID
+    kind: str
+    quantity: float
+    unit: str
+    days_before_expiry: int
+    occurred_on: date
+    remaining_quantity: float  # 0 means the item was removed from the inventory
+
+    class Config:
+        from_attributes = True
+
+
+class InventorySearchResult(InventoryItemResponse):
+    """An inventory item matching a search, with how it matched"""
+    match: str  # "prefix" | "substring" | "similar"
+    similarity: float  # Trigram similarity of name and query, 0-1
+
+
+class InventoryGroupResponse(InventoryItemResponse):
+    """
+    Schema for a merged inventory row (same name, expiry date and unit group).
+    `id` is the first member; quantity/unit are the summed, display-friendly total.
+    """
+    base_quantity: float
+    base_unit: str
+    merged_ids: List[UUID]
+    merged_count: int
+
+
+class InventoryExpirySummary(BaseModel):
+    """Schema for home-screen expiry badge counts"""
+    expired: int
+    expiring_today: int
+    expiring_within_3_days: int
+    expiring_within_7_days: int
+    earliest_expiry: date | None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,18 @@
+"""
+Recipe suggestion schemas.
+"""
+from pydantic import BaseModel
+from typing import List
+
+
+class RecipeSuggestionResponse(BaseModel):
+    """A recipe ranked by how much of it the inventory covers, favouring items about to expire"""
+    id: int
+    title: str
+    score: float
+    coverage: float
+    matched_ingredients: List[str]
+    missing_ingredients: List[str]
+
+    class Config:
+        from_attributes = True
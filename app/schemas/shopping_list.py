@@ -0,0 +1,21 @@
+"""
+Shopping list schemas.
+"""
+from pydantic import BaseModel
+from datetime import date
+
+
+class RestockSuggestionResponse(BaseModel):
+    """A product forecast to run out soon, from its recent consumption rate"""
+    name: str
+    product: str
+    unit: str
+    daily_rate: float  # Units per day
+    on_hand: float  # Units in stock when the forecast was computed
+    run_out_on: date
+    days_left: int  # 0 when already out (or due today)
+    last_consumed_on: date
+    computed_on: date
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,27 @@
+"""
+Delta sync schemas.
+"""
+from pydantic import BaseModel
+from typing import List
+from uuid import UUID
+
+from app.schemas.draft_item import DraftItemResponse
+from app.schemas.inventory_item import InventoryItemResponse
+
+
+class SyncResponse(BaseModel):
+    """
+    Rows changed after the client's cursor.
+
+    When `reset` is true the lists are a full snapshot and the client
+    should replace its local copy instead of merging.
+    """
+    cursor: int
+    reset: bool
+    inventory_items: List[InventoryItemResponse]
+    draft_items: List[DraftItemResponse]
+    deleted_inventory_ids: List[UUID]
+    deleted_draft_ids: List[UUID]
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,32 @@
+"""
+Vision call accounting schemas.
+"""
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Optional
+
+
+class VisionUsageGroup(BaseModel):
+    """Calls, tokens, payload and latency for one day, user, prompt version or model"""
+    key: Optional[str]
+    calls: int
+    cache_hits: int
+    hedges: int
+    errors: int
+    input_tokens: int
+    output_tokens: int
+    image_bytes: int
+    items: int
+    mean_latency_ms: Optional[float]
+    max_latency_ms: Optional[int]
+
+    class Config:
+        from_attributes = True
+
+
+class VisionUsageReport(BaseModel):
+    """Vision usage for a date range, grouped one way"""
+    start: date
+    end: date
+    group_by: str
+    groups: List[VisionUsageGroup]
@@ -0,0 +1,13 @@
+from app.services.alerts.scheduler import (
+    ALERT_SCHEDULER_ENABLED,
+    EXPIRY_ALERT,
+    ExpiryAlertScheduler,
+    expiry_alerts,
+)
+
+__all__ = [
+    "ALERT_SCHEDULER_ENABLED",
+    "EXPIRY_ALERT",
+    "ExpiryAlertScheduler",
+    "expiry_alerts",
+]
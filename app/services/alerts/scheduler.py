@@ -0,0 +1,268 @@
+"""
+Expiry alert scheduler.
+
+Keeps the upcoming alert deadlines in a min-heap ordered by due time, so
+finding the next alert is O(1) and firing one is O(log n) - nothing ever
+scans the inventory. The heap only covers a window of the near future:
+items expiring within ALERT_LEAD_DAYS + ALERT_LOOKAHEAD_DAYS are loaded
+from the expiry_date index when the window advances, and routers report
+confirmations, expiry edits and deletions as they commit.
+
+Rescheduling and cancelling are lazy: `_current` maps each item to the
+expiry date it is scheduled for, and heap entries that no longer match
+are dropped when they reach the top. When an alert falls due the item is
+re-read (it may have changed in another process) and a row is written to
+the notification outbox; the outbox's unique constraint makes firing the
+same alert twice - from a restart or a second worker - harmless.
+"""
+import heapq
+import itertools
+import logging
+import os
+import threading
+from datetime import date, datetime, time as clock_time, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.inventory_item import InventoryItem
+from app.models.notification import NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+ALERT_SCHEDULER_ENABLED = os.getenv("ALERT_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+ALERT_LEAD_DAYS = int(os.getenv("ALERT_LEAD_DAYS", "1"))  # Alert this many days before expiry
+ALERT_HOUR = int(os.getenv("ALERT_HOUR", "9"))  # Local time of day alerts go out
+ALERT_LOOKAHEAD_DAYS = int(os.getenv("ALERT_LOOKAHEAD_DAYS", "2"))
+ALERT_POLL_SECONDS = float(os.getenv("ALERT_POLL_SECONDS", "300"))
+
+EXPIRY_ALERT = "expiring"
+WINDOW_LOAD_BATCH_SIZE = 1000
+
+# (due at, tie-breaker, item id, expiry date)
+HeapEntry = Tuple[datetime, int, UUID, date]
+
+
+class ExpiryAlertScheduler:
+    """Min-heap of pending expiry alerts, fed incrementally from the database."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        lead_days: int,
+        alert_hour: int,
+        lookahead_days: int,
+        poll_seconds: float
+    ):
+        self.session_factory = session_factory
+        self.lead_days = lead_days
+        self.alert_hour = alert_hour
+        self.lookahead_days = lookahead_days
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all scheduled alerts; the next tick reloads the window."""
+        with self._lock:
+            self._heap: List[HeapEntry] = []
+            self._current: Dict[UUID, date] = {}
+            self._loaded_through: Optional[date] = None
+            self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def due_at(self, expiry_date: date) -> datetime:
+        """When the alert for an item expiring on `expiry_date` goes out."""
+        return datetime.combine(expiry_date - timedelta(days=self.lead_days), clock_time(self.alert_hour))
+
+    # -- Router hooks (call after commit) ------------------------------------
+
+    def schedule(self, item_id: UUID, expiry_date: date) -> None:
+        """Schedule or reschedule the alert for a confirmed or edited item."""
+        with self._lock:
+            if self._loaded_through is None or expiry_date > self._loaded_through:
+                # Outside the window: picked up by the load that reaches it
+                self._current.pop(item_id, None)
+                return
+            is_next = not self._heap or self.due_at(expiry_date) < self._heap[0][0]
+            self._push(item_id, expiry_date)
+        if is_next:
+            self._wake.set()
+
+    def cancel(self, item_ids: Iterable[UUID]) -> None:
+        """Drop the alerts of deleted items."""
+        with self._lock:
+            for item_id in item_ids:
+                self._current.pop(item_id, None)
+
+    # -- Firing ---------------------------------------------------------------
+
+    def tick(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Advance the window to cover `now` and write every due alert. Returns alerts written."""
+        now = now or datetime.now()
+        self.extend_window(db, now.date() + timedelta(days=self.lead_days + self.lookahead_days), now.date())
+        return self.fire_due(db, now)
+
+    def extend_window(self, db: Session, through: date, today: date) -> int:
+        """Load items expiring up to `through` that are not loaded yet. Returns items loaded."""
+        with self._lock:
+            start = self._loaded_through
+            if start is not None and through <= start:
+                return 0
+            # Set first, so items confirmed while the load runs schedule themselves
+            self._loaded_through = through
+
+        query = select(InventoryItem.id, InventoryItem.expiry_date).where(InventoryItem.expiry_date <= through)
+        if start is None:
+            # First load: items that already expired were due before we started
+            query = query.where(InventoryItem.expiry_date >= today)
+        else:
+            query = query.where(InventoryItem.expiry_date > start)
+
+        loaded = 0
+        for partition in db.execute(query.execution_options(yield_per=WINDOW_LOAD_BATCH_SIZE)).partitions():
+            with self._lock:
+                for item_id, expiry_date in partition:
+                    self._push(item_id, expiry_date)
+            loaded += len(partition)
+        if loaded:
+            self._wake.set()
+        return loaded
+
+    def fire_due(self, db: Session, now: datetime) -> int:
+        """Write outbox rows for alerts due at `now`. Returns alerts written."""
+        due = self._pop_due(now)
+        if not due:
+            return 0
+
+        items = db.execute(
+            select(InventoryItem.id, InventoryItem.user_id, InventoryItem.name, InventoryItem.expiry_date)
+            .where(InventoryItem.id.in_(due))
+        ).all()
+        alerts = [
+            {
+                "user_id": item.user_id,
+                "inventory_item_id": item.id,
+                "kind": EXPIRY_ALERT,
+                "item_name": item.name,
+                "expiry_date": item.expiry_date,
+            }
+            # Changed in another process since it was scheduled: its new date is loaded separately
+            for item in items if item.expiry_date == due[item.id]
+        ]
+        if not alerts:
+            return 0
+
+        written = self._write_alerts(db, alerts)
+        db.commit()
+        return written
+
+    def _push(self, item_id: UUID, expiry_date: date) -> None:
+        if self._current.get(item_id) == expiry_date:
+            return
+        self._current[item_id] = expiry_date
+        heapq.heappush(self._heap, (self.due_at(expiry_date), next(self._counter), item_id, expiry_date))
+
+        # Lazily cancelled entries pile up under heavy rescheduling; rebuild when mostly stale
+        if len(self._heap) > 2 * len(self._current) + 64:
+            self._heap = [entry for entry in self._heap if self._current.get(entry[2]) == entry[3]]
+            heapq.heapify(self._heap)
+
+    def _pop_due(self, now: datetime) -> Dict[UUID, date]:
+        due: Dict[UUID, date] = {}
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, item_id, expiry_date = heapq.heappop(self._heap)
+                if self._current.get(item_id) == expiry_date:
+                    del self._current[item_id]
+                    due[item_id] = expiry_date
+        return due
+
+    def _write_alerts(self, db: Session, alerts: List[dict]) -> int:
+        existing = set(db.execute(
+            select(NotificationOutbox.inventory_item_id, NotificationOutbox.expiry_date)
+            .where(
+                NotificationOutbox.inventory_item_id.in_([alert["inventory_item_id"] for alert in alerts]),
+                NotificationOutbox.kind == EXPIRY_ALERT
+            )
+        ).all())
+        alerts = [a for a in alerts if (a["inventory_item_id"], a["expiry_date"]) not in existing]
+        if not alerts:
+            return 0
+
+        try:
+            with db.begin_nested():
+                db.execute(insert(NotificationOutbox), alerts)
+            return len(alerts)
+        except IntegrityError:
+            pass
+
+        # Another worker fired some of these in the meantime; keep the rest
+        written = 0
+        for alert in alerts:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(NotificationOutbox).values(**alert))
+                written += 1
+            except IntegrityError:
+                continue
+        return written
+
+    # -- Background thread ----------------------------------------------------
+
+    def start(self) -> None:
+        """Run ticks in a daemon thread until `stop()`."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="expiry-alerts", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            db = self.session_factory()
+            try:
+                self.tick(db)
+            except SQLAlchemyError:
+                # Unfired alerts were popped; reload the window so they are retried
+                logger.warning("Failed to fire expiry alerts", exc_info=True)
+                self.reset()
+            finally:
+                db.close()
+
+            self._wake.wait(self._seconds_until_next())
+            self._wake.clear()
+
+    def _seconds_until_next(self) -> float:
+        with self._lock:
+            next_due = self._heap[0][0] if self._heap else None
+        if next_due is None:
+            return self.poll_seconds
+        return min(self.poll_seconds, max(0.0, (next_due - datetime.now()).total_seconds()))
+
+
+# Singleton instance
+expiry_alerts = ExpiryAlertScheduler(
+    session_factory=SessionLocal,
+    lead_days=ALERT_LEAD_DAYS,
+    alert_hour=ALERT_HOUR,
+    lookahead_days=ALERT_LOOKAHEAD_DAYS,
+    poll_seconds=ALERT_POLL_SECONDS
+)
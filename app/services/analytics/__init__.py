@@ -0,0 +1,35 @@
+from app.services.analytics.rollups import (
+    CONSUMED,
+    DAYS_BEFORE_EXPIRY_LABELS,
+    DIMENSIONS,
+    EVENT_KINDS,
+    PERIODS,
+    WASTED,
+    days_before_expiry_bucket,
+    get_waste_rollups,
+    period_start,
+    record_inventory_event,
+)
+from app.services.analytics.columnar import (
+    ColumnarEventCache,
+    EventColumns,
+    RangeTotals,
+    columnar_event_cache,
+)
+
+__all__ = [
+    "CONSUMED",
+    "DAYS_BEFORE_EXPIRY_LABELS",
+    "DIMENSIONS",
+    "EVENT_KINDS",
+    "PERIODS",
+    "WASTED",
+    "days_before_expiry_bucket",
+    "get_waste_rollups",
+    "period_start",
+    "record_inventory_event",
+    "ColumnarEventCache",
+    "EventColumns",
+    "RangeTotals",
+    "columnar_event_cache",
+]
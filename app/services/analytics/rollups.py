@@ -0,0 +1,147 @@
+"""
+Consumption/waste events and their incrementally maintained rollups.
+
+Recording an event also bumps one counter per (period, dimension) pair -
+weekly and monthly, by category, storage location and days before
+expiry - inside the same transaction, in one upsert (INSERT ... ON
+CONFLICT DO UPDATE), so concurrent first events of a period cannot
+collide on a counter's key. Dashboards read those counters
+directly: a year of weekly history by category is at most 52 rows per
+category, however many events produced it.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.inventory_event import InventoryEvent, WasteRollup
+from app.models.inventory_item import InventoryItem
+
+CONSUMED = "consumed"
+WASTED = "wasted"
+EVENT_KINDS = (CONSUMED, WASTED)
+
+PERIODS = ("week", "month")
+DIMENSIONS = ("category", "storage_location", "days_before_expiry")
+
+# (upper bound in days, label) - first bound the value does not exceed wins
+DAYS_BEFORE_EXPIRY_BUCKETS = ((-1, "expired"), (0, "0"), (2, "1-2"), (6, "3-6"), (None, "7+"))
+DAYS_BEFORE_EXPIRY_LABELS = tuple(label for _, label in DAYS_BEFORE_EXPIRY_BUCKETS)
+
+
+def days_before_expiry_bucket(days: int) -> str:
+    """Label of the days-before-expiry bucket `days` falls in."""
+    for upper, label in DAYS_BEFORE_EXPIRY_BUCKETS:
+        if upper is None or days <= upper:
+            return label
+    raise AssertionError("unreachable")
+
+
+def period_start(period: str, day: date) -> date:
+    """First day (Monday, or the 1st) of the week or month containing `day`."""
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def record_inventory_event(
+    db: Session,
+    item: InventoryItem,
+    kind: str,
+    quantity: Decimal,
+    change_seq: int,
+    today: Optional[date] = None
+) -> InventoryEvent:
+    """
+    Record `quantity` of `item` as consumed or wasted and update the rollups.
+
+    Does not commit - call inside the transaction that changes the item,
+    with the change sequence that transaction allocated.
+    """
+    today = today or date.today()
+    days_before_expiry = (item.expiry_date - today).days
+    event = InventoryEvent(
+        user_id=item.user_id,
+        inventory_item_id=item.id,
+        kind=kind,
+        name=item.name,
+        category=item.category,
+        storage_location=item.storage_location,
+        quantity=quantity,
+        unit=item.unit,
+        expiry_date=item.expiry_date,
+        days_before_expiry=days_before_expiry,
+        occurred_on=today,
+        change_seq=change_seq,
+    )
+    db.add(event)
+
+    buckets = {
+        "category": item.category,
+        "storage_location": item.storage_location,
+        "days_before_expiry": days_before_expiry_bucket(days_before_expiry),
+    }
+    rows = [
+        {
+            "user_id": item.user_id,
+            "period": period,
+            "period_start": period_start(period, today),
+            "dimension": dimension,
+            "bucket": bucket,
+            "consumed_count": int(kind == CONSUMED),
+            "wasted_count": int(kind == WASTED),
+        }
+        for period in PERIODS
+        for dimension, bucket in buckets.items()
+    ]
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(WasteRollup)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[
+                WasteRollup.user_id, WasteRollup.period, WasteRollup.period_start,
+                WasteRollup.dimension, WasteRollup.bucket
+            ],
+            set_={
+                "consumed_count": WasteRollup.consumed_count + stmt.excluded.consumed_count,
+                "wasted_count": WasteRollup.wasted_count + stmt.excluded.wasted_count,
+            }
+        ),
+        rows
+    )
+    return event
+
+
+def get_waste_rollups(
+    db: Session,
+    user_id: UUID,
+    period: str,
+    dimension: str,
+    periods: int,
+    today: Optional[date] = None
+) -> Dict[date, List[WasteRollup]]:
+    """The last `periods` weeks or months of rollups, keyed by period start (newest first)."""
+    today = today or date.today()
+    oldest = period_start(period, today)
+    for _ in range(periods - 1):
+        oldest = period_start(period, oldest - timedelta(days=1))
+
+    rows = db.execute(
+        select(WasteRollup)
+        .where(
+            WasteRollup.user_id == user_id,
+            WasteRollup.period == period,
+            WasteRollup.dimension == dimension,
+            WasteRollup.period_start >= oldest
+        )
+        .order_by(WasteRollup.period_start.desc(), WasteRollup.bucket)
+    ).scalars()
+
+    by_period: Dict[date, List[WasteRollup]] = {}
+    for row in rows:
+        by_period.setdefault(row.period_start, []).append(row)
+    return by_period
@@ -0,0 +1,23 @@
+from app.services.bulk_import.importer import (
+    IMPORT_CHUNK_SIZE,
+    IMPORT_FORMATS,
+    MAX_REPORTED_ERRORS,
+    ImportReport,
+    ImportRowError,
+    UnreadableUploadError,
+    apply_expiry_prediction,
+    detect_import_format,
+    import_draft_items,
+)
+
+__all__ = [
+    "IMPORT_CHUNK_SIZE",
+    "IMPORT_FORMATS",
+    "MAX_REPORTED_ERRORS",
+    "ImportReport",
+    "ImportRowError",
+    "UnreadableUploadError",
+    "apply_expiry_prediction",
+    "detect_import_format",
+    "import_draft_items",
+]
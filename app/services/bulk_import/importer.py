@@ -0,0 +1,251 @@
+"""
+Bulk import of draft items from CSV or NDJSON uploads.
+
+The upload is read one record at a time and written in fixed-size
+chunks, so memory use is bounded by the chunk size rather than the file
+size. Each chunk is validated row by row (bad rows are reported, not
+fatal), has missing expiry dates filled from a memoized prediction,
+and is inserted in one round trip - COPY on PostgreSQL, executemany
+elsewhere - then committed under its own change sequence. An upload
+that stops being readable part-way (not UTF-8, malformed CSV) keeps
+every row read before that point and reports where it stopped, so the
+client knows what was saved and can resume from there.
+
+Imported rows land as drafts: like AI detections they are unverified
+until the user confirms them.
+"""
+import csv
+import io
+import json
+import uuid
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.draft_item import DraftItem
+from app.schemas.draft_item import DraftItemCreate
+from app.services.expiry_prediction import ExpiryPrediction, expiry_prediction_service
+from app.services.sync import next_change_seq
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+PREDICTION_CACHE_SIZE = 4096
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Column order for COPY; created_at/updated_at take their server defaults
+_COPY_COLUMNS = (
+    "id", "user_id", "name", "quantity", "unit", "expiration_date", "category",
+    "location", "notes", "source", "confidence_score", "change_seq",
+)
+_COPY_NULL = "\\N"
+
+
+@dataclass
+class ImportRowError:
+    line: int
+    error: str
+
+
+class UnreadableUploadError(ValueError):
+    """The upload cannot be read from `line` on."""
+
+    def __init__(self, line: int, message: str):
+        super().__init__(message)
+        self.line = line
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import. Only the first MAX_REPORTED_ERRORS errors are kept."""
+    imported: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = field(default_factory=list)
+    # Set if reading stopped early: rows from this line on were not imported
+    aborted: Optional[ImportRowError] = None
+
+    def add_error(self, line: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ImportRowError(line=line, error=error))
+
+
+def apply_expiry_prediction(draft_data: dict, prediction: ExpiryPrediction) -> None:
+    """Fill a draft's expiry date from a prediction, noting where it came from."""
+    draft_data["expiration_date"] = prediction.expiry_date
+
+    # Update confidence if not set
+    if draft_data.get("confidence_score") is None:
+        draft_data["confidence_score"] = prediction.confidence
+
+    # Add prediction source to notes if not already present
+    if draft_data.get("notes"):
+        draft_data["notes"] += f"\n[Auto-predicted: {prediction.reasoning}]"
+    else:
+        draft_data["notes"] = f"[Auto-predicted: {prediction.reasoning}]"
+
+
+def iter_records(stream: BinaryIO, import_format: str) -> Iterator[Tuple[int, object]]:
+    """
+    Yield (line number, raw record) pairs without reading the whole upload.
+
+    CSV records are dicts keyed by the header row, with blank cells as
+    None. NDJSON records are the undecoded lines, so that a malformed
+    line becomes a row error instead of aborting the import.
+
+    Raises:
+        UnreadableUploadError: If the rest of the upload is not UTF-8, or
+            the CSV is structurally malformed
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    line_number = 0
+    try:
+        if import_format == "csv":
+            reader = csv.DictReader(text)
+            try:
+                for row in reader:
+                    line_number = reader.line_num
+                    yield line_number, {
+                        key.strip(): (value.strip() or None) if isinstance(value, str) else value
+                        for key, value in row.items()
+                        if key
+                    }
+            except csv.Error as e:
+                raise UnreadableUploadError(reader.line_num, f"Malformed CSV: {e}")
+        else:
+            for line_number, line in enumerate(text, start=1):
+                if line.strip():
+                    yield line_number, line
+    except UnicodeDecodeError:
+        # Decoding fails a whole read-ahead block, so this is the first line not read
+        raise UnreadableUploadError(line_number + 1, "File is not valid UTF-8")
+    finally:
+        # Leave the upload open for its owner
+        text.detach()
+
+
+def _parse_record(raw: object) -> dict:
+    if isinstance(raw, str):
+        raw = json.loads(raw)
+        if not isinstance(raw, dict):
+            raise ValueError("Expected a JSON object")
+    return DraftItemCreate.model_validate(raw).model_dump()
+
+
+def _format_error(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}"
+            for e in error.errors()
+        )
+    if isinstance(error, json.JSONDecodeError):
+        return f"Invalid JSON: {error.msg}"
+    return str(error)
+
+
+def _copy_rows(db: Session, rows: List[dict]) -> None:
+    """Insert rows with PostgreSQL COPY inside the session's transaction."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            _COPY_NULL if row[column] is None else row[column]
+            for column in _COPY_COLUMNS
+        ])
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {DraftItem.__tablename__} ({', '.join(_COPY_COLUMNS)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def _write_chunk(db: Session, rows: List[dict]) -> None:
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2":
+        _copy_rows(db, rows)
+    else:
+        db.execute(insert(DraftItem), rows)
+
+
+def import_draft_items(
+    db: Session,
+    user_id: UUID,
+    stream: BinaryIO,
+    import_format: str,
+    predict_expiry: bool = True,
+    chunk_size: Optional[int] = None
+) -> ImportReport:
+    """
+    Import every record in `stream` as a draft item for `user_id`.
+
+    Commits after each chunk. If the upload becomes unreadable, the rows
+    read before that point are still written and `report.aborted` says
+    where reading stopped.
+    """
+    chunk_size = chunk_size or IMPORT_CHUNK_SIZE
+    report = ImportReport()
+
+    # Most imports repeat a small set of (name, category, location) combinations
+    @lru_cache(maxsize=PREDICTION_CACHE_SIZE)
+    def predict(name: str, category: Optional[str], location: Optional[str]) -> ExpiryPrediction:
+        return expiry_prediction_service.predict_expiry(
+            name=name, category=category, storage_location=location
+        )
+
+    chunk: List[dict] = []
+
+    def flush() -> None:
+        seq = next_change_seq(db, user_id)
+        for row in chunk:
+            row["change_seq"] = seq
+        _write_chunk(db, chunk)
+        db.commit()
+        report.imported += len(chunk)
+        chunk.clear()
+
+    try:
+        for line_number, raw in iter_records(stream, import_format):
+            try:
+                draft_data = _parse_record(raw)
+            except (ValueError, ValidationError) as e:
+                report.add_error(line_number, _format_error(e))
+                continue
+
+            if predict_expiry and draft_data["expiration_date"] is None:
+                apply_expiry_prediction(
+                    draft_data,
+                    predict(draft_data["name"], draft_data["category"], draft_data["location"])
+                )
+
+            draft_data["source"] = draft_data["source"] or "import"
+            chunk.append({"id": uuid.uuid4(), "user_id": user_id, **draft_data})
+            if len(chunk) >= chunk_size:
+                flush()
+    except UnreadableUploadError as e:
+        report.aborted = ImportRowError(line=e.line, error=str(e))
+
+    if chunk:
+        flush()
+
+    return report
+
+
+def detect_import_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """Infer csv/ndjson from the upload's file name or content type."""
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
@@ -0,0 +1,29 @@
+from app.services.catalog.trie import (
+    DEFAULT_TOP_K,
+    CatalogEntry,
+    CatalogTrie,
+    build_trie,
+    build_trie_file,
+    entry_keys,
+    normalize_key,
+)
+from app.services.catalog.autocomplete import (
+    DEFAULT_CATALOG_SOURCE,
+    DEFAULT_CATALOG_TRIE_PATH,
+    autocomplete,
+    get_catalog_trie,
+)
+
+__all__ = [
+    "DEFAULT_TOP_K",
+    "CatalogEntry",
+    "CatalogTrie",
+    "build_trie",
+    "build_trie_file",
+    "entry_keys",
+    "normalize_key",
+    "DEFAULT_CATALOG_SOURCE",
+    "DEFAULT_CATALOG_TRIE_PATH",
+    "autocomplete",
+    "get_catalog_trie",
+]
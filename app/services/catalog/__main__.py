@@ -0,0 +1,19 @@
+"""
+Compile the food catalog into its trie file:
+
+    python -m app.services.catalog [--source catalog.json] [--output catalog.trie] [--top-k 10]
+"""
+import argparse
+
+from app.services.catalog.autocomplete import DEFAULT_CATALOG_SOURCE, DEFAULT_CATALOG_TRIE_PATH
+from app.services.catalog.trie import DEFAULT_TOP_K, CatalogTrie, build_trie_file
+
+parser = argparse.ArgumentParser(description="Compile the food catalog into a memory-mappable trie")
+parser.add_argument("--source", default=DEFAULT_CATALOG_SOURCE)
+parser.add_argument("--output", default=DEFAULT_CATALOG_TRIE_PATH)
+parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+args = parser.parse_args()
+
+size = build_trie_file(args.source, args.output, args.top_k)
+trie = CatalogTrie.open(args.output)
+print(f"{args.output}: {trie.entry_count} entries, {trie.node_count} nodes, {size / 1024:.1f} KiB")
@@ -0,0 +1,30 @@
+"""
+Food catalog autocomplete over the compiled, memory-mapped trie.
+"""
+import os
+import threading
+from typing import List, Optional
+
+from app.services.catalog.trie import CatalogEntry, CatalogTrie
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+DEFAULT_CATALOG_SOURCE = os.path.join(DATA_DIR, "catalog.json")
+DEFAULT_CATALOG_TRIE_PATH = os.path.join(DATA_DIR, "catalog.trie")
+
+_catalog_trie: Optional[CatalogTrie] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog_trie() -> CatalogTrie:
+    """The trie at CATALOG_TRIE_PATH (default: the bundled one), mapped on first use."""
+    global _catalog_trie
+    if _catalog_trie is None:
+        with _catalog_lock:
+            if _catalog_trie is None:
+                _catalog_trie = CatalogTrie.open(os.getenv("CATALOG_TRIE_PATH", DEFAULT_CATALOG_TRIE_PATH))
+    return _catalog_trie
+
+
+def autocomplete(prefix: str, limit: int) -> List[CatalogEntry]:
+    """Most popular catalog foods with a word starting with `prefix`."""
+    return get_catalog_trie().complete(prefix, limit)
@@ -0,0 +1,241 @@
+"""
+Compact, memory-mapped trie for food-name autocomplete.
+
+The catalog is compiled offline (`python -m app.services.catalog`) into
+one flat little-endian file of fixed-width arrays:
+
+    header       magic, node/entry counts, top-k size, pool sizes
+    first_char   uint32[nodes]      first code point of the edge into each node
+    label_start  uint32[nodes + 1]  each edge's code points, a run of `labels`
+    first_child  uint32[nodes]      children are contiguous, sorted by first_char
+    child_count  uint32[nodes]
+    top_start    uint32[nodes + 1]  each node's best entries, a run of `top`
+    labels       uint32[...]        edge code points
+    top          uint32[...]        entry ids, at most top_k per node
+    entries      uint32[entries * 7] name, category, unit (offset, length) + popularity
+    strings      UTF-8 bytes
+
+It is a radix trie - chains of single-child nodes are collapsed into one
+multi-character edge - numbered breadth-first, so a node's children are
+a sorted run found by binary search. Every node carries its precomputed
+top-k (fewer when its subtree holds fewer entries), so a keystroke is a
+binary search per edge plus reading k ids, with no subtree walk. Entries
+are numbered by popularity, so "best k" is simply "k smallest ids".
+
+Workers `mmap` the file read-only, so every process on a host shares a
+single copy in the page cache, and nothing is parsed at startup.
+"""
+import json
+import mmap
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+MAGIC = b"SSTRIE02"
+HEADER = struct.Struct("<8sIIIIII")
+ENTRY_FIELDS = 7
+DEFAULT_TOP_K = 10
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_key(text: str) -> str:
+    """Lower case with runs of whitespace collapsed - what prefixes are matched on."""
+    return _SPACES.sub(" ", text.strip().lower())
+
+
+def entry_keys(name: str) -> List[str]:
+    """The full name and every suffix starting at a word, so "yog" finds "Greek Yoghurt"."""
+    key = normalize_key(name)
+    return [key] + [key[i + 1:] for i, ch in enumerate(key) if ch == " "]
+
+
+@dataclass
+class CatalogEntry:
+    name: str
+    category: str
+    unit: str
+    popularity: int
+
+
+def build_trie(entries: Iterable[dict], top_k: int = DEFAULT_TOP_K) -> bytes:
+    """Compile {"name", "category", "unit", "popularity"} objects into the file format."""
+    # Most popular first, so entry ids double as ranks
+    ranked = sorted(entries, key=lambda e: (-int(e["popularity"]), normalize_key(e["name"])))
+
+    strings = bytearray()
+    string_offsets: Dict[str, Tuple[int, int]] = {}
+
+    def intern(text: str) -> Tuple[int, int]:
+        if text not in string_offsets:
+            encoded = text.encode("utf-8")
+            string_offsets[text] = (len(strings), len(encoded))
+            strings.extend(encoded)
+        return string_offsets[text]
+
+    # Character trie first
+    entry_table = array("I")
+    children: List[Dict[str, int]] = [{}]
+    terminal: List[List[int]] = [[]]
+    for entry_id, entry in enumerate(ranked):
+        for field in ("name", "category", "unit"):
+            entry_table.extend(intern(entry[field]))
+        entry_table.append(int(entry["popularity"]))
+        for key in entry_keys(entry["name"]):
+            node = 0
+            for ch in key:
+                child = children[node].get(ch)
+                if child is None:
+                    child = children[node][ch] = len(children)
+                    children.append({})
+                    terminal.append([])
+                node = child
+            terminal[node].append(entry_id)
+
+    def edge(node: int, ch: str) -> Tuple[str, int]:
+        """Follow single-child, non-terminal nodes: (edge label, node the edge ends at)."""
+        label = [ch]
+        while not terminal[node] and len(children[node]) == 1:
+            ((ch, node),) = children[node].items()
+            label.append(ch)
+        return "".join(label), node
+
+    # Collapse chains and renumber breadth-first; `ends` maps new ids to character-trie nodes
+    ends = [0]
+    first_char = array("I", [0])
+    label_start = array("I", [0, 0])  # The root's edge is empty
+    labels = array("I")
+    first_child = array("I")
+    child_count = array("I")
+    queue = deque([0])
+    while queue:
+        node = ends[queue.popleft()]
+        first_child.append(len(ends))
+        child_count.append(len(children[node]))
+        for ch in sorted(children[node]):
+            label, end = edge(children[node][ch], ch)
+            queue.append(len(ends))
+            ends.append(end)
+            first_char.append(ord(ch))
+            labels.extend(ord(c) for c in label)
+            label_start.append(len(labels))
+
+    count = len(ends)
+    top_lists: List[List[int]] = [[] for _ in range(count)]
+    for node in range(count - 1, -1, -1):  # Children have higher ids than their parent
+        best = set(terminal[ends[node]])
+        for child in range(first_child[node], first_child[node] + child_count[node]):
+            best.update(top_lists[child])
+        top_lists[node] = sorted(best)[:top_k]
+
+    top = array("I")
+    top_start = array("I", [0])
+    for ids in top_lists:
+        top.extend(ids)
+        top_start.append(len(top))
+
+    tables = (first_char, label_start, first_child, child_count, top_start, labels, top, entry_table)
+    if sys.byteorder != "little":
+        for table in tables:
+            table.byteswap()
+    strings.extend(b"\0" * (-len(strings) % 4))
+    return b"".join(
+        [HEADER.pack(MAGIC, count, len(ranked), top_k, len(labels), len(top), len(strings))]
+        + [table.tobytes() for table in tables]
+        + [bytes(strings)]
+    )
+
+
+def build_trie_file(source: str, output: str, top_k: int = DEFAULT_TOP_K) -> int:
+    """Compile a catalog JSON file; returns the size written."""
+    with open(source, encoding="utf-8") as f:
+        data = build_trie(json.load(f), top_k)
+    with open(output, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+class CatalogTrie:
+    """Read-only view over a compiled trie, from bytes or a memory map."""
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        self._buffer = buffer  # Keep the mapping alive as long as the views
+        magic, nodes, entries, top_k, label_chars, top_size, string_bytes = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a catalog trie file")
+        self.node_count = nodes
+        self.entry_count = entries
+        self.top_k = top_k
+
+        view = memoryview(buffer)
+        offset = HEADER.size
+
+        def table(length: int) -> Sequence[int]:
+            nonlocal offset
+            section = view[offset:offset + 4 * length]
+            offset += 4 * length
+            if sys.byteorder == "little":
+                return section.cast("I")
+            swapped = array("I", section.tobytes())
+            swapped.byteswap()
+            return swapped
+
+        self._first_char = table(nodes)
+        self._label_start = table(nodes + 1)
+        self._first_child = table(nodes)
+        self._child_count = table(nodes)
+        self._top_start = table(nodes + 1)
+        self._labels = table(label_chars)
+        self._top = table(top_size)
+        self._entries = table(entries * ENTRY_FIELDS)
+        self._strings = view[offset:offset + string_bytes]
+
+    @classmethod
+    def open(cls, path: str) -> "CatalogTrie":
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _string(self, offset: int, length: int) -> str:
+        return bytes(self._strings[offset:offset + length]).decode("utf-8")
+
+    def entry(self, entry_id: int) -> CatalogEntry:
+        base = entry_id * ENTRY_FIELDS
+        fields = self._entries[base:base + ENTRY_FIELDS]
+        return CatalogEntry(
+            name=self._string(fields[0], fields[1]),
+            category=self._string(fields[2], fields[3]),
+            unit=self._string(fields[4], fields[5]),
+            popularity=fields[6],
+        )
+
+    def _find(self, key: str) -> int:
+        """Node whose subtree holds every key starting with `key`, or -1."""
+        node, position = 0, 0
+        while position < len(key):
+            lo = self._first_child[node]
+            hi = lo + self._child_count[node]
+            child = bisect_left(self._first_char, ord(key[position]), lo, hi)
+            if child == hi or self._first_char[child] != ord(key[position]):
+                return -1
+            # The key may end part-way along the edge
+            start = self._label_start[child]
+            length = min(self._label_start[child + 1] - start, len(key) - position)
+            for i in range(1, length):
+                if self._labels[start + i] != ord(key[position + i]):
+                    return -1
+            node, position = child, position + length
+        return node
+
+    def complete(self, prefix: str, limit: int) -> List[CatalogEntry]:
+        """Up to `limit` (at most top_k) most popular entries with a word starting with `prefix`."""
+        node = self._find(normalize_key(prefix))
+        if node < 0:
+            return []
+        start = self._top_start[node]
+        end = min(self._top_start[node + 1], start + limit)
+        return [self.entry(entry_id) for entry_id in self._top[start:end]]
@@ -0,0 +1,17 @@
+from app.services.compact.projection import (
+    DRAFT_COLUMNS,
+    DRAFT_DEFAULT_FIELDS,
+    INVENTORY_COLUMNS,
+    INVENTORY_DEFAULT_FIELDS,
+    compact_rows,
+    resolve_fields,
+)
+
+__all__ = [
+    "DRAFT_COLUMNS",
+    "DRAFT_DEFAULT_FIELDS",
+    "INVENTORY_COLUMNS",
+    "INVENTORY_DEFAULT_FIELDS",
+    "compact_rows",
+    "resolve_fields",
+]
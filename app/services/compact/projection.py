@@ -0,0 +1,91 @@
+"""
+Column-projected list queries.
+
+Selects only the requested columns with a Core SELECT and returns plain
+rows, skipping ORM identity-map hydration and per-item Pydantic
+validation. Used by the compact list endpoints.
+"""
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import Float, select, type_coerce
+from sqlalchemy.orm import Session
+
+from app.models.draft_item import DraftItem
+from app.models.inventory_item import InventoryItem
+
+
+# Public field name -> column. Quantities are read as floats, not Decimals.
+INVENTORY_COLUMNS = {
+    "id": InventoryItem.id,
+    "name": InventoryItem.name,
+    "category": InventoryItem.category,
+    "quantity": type_coerce(InventoryItem.quantity, Float),
+    "unit": InventoryItem.unit,
+    "storage_location": InventoryItem.storage_location,
+    "expiry_date": InventoryItem.expiry_date,
+    "created_at": InventoryItem.created_at,
+    "updated_at": InventoryItem.updated_at,
+}
+INVENTORY_DEFAULT_FIELDS = (
+    "id", "name", "category", "quantity", "unit", "storage_location", "expiry_date"
+)
+
+DRAFT_COLUMNS = {
+    "id": DraftItem.id,
+    "name": DraftItem.name,
+    "quantity": type_coerce(DraftItem.quantity, Float),
+    "unit": DraftItem.unit,
+    "expiration_date": DraftItem.expiration_date,
+    "category": DraftItem.category,
+    "location": DraftItem.location,
+    "notes": DraftItem.notes,
+    "source": DraftItem.source,
+    "confidence_score": DraftItem.confidence_score,
+    "created_at": DraftItem.created_at,
+    "updated_at": DraftItem.updated_at,
+}
+DRAFT_DEFAULT_FIELDS = (
+    "id", "name", "quantity", "unit", "expiration_date", "category", "location", "confidence_score"
+)
+
+
+def resolve_fields(
+    fields: Optional[str],
+    available: Dict[str, object],
+    default: Sequence[str]
+) -> List[str]:
+    """
+    Parse a comma-separated `fields` parameter.
+
+    Raises:
+        ValueError: If a requested field is not available
+    """
+    if not fields:
+        return list(default)
+
+    names = []
+    for name in fields.split(","):
+        name = name.strip()
+        if not name or name in names:
+            continue
+        if name not in available:
+            raise ValueError(
+                f"Unknown field '{name}'. Available fields: {', '.join(available)}"
+            )
+        names.append(name)
+
+    return names or list(default)
+
+
+def compact_rows(
+    db: Session,
+    available: Dict[str, object],
+    fields: List[str],
+    *criteria,
+    order_by=None
+) -> list:
+    """Run a SELECT of just the given fields and return the raw rows."""
+    query = select(*(available[name] for name in fields)).where(*criteria)
+    if order_by is not None:
+        query = query.order_by(order_by)
+    return db.execute(query).all()
@@ -0,0 +1,7 @@
+from app.services.export.streaming import EXPORT_BATCH_SIZE, EXPORT_MEDIA_TYPES, stream_export
+
+__all__ = [
+    "EXPORT_BATCH_SIZE",
+    "EXPORT_MEDIA_TYPES",
+    "stream_export",
+]
@@ -0,0 +1,70 @@
+"""
+Streaming exports.
+
+Rows are read through a server-side cursor (`yield_per`) and encoded
+one partition at a time, so an export holds at most one batch of rows
+in memory however large the inventory is. Nothing is built as ORM
+objects or Pydantic models.
+"""
+import csv
+import io
+from typing import Dict, Iterator, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.responses import dump_json
+
+EXPORT_BATCH_SIZE = 500
+
+# Supported ?format= values and their media types
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _encode_ndjson(fields: List[str], rows) -> bytes:
+    return b"".join(
+        dump_json(dict(zip(fields, row))) + b"\n"
+        for row in rows
+    )
+
+
+def _encode_csv(writer, buffer: io.StringIO, rows) -> bytes:
+    writer.writerows(rows)
+    chunk = buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
+
+
+def stream_export(
+    db: Session,
+    available: Dict[str, object],
+    fields: List[str],
+    export_format: str,
+    *criteria,
+    order_by=None
+) -> Iterator[bytes]:
+    """
+    Yield the encoded export one batch at a time.
+
+    CSV output starts with a header row; NDJSON is one object per line.
+    The session must stay open until the generator is exhausted.
+    """
+    query = select(*(available[name] for name in fields)).where(*criteria)
+    if order_by is not None:
+        query = query.order_by(order_by)
+    result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        yield _encode_csv(writer, buffer, ())
+        for partition in result.partitions():
+            yield _encode_csv(writer, buffer, partition)
+    else:
+        for partition in result.partitions():
+            yield _encode_ndjson(fields, partition)
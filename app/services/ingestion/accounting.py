@@ -0,0 +1,263 @@
+"""
+Per-call accounting of vision detection: tokens, payload size, latency.
+
+Every backend call - and every detection served from the cache - leaves
+one `VisionCallRecord`. Backends report what only they know (model,
+prompt version, token usage) through `report_usage`, which writes into
+a collector the caller put in a context variable for the duration of the
+call; calls made without one (tests, scripts) report into nothing.
+
+Records are buffered in process and appended to the `vision_calls`
+table in one multi-row INSERT by a background thread, every
+VISION_USAGE_FLUSH_SECONDS or as soon as VISION_USAGE_FLUSH_SIZE records
+are waiting, so accounting adds no statements to the ingestion request
+and records do not sit in the buffer once traffic stops. A hedge that
+loses still finishes and is still recorded - it was still paid for. The
+usage endpoints flush first; with several workers, other workers' last
+few seconds of calls may not be visible yet.
+"""
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from typing import Callable, Iterator, List, Optional
+from uuid import UUID
+
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.vision_call import VisionCall
+
+VISION_USAGE_FLUSH_SIZE = int(os.getenv("VISION_USAGE_FLUSH_SIZE", "50"))
+VISION_USAGE_FLUSH_SECONDS = float(os.getenv("VISION_USAGE_FLUSH_SECONDS", "30"))
+# Records kept while the database is unreachable, before the oldest are dropped
+VISION_USAGE_MAX_BUFFER = int(os.getenv("VISION_USAGE_MAX_BUFFER", "10000"))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReportedUsage:
+    """What a backend knows about its own call."""
+    model: Optional[str] = None
+    prompt_version: Optional[str] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+
+
+_call_usage: ContextVar[Optional[ReportedUsage]] = ContextVar("vision_call_usage", default=None)
+
+
+@contextmanager
+def collecting_usage() -> Iterator[ReportedUsage]:
+    """Collect the usage reported by the backend call made inside the block."""
+    usage = ReportedUsage()
+    token = _call_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _call_usage.reset(token)
+
+
+def report_usage(
+    model: str,
+    prompt_version: Optional[str] = None,
+    input_tokens: Optional[int] = None,
+    output_tokens: Optional[int] = None
+) -> None:
+    """Called by a backend about its own call; a no-op unless someone is collecting."""
+    usage = _call_usage.get()
+    if usage is not None:
+        usage.model = model
+        usage.prompt_version = prompt_version
+        usage.input_tokens = input_tokens
+        usage.output_tokens = output_tokens
+
+
+def encoded_size(image_bytes: bytes) -> int:
+    """Size of the image once base64-encoded, as sent to the provider."""
+    return 4 * ((len(image_bytes) + 2) // 3)
+
+
+@dataclass
+class VisionCallRecord:
+    """One row of `vision_calls`."""
+    user_id: Optional[UUID]
+    model: str
+    prompt_version: Optional[str]
+    input_tokens: Optional[int]
+    output_tokens: Optional[int]
+    image_bytes: int
+    latency_ms: int
+    item_count: int
+    cache_hit: bool
+    hedge: bool
+    success: bool
+    called_on: date
+    created_at: datetime
+
+
+class VisionUsageRecorder:
+    """
+    Buffers call records and appends them to `vision_calls` in batches,
+    from a daemon thread between `start()` and `stop()`.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        flush_size: int = VISION_USAGE_FLUSH_SIZE,
+        flush_seconds: float = VISION_USAGE_FLUSH_SECONDS,
+        max_buffer: int = VISION_USAGE_MAX_BUFFER
+    ):
+        self.session_factory = session_factory
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self.max_buffer = max_buffer
+        self._buffer: List[VisionCallRecord] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, record: VisionCallRecord) -> None:
+        """Buffer `record`; a full batch wakes the flush thread instead of writing here."""
+        with self._lock:
+            self._buffer.append(record)
+            due = len(self._buffer) >= self.flush_size
+        if due:
+            self._wake.set()
+
+    def start(self) -> None:
+        """Flush in a daemon thread until `stop()`."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="vision-usage", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flush thread, then write out whatever is left."""
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            if not self._stop.is_set():
+                self.flush()
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """
+        Write out the buffer, in `db` if given (committing it), else a new
+        session. Returns the number of records written. Never raises: a
+        failed batch goes back into the buffer for the next flush.
+        """
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+
+        session = db or self.session_factory()
+        try:
+            session.execute(insert(VisionCall), [asdict(record) for record in batch])
+            session.commit()
+            return len(batch)
+        except Exception:
+            session.rollback()
+            logger.warning("Failed to write %d vision call records", len(batch), exc_info=True)
+            with self._lock:
+                self._buffer = (batch + self._buffer)[-self.max_buffer:]
+            return 0
+        finally:
+            if db is None:
+                session.close()
+
+    def pending(self) -> List[VisionCallRecord]:
+        with self._lock:
+            return list(self._buffer)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buffer.clear()
+
+
+# Singleton instance
+vision_usage = VisionUsageRecorder(session_factory=SessionLocal)
+
+
+@dataclass
+class VisionUsageTotals:
+    """Aggregated calls for one day, user, prompt version or model."""
+    key: Optional[str]
+    calls: int
+    cache_hits: int
+    hedges: int
+    errors: int
+    input_tokens: int
+    output_tokens: int
+    image_bytes: int
+    items: int
+    mean_latency_ms: Optional[float]  # Over calls that reached a provider
+    max_latency_ms: Optional[int]
+
+
+GROUP_COLUMNS = {
+    "day": VisionCall.called_on,
+    "user": VisionCall.user_id,
+    "prompt_version": VisionCall.prompt_version,
+    "model": VisionCall.model,
+}
+
+
+def aggregate_vision_calls(db: Session, group_by: str, start: date, end: date) -> List[VisionUsageTotals]:
+    """Totals per `group_by` value for calls made between start and end, inclusive."""
+    key = GROUP_COLUMNS[group_by]
+    provider_latency = case((VisionCall.cache_hit.is_(False), VisionCall.latency_ms))
+
+    def count_of(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    rows = db.execute(
+        select(
+            key,
+            func.count(),
+            count_of(VisionCall.cache_hit.is_(True)),
+            count_of(VisionCall.hedge.is_(True)),
+            count_of(VisionCall.success.is_(False)),
+            func.coalesce(func.sum(VisionCall.input_tokens), 0),
+            func.coalesce(func.sum(VisionCall.output_tokens), 0),
+            func.sum(VisionCall.image_bytes),
+            func.sum(VisionCall.item_count),
+            func.avg(provider_latency),
+            func.max(provider_latency),
+        )
+        .where(VisionCall.called_on >= start, VisionCall.called_on <= end)
+        .group_by(key)
+        .order_by(key)
+    ).all()
+    return [
+        VisionUsageTotals(
+            key=None if row[0] is None else str(row[0]),
+            calls=row[1],
+            cache_hits=row[2],
+            hedges=row[3],
+            errors=row[4],
+            input_tokens=row[5],
+            output_tokens=row[6],
+            image_bytes=row[7],
+            items=row[8],
+            mean_latency_ms=None if row[9] is None else round(float(row[9]), 1),
+            max_latency_ms=row[10],
+        )
+        for row in rows
+    ]
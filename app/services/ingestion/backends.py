@@ -0,0 +1,123 @@
+"""
+Detection backends: anything that turns image bytes into food items.
+
+A backend is named "provider" or "provider:model" - "openai:gpt-5.2",
+"openai:gpt-5-mini", "local" - and created from that name through
+`detection_backends`, a registry of provider factories. VISION_BACKENDS
+lists the backends ingestion uses, primary first; the rest are only
+asked when the primary is slow or fails (see hedging.py).
+
+The "local" provider is an offline stub with a fixed answer, for tests
+and load runs without API spend; "local:<ms>" adds that much latency.
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Protocol, Sequence
+
+from app.services.ingestion.gpt4o_vision import (
+    DEFAULT_VISION_MODEL,
+    DetectedFoodItem,
+    GPT4oVisionClient,
+    gpt4o_vision_client,
+)
+
+STUB_ITEMS = (
+    DetectedFoodItem(name="whole milk", category="Dairy", quantity=1, unit="Liters", quantity_confidence=0.9),
+    DetectedFoodItem(name="cheddar cheese", category="Dairy", quantity=200, unit="Grams", quantity_confidence=0.7),
+    DetectedFoodItem(name="red apples", category="Fruits", quantity=4, unit="Pieces", quantity_confidence=0.95),
+)
+
+
+class DetectionBackend(Protocol):
+    """Detects food items in an image; raises RuntimeError when the call fails."""
+    name: str
+
+    def detect_food_items(self, image_bytes: bytes) -> List[DetectedFoodItem]:
+        ...
+
+
+class LocalStubBackend:
+    """Offline backend answering with a fixed list of items after `latency_ms`."""
+
+    def __init__(
+        self,
+        items: Sequence[DetectedFoodItem] = STUB_ITEMS,
+        latency_ms: float = 0.0,
+        name: str = "local"
+    ):
+        self.items = list(items)
+        self.latency_ms = latency_ms
+        self.name = name
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def detect_food_items(self, image_bytes: bytes) -> List[DetectedFoodItem]:
+        with self._lock:
+            self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        # Copies, so callers cannot alter the canned answer
+        return [DetectedFoodItem(**vars(item)) for item in self.items]
+
+
+BackendFactory = Callable[[Optional[str]], DetectionBackend]
+
+
+class BackendRegistry:
+    """Provider name -> factory taking the (optional) model part of a backend name."""
+
+    def __init__(self):
+        self._factories: Dict[str, BackendFactory] = {}
+
+    def register(self, provider: str, factory: BackendFactory) -> None:
+        self._factories[provider] = factory
+
+    def providers(self) -> List[str]:
+        return sorted(self._factories)
+
+    def create(self, name: str) -> DetectionBackend:
+        """
+        Backend for "provider" or "provider:model".
+
+        Raises:
+            ValueError: If the provider is not registered
+        """
+        provider, _, model = name.strip().partition(":")
+        factory = self._factories.get(provider)
+        if factory is None:
+            raise ValueError(
+                f"Unknown detection backend '{name}'. Known providers: {', '.join(self.providers())}"
+            )
+        return factory(model or None)
+
+
+_openai_clients: Dict[str, GPT4oVisionClient] = {}
+
+
+def _openai_backend(model: Optional[str]) -> DetectionBackend:
+    # One client (and HTTP connection pool) per model
+    model = model or DEFAULT_VISION_MODEL
+    if model == DEFAULT_VISION_MODEL:
+        return gpt4o_vision_client
+    if model not in _openai_clients:
+        _openai_clients[model] = GPT4oVisionClient(model=model)
+    return _openai_clients[model]
+
+
+def _local_backend(latency: Optional[str]) -> DetectionBackend:
+    if latency is None:
+        return LocalStubBackend()
+    return LocalStubBackend(latency_ms=float(latency), name=f"local:{latency}")
+
+
+# Singleton instance
+detection_backends = BackendRegistry()
+detection_backends.register("openai", _openai_backend)
+detection_backends.register("local", _local_backend)
+
+
+def configured_backends() -> List[DetectionBackend]:
+    """Backends named in VISION_BACKENDS (comma-separated, primary first); empty when unset."""
+    names = [name for name in os.getenv("VISION_BACKENDS", "").split(",") if name.strip()]
+    return [detection_backends.create(name) for name in names]
@@ -0,0 +1,70 @@
+"""
+Cache of detections by exact image content.
+
+The same photo is often uploaded again - a retry without an
+Idempotency-Key, a second tap, a re-scan after editing a draft. Keyed by
+a digest of the image bytes and the backends that would be asked, a
+repeat is answered without a paid vision call (and recorded as a cache
+hit). Only successful, non-empty detections are kept; entries expire
+after VISION_CACHE_TTL_SECONDS. Per process, like the other caches here.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+from app.services.ingestion.backends import DetectionBackend
+from app.services.ingestion.hedging import Detection
+
+VISION_CACHE_MAX_ENTRIES = int(os.getenv("VISION_CACHE_MAX_ENTRIES", "512"))
+VISION_CACHE_TTL_SECONDS = float(os.getenv("VISION_CACHE_TTL_SECONDS", "3600"))
+
+
+class DetectionCache:
+    """Bounded LRU of detections with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()  # key -> (expires at, detection)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(image_bytes: bytes, backends: Sequence[DetectionBackend]) -> bytes:
+        digest = hashlib.sha256(image_bytes)
+        for backend in backends:
+            digest.update(b"\0" + str(backend.name).encode("utf-8"))
+        return digest.digest()
+
+    def get(self, key: bytes, now: Optional[float] = None) -> Optional[Detection]:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: bytes, detection: Detection, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, detection)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Singleton instance
+detection_cache = DetectionCache(max_entries=VISION_CACHE_MAX_ENTRIES, ttl_seconds=VISION_CACHE_TTL_SECONDS)
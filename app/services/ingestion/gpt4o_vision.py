@@ -4,6 +4,7 @@ GPT-5.2 Vision API client for food item detection.
 Uses OpenAI's GPT-5.2 model to analyze images and detect food items.
 """
 import base64
+import hashlib
 import json
 from dataclasses import dataclass
 from typing import List, Optional
@@ -11,6 +12,9 @@ from typing import List, Optional
 from openai import OpenAI
 
 from app.core.config import get_openai_api_key
+from app.services.ingestion.accounting import report_usage
+
+DEFAULT_VISION_MODEL = "gpt-5.2"
 
 
 @dataclass
@@ -78,6 +82,9 @@ Example output:
 
 If no food items are visible, return: {"items": []}"""
 
+# Changes whenever the prompt text does, so usage can be compared across prompt edits
+DETECTION_PROMPT_VERSION = hashlib.sha256(DETECTION_PROMPT.encode("utf-8")).hexdigest()[:8]
+
 
 class GPT4oVisionClient:
     """
@@ -87,8 +94,10 @@ class GPT4oVisionClient:
     for food item detection.
     """
 
-    def __init__(self):
+    def __init__(self, model: str = DEFAULT_VISION_MODEL):
         """Initialize the OpenAI client."""
+        self.model = model
+        self.name = f"openai:{model}"
         self._client: Optional[OpenAI] = None
 
     @property
@@ -120,7 +129,7 @@ class GPT4oVisionClient:
 
         try:
             response = self.client.chat.completions.create(
-                model="gpt-5.2",
+                model=self.model,
                 messages=[
                     {
                         "role": "user",
@@ -140,8 +149,17 @@ class GPT4oVisionClient:
                 max_tokens=800  # Increased to accommodate quantity fields per item
             )
         except Exception as e:
+            report_usage(model=self.model, prompt_version=DETECTION_PROMPT_VERSION)
             raise RuntimeError(f"GPT-5.2 API error: {str(e)}")
 
+        usage = getattr(response, "usage", None)
+        report_usage(
+            model=self.model,
+            prompt_version=DETECTION_PROMPT_VERSION,
+            input_tokens=usage.prompt_tokens if usage else None,
+            output_tokens=usage.completion_tokens if usage else None
+        )
+
         # Parse response
         content = response.choices[0].message.content
         if not content:
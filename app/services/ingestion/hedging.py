@@ -0,0 +1,217 @@
+"""
+Hedged requests across detection backends.
+
+The primary backend gets the image alone. If it has not answered by its
+own observed p95 latency, the next backend is sent the same image and
+the first answer with items wins; a backend that fails or finds nothing
+hands over at once rather than after the delay. An empty answer is only
+returned once no other backend can answer. So ingestion latency is capped near the
+primary's p95 plus the hedge's typical latency, instead of following
+one provider's slowest responses, while only about 5% of requests cost
+a second call.
+
+The blocking SDK call cannot be cancelled, so a losing call runs to
+completion in the pool and its answer is dropped - but its latency is
+still recorded, keeping every backend's percentile honest. Until a
+backend has VISION_HEDGE_MIN_SAMPLES successful calls, its delay is
+VISION_HEDGE_DEFAULT_DELAY_SECONDS.
+
+Every call, hedge or not, winner or not, is recorded for accounting.
+"""
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from app.services.ingestion.accounting import VisionCallRecord, collecting_usage, encoded_size, vision_usage
+from app.services.ingestion.backends import DetectionBackend
+from app.services.ingestion.gpt4o_vision import DetectedFoodItem
+
+HEDGE_PERCENTILE = float(os.getenv("VISION_HEDGE_PERCENTILE", "0.95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("VISION_HEDGE_MIN_SAMPLES", "20"))
+HEDGE_DEFAULT_DELAY_SECONDS = float(os.getenv("VISION_HEDGE_DEFAULT_DELAY_SECONDS", "4.0"))
+HEDGE_MIN_DELAY_SECONDS = float(os.getenv("VISION_HEDGE_MIN_DELAY_SECONDS", "0.1"))
+HEDGE_WINDOW = int(os.getenv("VISION_HEDGE_WINDOW", "200"))
+HEDGE_WORKERS = int(os.getenv("VISION_HEDGE_WORKERS", "16"))
+
+
+class LatencyWindow:
+    """The last `size` successful call durations of one backend."""
+
+    def __init__(self, size: int):
+        self._samples: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float, min_samples: int) -> Optional[float]:
+        """Nearest-rank percentile, or None with fewer than `min_samples` samples."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples or len(samples) < min_samples:
+            return None
+        return samples[max(0, math.ceil(fraction * len(samples)) - 1)]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+@dataclass
+class HedgePolicy:
+    """When to give up waiting on one backend and ask the next."""
+    percentile: float = HEDGE_PERCENTILE
+    min_samples: int = HEDGE_MIN_SAMPLES
+    default_delay: float = HEDGE_DEFAULT_DELAY_SECONDS
+    min_delay: float = HEDGE_MIN_DELAY_SECONDS
+
+    def delay(self, window: LatencyWindow) -> float:
+        observed = window.percentile(self.percentile, self.min_samples)
+        return max(self.min_delay, self.default_delay if observed is None else observed)
+
+
+def accounted_call(
+    backend: DetectionBackend,
+    image_bytes: bytes,
+    user_id: Optional[UUID] = None,
+    hedge: bool = False
+) -> Tuple[List[DetectedFoodItem], VisionCallRecord]:
+    """
+    Call one backend and record the call, failed or not.
+
+    Raises:
+        Whatever the backend raises, after recording it
+    """
+    items: Optional[List[DetectedFoodItem]] = None
+    started = time.perf_counter()
+    with collecting_usage() as usage:
+        try:
+            items = backend.detect_food_items(image_bytes)
+        finally:
+            record = VisionCallRecord(
+                user_id=user_id,
+                model=usage.model or str(backend.name),
+                prompt_version=usage.prompt_version,
+                input_tokens=usage.input_tokens,
+                output_tokens=usage.output_tokens,
+                image_bytes=encoded_size(image_bytes),
+                latency_ms=round((time.perf_counter() - started) * 1000),
+                item_count=len(items or ()),
+                cache_hit=False,
+                hedge=hedge,
+                success=items is not None,
+                called_on=date.today(),
+                created_at=datetime.now(timezone.utc),
+            )
+            vision_usage.record(record)
+    return items, record
+
+
+@dataclass
+class Detection:
+    """The winning answer and who gave it."""
+    items: List[DetectedFoodItem]
+    backend: str
+    hedged: bool  # More than one backend was asked
+    record: VisionCallRecord  # Accounting record of the winning call
+
+
+class HedgedDetector:
+    """Sends an image to backends in order, hedging on slow or failed calls."""
+
+    def __init__(self, policy: Optional[HedgePolicy] = None, window_size: int = HEDGE_WINDOW,
+                 max_workers: int = HEDGE_WORKERS):
+        self.policy = policy or HedgePolicy()
+        self.window_size = window_size
+        self.max_workers = max_workers
+        self._windows: Dict[str, LatencyWindow] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def window(self, backend_name: str) -> LatencyWindow:
+        with self._lock:
+            if backend_name not in self._windows:
+                self._windows[backend_name] = LatencyWindow(self.window_size)
+            return self._windows[backend_name]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._windows.clear()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="vision-hedge")
+            return self._executor
+
+    def _timed_call(
+        self, backend: DetectionBackend, image_bytes: bytes, user_id: Optional[UUID], hedge: bool
+    ) -> Tuple[List[DetectedFoodItem], VisionCallRecord]:
+        started = time.perf_counter()
+        answer = accounted_call(backend, image_bytes, user_id, hedge)
+        self.window(backend.name).record(time.perf_counter() - started)
+        return answer
+
+    def detect(
+        self, backends: Sequence[DetectionBackend], image_bytes: bytes, user_id: Optional[UUID] = None
+    ) -> Detection:
+        """
+        First answer with items from `backends` (primary first), else the
+        first empty answer once every backend has answered, each call
+        recorded against `user_id`.
+
+        Raises:
+            The first backend error, if every backend fails
+        """
+        if len(backends) == 1:
+            # Nothing to hedge with: call inline, without a thread hop
+            backend = backends[0]
+            items, record = accounted_call(backend, image_bytes, user_id)
+            return Detection(items=items, backend=backend.name, hedged=False, record=record)
+
+        pool = self._pool()
+        launched: Dict[Future, DetectionBackend] = {}
+        errors: List[BaseException] = []
+        empty: Optional[Tuple[str, List[DetectedFoodItem], VisionCallRecord]] = None  # First empty answer
+
+        def launch(backend: DetectionBackend) -> Future:
+            future = pool.submit(self._timed_call, backend, image_bytes, user_id, bool(launched))
+            launched[future] = backend
+            return future
+
+        pending = {launch(backends[0])}
+        while pending:
+            waiting_on = backends[len(launched) - 1]
+            timeout = self.policy.delay(self.window(waiting_on.name)) if len(launched) < len(backends) else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is not None:
+                    errors.append(error)
+                    continue
+                items, record = future.result()
+                if items:
+                    return Detection(
+                        items=items, backend=launched[future].name, hedged=len(launched) > 1, record=record
+                    )
+                if empty is None:
+                    empty = (launched[future].name, items, record)
+            # Timed out, or everything that finished failed or found nothing: ask the next backend
+            if len(launched) < len(backends):
+                pending.add(launch(backends[len(launched)]))
+        if empty is not None:
+            # Nothing better can arrive: every backend has answered or failed
+            backend_name, items, record = empty
+            return Detection(items=items, backend=backend_name, hedged=len(launched) > 1, record=record)
+        raise errors[0]
+
+
+# Singleton instance
+hedged_detector = HedgedDetector()
@@ -3,12 +3,24 @@ Image-based food item detection service.
 
 Orchestrates GPT-5.2 vision detection with category normalization
 and expiry prediction to produce draft-ready item data.
-"""
-from dataclasses import dataclass, field
-from typing import List, Optional
-from datetime import date
 
+Detection goes to the GPT-5.2 client unless VISION_BACKENDS names other
+backends; with more than one, slow or failed calls are hedged. A repeat
+of an image already detected is answered from the detection cache. Each
+call and cache hit is recorded for cost and latency accounting.
+"""
+import time
+from dataclasses import dataclass, field, replace
+from typing import List, Optional, Sequence
+from datetime import date, datetime, timezone
+from uuid import UUID
+
+from app.core.metrics import metrics
+from app.services.ingestion.accounting import vision_usage
+from app.services.ingestion.backends import DetectionBackend, configured_backends
+from app.services.ingestion.cache import DetectionCache, detection_cache
 from app.services.ingestion.gpt4o_vision import gpt4o_vision_client, DetectedFoodItem
+from app.services.ingestion.hedging import Detection, HedgedDetector, hedged_detector
 from app.services.expiry_prediction import expiry_prediction_service
 
 
@@ -49,6 +61,8 @@ class ImageIngestionResult:
     success: bool
     detected_items: List[DetectedItemWithPrediction] = field(default_factory=list)
     error_message: Optional[str] = None
+    backend: Optional[str] = None  # Backend whose answer was used
+    hedged: bool = False
 
 
 class ImageIngestionService:
@@ -62,10 +76,25 @@ class ImageIngestionService:
     4. Return draft-ready data for router to persist
     """
 
+    def __init__(
+        self,
+        backends: Optional[Sequence[DetectionBackend]] = None,
+        detector: Optional[HedgedDetector] = None,
+        cache: Optional[DetectionCache] = None
+    ):
+        self.backends = list(backends) if backends else None
+        self.detector = detector or hedged_detector
+        self.cache = cache or detection_cache
+
+    def _backends(self) -> List[DetectionBackend]:
+        # Looked up per call so the default client can be swapped at runtime
+        return self.backends or [gpt4o_vision_client]
+
     def ingest_from_image(
         self,
         image_bytes: bytes,
-        storage_location: str = "fridge"
+        storage_location: str = "fridge",
+        user_id: Optional[UUID] = None
     ) -> ImageIngestionResult:
         """
         Detect food items from image and return draft-ready data.
@@ -73,25 +102,38 @@ class ImageIngestionService:
         Args:
             image_bytes: Raw image file bytes
             storage_location: Where items will be stored (fridge, freezer, pantry)
+            user_id: Who the vision calls are accounted to
 
         Returns:
             ImageIngestionResult with detected items and predictions
         """
-        # Step 1: Call GPT-5.2 Vision API
-        try:
-            raw_items = gpt4o_vision_client.detect_food_items(image_bytes)
-        except RuntimeError as e:
-            return ImageIngestionResult(
-                success=False,
-                error_message=str(e)
-            )
-        except Exception as e:
-            return ImageIngestionResult(
-                success=False,
-                error_message=f"Unexpected error during image analysis: {str(e)}"
-            )
+        # Step 1: Call GPT-5.2 Vision API (timed separately from DB work),
+        # unless this exact image was detected recently
+        backends = self._backends()
+        cache_key = self.cache.key(image_bytes, backends)
+        started = time.perf_counter()
+        detection = self.cache.get(cache_key)
+        if detection is not None:
+            self._record_cache_hit(detection, user_id, started)
+        else:
+            try:
+                with metrics.time_vision_call():
+                    detection = self.detector.detect(backends, image_bytes, user_id=user_id)
+            except RuntimeError as e:
+                return ImageIngestionResult(
+                    success=False,
+                    error_message=str(e)
+                )
+            except Exception as e:
+                return ImageIngestionResult(
+                    success=False,
+                    error_message=f"Unexpected error during image analysis: {str(e)}"
+                )
+            if detection.items:
+                self.cache.put(cache_key, detection)
 
         # Step 2: Check if any items were detected
+        raw_items = detection.items
         if not raw_items:
             return ImageIngestionResult(
                 success=False,
@@ -129,9 +171,25 @@ class ImageIngestionService:
 
         return ImageIngestionResult(
             success=True,
-            detected_items=processed_items
+            detected_items=processed_items,
+            backend=detection.backend,
+            hedged=detection.hedged
         )
 
+    def _record_cache_hit(self, detection: Detection, user_id: Optional[UUID], started: float) -> None:
+        """Account a cached answer: the original call's model and prompt, no tokens spent."""
+        vision_usage.record(replace(
+            detection.record,
+            user_id=user_id,
+            input_tokens=0,
+            output_tokens=0,
+            latency_ms=round((time.perf_counter() - started) * 1000),
+            cache_hit=True,
+            hedge=False,
+            called_on=date.today(),
+            created_at=datetime.now(timezone.utc),
+        ))
+
     def _normalize_category(self, category: Optional[str]) -> Optional[str]:
         """
         Normalize GPT-5.2 category to SnapShelf category.
@@ -185,4 +243,4 @@ class ImageIngestionService:
 
 
 # Singleton instance
-image_ingestion_service = ImageIngestionService()
+image_ingestion_service = ImageIngestionService(backends=configured_backends())
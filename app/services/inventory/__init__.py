@@ -0,0 +1,25 @@
+from app.services.inventory.grouping import (
+    UNIT_CONVERSIONS,
+    format_quantity_with_unit,
+    grouped_inventory,
+)
+from app.services.inventory.expiry_summary import (
+    ExpirySummary,
+    backfill_expiry_summary,
+    backfilled_users,
+    get_expiry_summary,
+    rebuild_expiry_summary,
+    record_expiry_change,
+)
+
+__all__ = [
+    "UNIT_CONVERSIONS",
+    "format_quantity_with_unit",
+    "grouped_inventory",
+    "ExpirySummary",
+    "backfill_expiry_summary",
+    "backfilled_users",
+    "get_expiry_summary",
+    "rebuild_expiry_summary",
+    "record_expiry_change",
+]
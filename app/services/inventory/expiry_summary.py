@@ -0,0 +1,196 @@
+"""
+Incrementally maintained per-user expiry summary.
+
+Keeps one row per (user, expiry date) with the number of items expiring
+that day. Routers report expiry dates that were added or removed inside
+their own transaction, so the summary stays consistent with the
+inventory without ever scanning it. Reading the summary touches at most
+the next week's buckets plus any expired ones.
+
+Bucket writes are upserts (INSERT ... ON CONFLICT DO UPDATE), so two
+transactions creating the same user's first bucket for a date cannot
+collide on the key. Inventories created before the summary existed are
+backfilled by the user's first write or summary read after it: a
+per-user marker row records that the buckets were built from the
+inventory table, so a legacy user's first write cannot pass for a
+complete summary.
+"""
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.expiry_bucket import ExpirySummaryState, InventoryExpiryBucket
+from app.models.inventory_item import InventoryItem
+
+
+@dataclass
+class ExpirySummary:
+    """Badge counts for the home screen."""
+    expired: int
+    expiring_today: int
+    expiring_within_3_days: int  # Includes today
+    expiring_within_7_days: int  # Includes today
+    earliest_expiry: Optional[date]
+
+
+# Users whose marker row is known to be committed; per process, so a
+# marked user costs one marker statement per process at most
+backfilled_users: Set[UUID] = set()
+
+
+def _dialect(db: Session):
+    return postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+
+
+def _claim_backfill(db: Session, user_id: UUID) -> bool:
+    """
+    Add the user's marker row. True if this call added it, so the caller
+    must rebuild the buckets in the same transaction.
+    """
+    if user_id in backfilled_users:
+        return False
+    inserted = db.execute(
+        _dialect(db).insert(ExpirySummaryState)
+        .values(user_id=user_id)
+        .on_conflict_do_nothing(index_elements=[ExpirySummaryState.user_id])
+        .returning(ExpirySummaryState.user_id)
+    ).first() is not None
+    if not inserted:
+        # Remembered only once seen committed, so a rolled-back claim is retried
+        backfilled_users.add(user_id)
+    return inserted
+
+
+def _upsert_buckets(db: Session, rows: list, increment: bool) -> None:
+    """Insert bucket rows; on an existing (user, date) add to its count, or replace it."""
+    stmt = _dialect(db).insert(InventoryExpiryBucket)
+    new_count = stmt.excluded.item_count
+    if increment:
+        new_count = InventoryExpiryBucket.item_count + new_count
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[InventoryExpiryBucket.user_id, InventoryExpiryBucket.expiry_date],
+            set_={"item_count": new_count}
+        ),
+        rows
+    )
+
+
+def record_expiry_change(
+    db: Session,
+    user_id: UUID,
+    added: Iterable[date] = (),
+    removed: Iterable[date] = ()
+) -> None:
+    """
+    Apply added/removed expiry dates to the user's buckets.
+
+    Does not commit - call inside the transaction that changes the items,
+    after changing them: a user not yet backfilled gets their buckets
+    rebuilt from the inventory table instead.
+    """
+    if _claim_backfill(db, user_id):
+        db.flush()
+        rebuild_expiry_summary(db, user_id)
+        return
+
+    delta = Counter(added)
+    delta.subtract(Counter(removed))
+    rows = [
+        {"user_id": user_id, "expiry_date": expiry_date, "item_count": change}
+        for expiry_date, change in delta.items()
+        if change != 0
+    ]
+    if not rows:
+        return
+    _upsert_buckets(db, rows, increment=True)
+
+    # Drop emptied buckets so "earliest expiry" stays a single index lookup;
+    # only a decrement can empty one
+    if any(row["item_count"] < 0 for row in rows):
+        db.execute(
+            delete(InventoryExpiryBucket).where(
+                InventoryExpiryBucket.user_id == user_id,
+                InventoryExpiryBucket.item_count <= 0
+            )
+        )
+
+
+def rebuild_expiry_summary(db: Session, user_id: UUID) -> None:
+    """
+    Recompute a user's buckets from the inventory table.
+
+    Backfills inventories created before the summary existed (see
+    `backfill_expiry_summary`). Does not commit.
+    """
+    db.execute(delete(InventoryExpiryBucket).where(InventoryExpiryBucket.user_id == user_id))
+    counts = db.execute(
+        select(InventoryItem.expiry_date, func.count())
+        .where(InventoryItem.user_id == user_id)
+        .group_by(InventoryItem.expiry_date)
+    ).all()
+    if counts:
+        # A concurrent rebuild may have inserted the same buckets: replace, not add
+        _upsert_buckets(
+            db,
+            [
+                {"user_id": user_id, "expiry_date": expiry_date, "item_count": count}
+                for expiry_date, count in counts
+            ],
+            increment=False
+        )
+
+
+def backfill_expiry_summary(db: Session, user_id: UUID) -> bool:
+    """
+    Rebuild the buckets of a user who was never backfilled - possibly an
+    inventory from before the summary existed. Returns whether it did;
+    the caller commits.
+    """
+    if not _claim_backfill(db, user_id):
+        return False
+    rebuild_expiry_summary(db, user_id)
+    return True
+
+
+def get_expiry_summary(db: Session, user_id: UUID, today: Optional[date] = None) -> ExpirySummary:
+    """Read the badge counts for a user from the precomputed buckets."""
+    if today is None:
+        today = date.today()
+
+    buckets = db.execute(
+        select(InventoryExpiryBucket.expiry_date, InventoryExpiryBucket.item_count)
+        .where(
+            InventoryExpiryBucket.user_id == user_id,
+            InventoryExpiryBucket.expiry_date <= today + timedelta(days=7)
+        )
+        .order_by(InventoryExpiryBucket.expiry_date)
+    ).all()
+
+    if buckets:
+        earliest_expiry = buckets[0].expiry_date
+    else:
+        earliest_expiry = db.execute(
+            select(func.min(InventoryExpiryBucket.expiry_date))
+            .where(InventoryExpiryBucket.user_id == user_id)
+        ).scalar()
+
+    def count_between(first: Optional[date], last: date) -> int:
+        return sum(
+            count for expiry_date, count in buckets
+            if (first is None or expiry_date >= first) and expiry_date <= last
+        )
+
+    return ExpirySummary(
+        expired=count_between(None, today - timedelta(days=1)),
+        expiring_today=count_between(today, today),
+        expiring_within_3_days=count_between(today, today + timedelta(days=3)),
+        expiring_within_7_days=count_between(today, today + timedelta(days=7)),
+        earliest_expiry=earliest_expiry,
+    )
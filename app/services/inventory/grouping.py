@@ -0,0 +1,152 @@
+"""
+Server-side grouping of inventory items.
+
+Merges items that share a normalized name, expiry date and unit group
+(weight, volume or count) into one row, summing quantities in the
+group's base unit. Mirrors the merge the mobile app used to perform
+on-device, but runs as a single GROUP BY query.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.models.inventory_item import InventoryItem
+
+
+# Unit (lowercase) -> (base unit, factor to base unit, unit group)
+UNIT_CONVERSIONS = {
+    "grams": ("Grams", 1, "weight"),
+    "kilograms": ("Grams", 1000, "weight"),
+    "milliliters": ("Milliliters", 1, "volume"),
+    "liters": ("Milliliters", 1000, "volume"),
+    "pieces": ("Pieces", 1, "count"),
+}
+
+
+@dataclass
+class InventoryGroup:
+    """One merged inventory row with the ids of the items it represents."""
+    id: UUID  # Lowest member id, so the row can be used like a regular item
+    user_id: UUID
+    name: str
+    category: str
+    quantity: float
+    unit: str
+    storage_location: str
+    expiry_date: date
+    created_at: datetime
+    updated_at: datetime
+    base_quantity: float
+    base_unit: str
+    merged_ids: List[UUID]
+    merged_count: int
+
+
+def format_quantity_with_unit(base_quantity: float, base_unit: str) -> tuple[float, str]:
+    """
+    Pick a readable display unit for a base-unit quantity.
+
+    e.g. 1500 Grams -> 1.5 Kilograms, 250 Milliliters -> 250 Milliliters
+    """
+    normalized = base_unit.lower().strip()
+
+    if normalized in ("grams", "milliliters"):
+        larger_unit = "Kilograms" if normalized == "grams" else "Liters"
+        if base_quantity >= 1000:
+            return round(base_quantity / 1000, 2), larger_unit
+        return round(base_quantity, 1), base_unit
+
+    return round(base_quantity, 2), base_unit[:1].upper() + base_unit[1:].lower()
+
+
+def _member_ids_column(dialect_name: str):
+    """Aggregate member ids into one column (array on Postgres, CSV on SQLite)."""
+    if dialect_name == "postgresql":
+        return func.array_agg(aggregate_order_by(InventoryItem.id, InventoryItem.id))
+    return func.group_concat(InventoryItem.id)
+
+
+def _parse_member_ids(value) -> List[UUID]:
+    """Member ids in ascending order, so a group's representative id is stable between requests."""
+    if isinstance(value, str):
+        members = [UUID(member) for member in value.split(",")]
+    else:
+        members = [member if isinstance(member, UUID) else UUID(str(member)) for member in value]
+    # group_concat has no defined order
+    return sorted(members)
+
+
+def grouped_inventory(db: Session, user_id: UUID) -> List[InventoryGroup]:
+    """
+    Return the user's inventory merged by name, expiry date and unit group.
+
+    Unknown units are grouped by the unit itself rather than lumped
+    together, so "cups" and "tbsp" are never summed.
+    """
+    unit_key = func.lower(func.trim(InventoryItem.unit))
+    unit_group = case(
+        {unit: group for unit, (_, _, group) in UNIT_CONVERSIONS.items()},
+        value=unit_key,
+        else_=literal("unit:").concat(unit_key),
+    )
+    base_unit = case(
+        {unit: base for unit, (base, _, _) in UNIT_CONVERSIONS.items()},
+        value=unit_key,
+        else_=InventoryItem.unit,
+    )
+    factor = case(
+        {unit: factor for unit, (_, factor, _) in UNIT_CONVERSIONS.items()},
+        value=unit_key,
+        else_=1,
+    )
+    name_key = func.lower(func.trim(InventoryItem.name))
+
+    query = (
+        select(
+            func.min(InventoryItem.name),
+            func.min(InventoryItem.category),
+            func.min(InventoryItem.storage_location),
+            InventoryItem.expiry_date,
+            func.min(InventoryItem.created_at),
+            func.max(InventoryItem.updated_at),
+            func.sum(InventoryItem.quantity * factor),
+            func.min(base_unit),
+            func.count(),
+            _member_ids_column(db.get_bind().dialect.name),
+        )
+        .where(InventoryItem.user_id == user_id)
+        .group_by(name_key, InventoryItem.expiry_date, unit_group)
+        .order_by(InventoryItem.expiry_date, name_key)
+    )
+
+    groups = []
+    for (name, category, storage_location, expiry_date, created_at, updated_at,
+         base_quantity, group_base_unit, count, member_ids) in db.execute(query):
+        base_quantity = float(base_quantity)
+        quantity, unit = format_quantity_with_unit(base_quantity, group_base_unit)
+        merged_ids = _parse_member_ids(member_ids)
+        groups.append(
+            InventoryGroup(
+                id=merged_ids[0],
+                user_id=user_id,
+                name=name,
+                category=category,
+                quantity=quantity,
+                unit=unit,
+                storage_location=storage_location,
+                expiry_date=expiry_date,
+                created_at=created_at,
+                updated_at=updated_at,
+                base_quantity=base_quantity,
+                base_unit=group_base_unit,
+                merged_ids=merged_ids,
+                merged_count=count,
+            )
+        )
+
+    return groups
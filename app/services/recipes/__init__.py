@@ -0,0 +1,21 @@
+from app.services.recipes.index import (
+    DEFAULT_RECIPES_PATH,
+    Recipe,
+    RecipeIndex,
+    RecipeSuggestion,
+    get_recipe_index,
+    normalize_ingredient,
+)
+from app.services.recipes.suggestions import SuggestionCache, suggest_recipes, suggestion_cache
+
+__all__ = [
+    "DEFAULT_RECIPES_PATH",
+    "Recipe",
+    "RecipeIndex",
+    "RecipeSuggestion",
+    "get_recipe_index",
+    "normalize_ingredient",
+    "SuggestionCache",
+    "suggest_recipes",
+    "suggestion_cache",
+]
@@ -0,0 +1,211 @@
+"""
+Inverted ingredient index over a recipe dataset, with expiry-weighted scoring.
+
+Ingredient names are normalized (lower case, punctuation stripped, plural
+words singularized, a few regional synonyms folded) so that an inventory
+item called "Cherry Tomatoes" finds recipes listing "cherry tomatoes".
+Each normalized ingredient maps to the recipes that use it, so scoring
+only touches recipes sharing at least one ingredient with the inventory.
+
+A recipe's score is the summed weight of the inventory items it uses,
+divided by its number of (non-staple) ingredients: full coverage scores
+at least 1, and items close to expiry weigh up to 1 + EXPIRY_WEIGHT.
+Posting lists are NumPy arrays, so accumulating weights is one
+vectorized add per inventory ingredient, and the top k are selected with
+a partial partition instead of sorting every candidate.
+"""
+import json
+import os
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EXPIRY_WEIGHT = 2.0
+EXPIRY_HALF_LIFE_DAYS = 2.0
+
+DEFAULT_RECIPES_PATH = os.path.join(os.path.dirname(__file__), "data", "recipes.json")
+
+# Assumed to be in every kitchen: not matched, and not counted as missing
+STAPLES = frozenset({
+    "salt", "pepper", "black pepper", "water", "oil", "olive oil", "vegetable oil",
+    "sugar", "flour", "baking powder", "baking soda", "stock",
+})
+
+SYNONYMS = {
+    "aubergine": "eggplant",
+    "capsicum": "bell pepper",
+    "coriander": "cilantro",
+    "courgette": "zucchini",
+    "green pepper": "bell pepper",
+    "mince": "ground beef",
+    "minced beef": "ground beef",
+    "red pepper": "bell pepper",
+    "scallion": "spring onion",
+    "shrimp": "prawn",
+    "yogurt": "yoghurt",
+}
+
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+
+
+def _singular(word: str) -> str:
+    if len(word) <= 3 or word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "xes")):
+        return word[:-2]
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def normalize_ingredient(name: str) -> str:
+    """Canonical form of an ingredient or item name."""
+    words = _NON_WORD.sub(" ", name.lower()).split()
+    normalized = " ".join(_singular(word) for word in words)
+    return SYNONYMS.get(normalized, normalized)
+
+
+@dataclass(frozen=True)
+class Recipe:
+    id: int
+    title: str
+    ingredients: Tuple[str, ...]  # As written, staples removed
+    keys: Tuple[str, ...]  # Normalized, parallel to `ingredients`
+
+
+@dataclass
+class RecipeSuggestion:
+    id: int
+    title: str
+    score: float
+    coverage: float  # Share of the recipe's ingredients in the inventory
+    matched_ingredients: List[str]
+    missing_ingredients: List[str]
+
+
+class RecipeIndex:
+    """Recipes plus an inverted index from normalized ingredient to recipe positions."""
+
+    def __init__(self, recipes: Iterable[dict]):
+        self.recipes: List[Recipe] = []
+        self.postings: Dict[str, List[int]] = {}
+        for raw in recipes:
+            ingredients, keys = [], []
+            for ingredient in raw["ingredients"]:
+                key = normalize_ingredient(ingredient)
+                if key and key not in STAPLES and key not in keys:
+                    ingredients.append(ingredient)
+                    keys.append(key)
+            if not keys:
+                continue
+            position = len(self.recipes)
+            self.recipes.append(Recipe(int(raw["id"]), raw["title"], tuple(ingredients), tuple(keys)))
+            for key in keys:
+                self.postings.setdefault(key, []).append(position)
+        self._match_cache: Dict[str, Tuple[str, ...]] = {}
+
+        count = len(self.recipes)
+        self._posting_arrays = {key: np.asarray(positions, dtype=np.int64) for key, positions in self.postings.items()}
+        self._ids = np.fromiter((recipe.id for recipe in self.recipes), dtype=np.int64, count=count)
+        self._sizes = np.fromiter((len(recipe.keys) for recipe in self.recipes), dtype=np.float64, count=count)
+
+    @classmethod
+    def from_file(cls, path: str) -> "RecipeIndex":
+        """Load a JSON array of {"id", "title", "ingredients"} objects."""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.recipes)
+
+    def match_keys(self, item_name: str) -> Tuple[str, ...]:
+        """
+        Index keys an inventory item counts as.
+
+        The whole name if the index knows it, otherwise the longest
+        sub-phrases it knows: "whole milk" counts as "milk", while
+        "cherry tomatoes" (a known ingredient) does not count as "tomato".
+        """
+        cached = self._match_cache.get(item_name)
+        if cached is not None:
+            return cached
+
+        normalized = normalize_ingredient(item_name)
+        keys: Tuple[str, ...] = ()
+        if normalized in self.postings:
+            keys = (normalized,)
+        else:
+            words = normalized.split()
+            for size in range(len(words) - 1, 0, -1):
+                phrases = (" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+                keys = tuple(sorted({SYNONYMS.get(p, p) for p in phrases} & self.postings.keys()))
+                if keys:
+                    break
+
+        if len(self._match_cache) < 100_000:
+            self._match_cache[item_name] = keys
+        return keys
+
+    def suggest(
+        self,
+        inventory: Sequence[Tuple[str, date]],
+        today: date,
+        limit: int
+    ) -> List[RecipeSuggestion]:
+        """Top `limit` recipes for an inventory of (name, expiry date) pairs."""
+        weights: Dict[str, float] = {}
+        for name, expiry_date in inventory:
+            days_left = (expiry_date - today).days
+            if days_left < 0:
+                continue  # Expired food should not be cooked
+            weight = 1.0 + EXPIRY_WEIGHT * 0.5 ** (days_left / EXPIRY_HALF_LIFE_DAYS)
+            for key in self.match_keys(name):
+                if weight > weights.get(key, 0.0):
+                    weights[key] = weight
+
+        # A recipe lists each key once, so fancy-indexed += never collides
+        totals = np.zeros(len(self.recipes))
+        for key, weight in weights.items():
+            totals[self._posting_arrays[key]] += weight
+
+        candidates = np.flatnonzero(totals)
+        scores = totals[candidates] / self._sizes[candidates]
+        if len(candidates) > limit:
+            # Keep everything scoring at least the k-th best, ties included
+            kth = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            keep = scores >= kth
+            candidates, scores = candidates[keep], scores[keep]
+        # Best score first; lower recipe id breaks ties
+        order = np.lexsort((self._ids[candidates], -scores))[:limit]
+
+        suggestions = []
+        for position, score in zip(candidates[order], scores[order]):
+            recipe = self.recipes[position]
+            matched = [ingredient for ingredient, key in zip(recipe.ingredients, recipe.keys) if key in weights]
+            suggestions.append(RecipeSuggestion(
+                id=recipe.id,
+                title=recipe.title,
+                score=round(float(score), 4),
+                coverage=round(len(matched) / len(recipe.keys), 4),
+                matched_ingredients=matched,
+                missing_ingredients=[
+                    ingredient for ingredient, key in zip(recipe.ingredients, recipe.keys) if key not in weights
+                ],
+            ))
+        return suggestions
+
+
+_recipe_index: Optional[RecipeIndex] = None
+
+
+def get_recipe_index() -> RecipeIndex:
+    """The dataset at RECIPES_PATH (default: the bundled one), loaded on first use."""
+    global _recipe_index
+    if _recipe_index is None:
+        _recipe_index = RecipeIndex.from_file(os.getenv("RECIPES_PATH", DEFAULT_RECIPES_PATH))
+    return _recipe_index
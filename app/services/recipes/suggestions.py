@@ -0,0 +1,85 @@
+"""
+Per-user recipe suggestions, cached by inventory version.
+
+The user's change sequence advances on every inventory or draft
+mutation, so (change sequence, day, limit) identifies the exact input
+of a suggestion list. A repeat request costs one primary-key lookup and
+a dictionary hit; the inventory is only read when something changed or
+a new day has shifted the expiry weights.
+"""
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.inventory_item import InventoryItem
+from app.services.recipes.index import RecipeIndex, RecipeSuggestion, get_recipe_index
+from app.services.sync import current_change_seq
+
+RECIPE_CACHE_MAX_USERS = int(os.getenv("RECIPE_CACHE_MAX_USERS", "10000"))
+
+# (change sequence, day, limit)
+SuggestionVersion = Tuple[int, date, int]
+
+
+class SuggestionCache:
+    """Bounded LRU holding each user's latest suggestion list and its version."""
+
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self._entries: "OrderedDict[UUID, Tuple[SuggestionVersion, List[RecipeSuggestion]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: UUID, version: SuggestionVersion) -> Optional[List[RecipeSuggestion]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user_id: UUID, version: SuggestionVersion, suggestions: List[RecipeSuggestion]) -> None:
+        with self._lock:
+            self._entries[user_id] = (version, suggestions)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Singleton instance
+suggestion_cache = SuggestionCache(max_users=RECIPE_CACHE_MAX_USERS)
+
+
+def suggest_recipes(
+    db: Session,
+    user_id: UUID,
+    limit: int,
+    today: Optional[date] = None,
+    index: Optional[RecipeIndex] = None
+) -> List[RecipeSuggestion]:
+    """Top `limit` recipes for the user's current (unexpired) inventory."""
+    today = today or date.today()
+    version = (current_change_seq(db, user_id), today, limit)
+    cached = suggestion_cache.get(user_id, version)
+    if cached is not None:
+        return cached
+
+    inventory = db.execute(
+        select(InventoryItem.name, InventoryItem.expiry_date)
+        .where(InventoryItem.user_id == user_id, InventoryItem.expiry_date >= today)
+    ).all()
+    suggestions = (index or get_recipe_index()).suggest(inventory, today, limit)
+    suggestion_cache.put(user_id, version, suggestions)
+    return suggestions
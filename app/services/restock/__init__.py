@@ -0,0 +1,31 @@
+from app.services.restock.forecasting import (
+    ForecastParams,
+    ProductForecast,
+    UserHistory,
+    forecast_products,
+)
+from app.services.restock.history import (
+    record_bulk_decreases,
+    record_quantity_change,
+    record_removed_items,
+)
+from app.services.restock.batch import (
+    RestockBatchResult,
+    load_histories,
+    run_restock_batch,
+)
+from app.services.restock.suggestions import get_restock_suggestions
+
+__all__ = [
+    "ForecastParams",
+    "ProductForecast",
+    "UserHistory",
+    "forecast_products",
+    "record_bulk_decreases",
+    "record_quantity_change",
+    "record_removed_items",
+    "RestockBatchResult",
+    "load_histories",
+    "run_restock_batch",
+    "get_restock_suggestions",
+]
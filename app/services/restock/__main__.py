@@ -0,0 +1,3 @@
+from app.services.restock.batch import main
+
+main()
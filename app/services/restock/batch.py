@@ -0,0 +1,237 @@
+"""
+Nightly restock forecast batch.
+
+Runs over every user with consumption history in the lookback window,
+in chunks: the parent process reads a chunk's history and stock (two
+queries), hands it to a process pool as plain arrays, and writes the
+forecasts of finished chunks while later ones are computing. Each
+chunk's forecasts replace the previous run's in one transaction, and
+forecasts of users with no recent history are dropped at the end, so
+`GET /api/shopping-list/suggested` only ever reads this table.
+
+Schedule it once a day, e.g. from cron:
+
+    python -m app.services.restock --workers 4
+"""
+import argparse
+import logging
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.inventory_item import InventoryItem
+from app.models.restock import QuantityChange, RestockForecast
+from app.services.inventory import UNIT_CONVERSIONS
+from app.services.recipes import normalize_ingredient
+from app.services.restock.forecasting import (
+    ForecastParams,
+    ProductForecast,
+    UserHistory,
+    forecast_users,
+)
+
+logger = logging.getLogger(__name__)
+
+RESTOCK_LOOKBACK_DAYS = int(os.getenv("RESTOCK_LOOKBACK_DAYS", "56"))
+RESTOCK_HALF_LIFE_DAYS = float(os.getenv("RESTOCK_HALF_LIFE_DAYS", "14"))
+RESTOCK_MIN_EVENTS = int(os.getenv("RESTOCK_MIN_EVENTS", "2"))
+RESTOCK_WORKERS = int(os.getenv("RESTOCK_WORKERS", str(os.cpu_count() or 1)))
+RESTOCK_USERS_PER_TASK = int(os.getenv("RESTOCK_USERS_PER_TASK", "200"))
+
+MIN_SPAN_DAYS = 7
+
+
+@dataclass
+class RestockBatchResult:
+    users: int
+    forecasts: int
+
+
+def default_params() -> ForecastParams:
+    return ForecastParams(
+        half_life_days=RESTOCK_HALF_LIFE_DAYS,
+        min_span_days=MIN_SPAN_DAYS,
+        min_events=RESTOCK_MIN_EVENTS,
+    )
+
+
+def product_key(name: str, unit: str) -> Tuple[str, str, float]:
+    """(normalized name, base unit, factor to base unit) - "2 Liters of Milk" is 2000 Milliliters of "milk"."""
+    unit_key = unit.lower().strip()
+    base_unit, factor, _ = UNIT_CONVERSIONS.get(unit_key, (unit_key, 1, None))
+    return normalize_ingredient(name), base_unit, factor
+
+
+class _HistoryBuilder:
+    """Accumulates one user's rows into the coded arrays forecasting expects."""
+
+    def __init__(self, user_id: UUID):
+        self.user_id = user_id
+        self.products: List[Tuple[str, str]] = []
+        self.names: List[str] = []
+        self.index: Dict[Tuple[str, str], int] = {}
+        self.codes: List[int] = []
+        self.days: List[int] = []
+        self.amounts: List[float] = []
+        self.stock: Dict[int, float] = {}
+
+    def _code(self, name: str, unit: str) -> Tuple[int, float]:
+        product, base_unit, factor = product_key(name, unit)
+        code = self.index.get((product, base_unit))
+        if code is None:
+            code = self.index[(product, base_unit)] = len(self.products)
+            self.products.append((product, base_unit))
+            self.names.append(name)
+        return code, factor
+
+    def add_use(self, name: str, unit: str, quantity, day: date) -> None:
+        code, factor = self._code(name, unit)
+        self.names[code] = name  # Rows arrive oldest first; keep the latest spelling
+        self.codes.append(code)
+        self.days.append(day.toordinal())
+        self.amounts.append(float(quantity) * factor)
+
+    def add_stock(self, name: str, unit: str, quantity) -> None:
+        product, base_unit, factor = product_key(name, unit)
+        code = self.index.get((product, base_unit))
+        if code is not None:  # Stock of never-consumed products has no rate to forecast with
+            self.stock[code] = self.stock.get(code, 0.0) + float(quantity) * factor
+
+    def build(self) -> UserHistory:
+        on_hand = np.zeros(len(self.products))
+        for code, quantity in self.stock.items():
+            on_hand[code] = quantity
+        return UserHistory(
+            user_id=self.user_id,
+            products=self.products,
+            names=self.names,
+            codes=np.asarray(self.codes, dtype=np.int64),
+            days=np.asarray(self.days, dtype=np.int64),
+            amounts=np.asarray(self.amounts, dtype=np.float64),
+            on_hand=on_hand,
+        )
+
+
+def load_histories(db: Session, user_ids: Sequence[UUID], since: date) -> List[UserHistory]:
+    """History since `since` and current stock for a chunk of users."""
+    builders = {user_id: _HistoryBuilder(user_id) for user_id in user_ids}
+
+    uses = db.execute(
+        select(
+            QuantityChange.user_id, QuantityChange.name, QuantityChange.unit,
+            QuantityChange.quantity, QuantityChange.occurred_on
+        )
+        .where(QuantityChange.user_id.in_(list(user_ids)), QuantityChange.occurred_on >= since)
+        .order_by(QuantityChange.occurred_on, QuantityChange.id)
+    )
+    for user_id, name, unit, quantity, occurred_on in uses:
+        builders[user_id].add_use(name, unit, quantity, occurred_on)
+
+    stock = db.execute(
+        select(InventoryItem.user_id, InventoryItem.name, InventoryItem.unit, func.sum(InventoryItem.quantity))
+        .where(InventoryItem.user_id.in_(list(user_ids)))
+        .group_by(InventoryItem.user_id, InventoryItem.name, InventoryItem.unit)
+    )
+    for user_id, name, unit, quantity in stock:
+        builders[user_id].add_stock(name, unit, quantity)
+
+    return [builder.build() for builder in builders.values()]
+
+
+def _write_forecasts(
+    db: Session,
+    results: List[Tuple[UUID, List[ProductForecast]]],
+    today: date
+) -> int:
+    """Replace the chunk's forecasts and commit."""
+    db.execute(
+        delete(RestockForecast).where(RestockForecast.user_id.in_([user_id for user_id, _ in results]))
+    )
+    values = [
+        {
+            "user_id": user_id, "product": f.product, "unit": f.unit, "name": f.name,
+            "daily_rate": f.daily_rate, "on_hand": f.on_hand, "run_out_on": f.run_out_on,
+            "last_consumed_on": f.last_consumed_on, "computed_on": today,
+        }
+        for user_id, forecasts in results
+        for f in forecasts
+    ]
+    if values:
+        db.execute(insert(RestockForecast), values)
+    db.commit()
+    return len(values)
+
+
+def run_restock_batch(
+    session_factory: Callable[[], Session] = SessionLocal,
+    today: Optional[date] = None,
+    workers: int = RESTOCK_WORKERS,
+    users_per_task: int = RESTOCK_USERS_PER_TASK,
+    params: Optional[ForecastParams] = None,
+    executor: Optional[Executor] = None
+) -> RestockBatchResult:
+    """
+    Recompute every user's restock forecasts.
+
+    `workers` <= 0 computes in this process (tests, tiny deployments);
+    otherwise a process pool of that size is used unless `executor` is given.
+    """
+    today = today or date.today()
+    params = params or default_params()
+    since = today - timedelta(days=RESTOCK_LOOKBACK_DAYS)
+
+    db = session_factory()
+    owns_executor = executor is None and workers > 0
+    if owns_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        user_ids = db.execute(
+            select(QuantityChange.user_id).where(QuantityChange.occurred_on >= since).distinct()
+        ).scalars().all()
+        chunks = [user_ids[i:i + users_per_task] for i in range(0, len(user_ids), users_per_task)]
+
+        written = 0
+        if executor is None:
+            for chunk in chunks:
+                written += _write_forecasts(db, forecast_users(load_histories(db, chunk, since), today, params), today)
+        else:
+            # Keep a couple of chunks per worker in flight; write in submission order
+            pending = deque()
+            max_pending = 2 * max(workers, 1)
+            for chunk in chunks:
+                pending.append(executor.submit(forecast_users, load_histories(db, chunk, since), today, params))
+                db.rollback()  # End the read transaction while the pool computes
+                if len(pending) >= max_pending:
+                    written += _write_forecasts(db, pending.popleft().result(), today)
+            while pending:
+                written += _write_forecasts(db, pending.popleft().result(), today)
+
+        # Users whose history aged out of the window keep no stale forecasts
+        db.execute(delete(RestockForecast).where(RestockForecast.computed_on < today))
+        db.commit()
+        logger.info("Restock batch: %d forecasts for %d users", written, len(user_ids))
+        return RestockBatchResult(users=len(user_ids), forecasts=written)
+    finally:
+        if owns_executor:
+            executor.shutdown()
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute restock forecasts for all users")
+    parser.add_argument("--workers", type=int, default=RESTOCK_WORKERS, help="0 computes in-process")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="Forecast as of (default: today)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    result = run_restock_batch(today=args.date, workers=args.workers)
+    print(f"{result.forecasts} forecasts for {result.users} users")
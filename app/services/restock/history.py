@@ -0,0 +1,81 @@
+"""
+Recording consumption history for restock forecasts.
+
+Routers call these inside the transaction that shrinks or removes an
+item. Only decreases are recorded - adding stock says nothing about how
+fast it is used - and wasted food is left out, since throwing milk away
+is no reason to buy more of it.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import Date, case, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.inventory_item import InventoryItem
+from app.models.restock import QuantityChange
+
+HISTORY_COLUMNS = ("user_id", "inventory_item_id", "name", "unit", "quantity", "occurred_on")
+
+
+def record_quantity_change(
+    db: Session,
+    item: InventoryItem,
+    quantity: Decimal,
+    today: Optional[date] = None
+) -> None:
+    """Record `quantity` of `item` as used up. Does not commit."""
+    if quantity <= 0:
+        return
+    db.add(QuantityChange(
+        user_id=item.user_id,
+        inventory_item_id=item.id,
+        name=item.name,
+        unit=item.unit,
+        quantity=quantity,
+        occurred_on=today or date.today(),
+    ))
+
+
+def record_removed_items(db: Session, rows: Iterable, today: Optional[date] = None) -> None:
+    """
+    Record deleted items' remaining quantities as used up, in one statement.
+    `rows` carry user_id, id, name, unit and quantity (e.g. DELETE ... RETURNING).
+    """
+    values = [
+        {
+            "user_id": row.user_id, "inventory_item_id": row.id, "name": row.name,
+            "unit": row.unit, "quantity": row.quantity, "occurred_on": today or date.today(),
+        }
+        for row in rows
+    ]
+    if values:
+        db.execute(insert(QuantityChange), values)
+
+
+def record_bulk_decreases(
+    db: Session,
+    user_id: UUID,
+    quantities: Dict[UUID, float],
+    today: Optional[date] = None
+) -> None:
+    """
+    Record the decreases a bulk quantity update is about to make, in one
+    INSERT ... SELECT. Call before the UPDATE. Does not commit.
+    """
+    new_quantity = case(quantities, value=InventoryItem.id)
+    db.execute(
+        insert(QuantityChange).from_select(
+            HISTORY_COLUMNS,
+            select(
+                InventoryItem.user_id, InventoryItem.id, InventoryItem.name, InventoryItem.unit,
+                InventoryItem.quantity - new_quantity, literal(today or date.today(), Date)
+            ).where(
+                InventoryItem.id.in_(list(quantities)),
+                InventoryItem.user_id == user_id,
+                InventoryItem.quantity > new_quantity
+            )
+        )
+    )
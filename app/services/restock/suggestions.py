@@ -0,0 +1,29 @@
+"""
+Reading restock forecasts for the shopping list.
+"""
+from datetime import date, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.restock import RestockForecast
+
+
+def get_restock_suggestions(
+    db: Session,
+    user_id: UUID,
+    within_days: int,
+    today: Optional[date] = None
+) -> List[RestockForecast]:
+    """Forecasts running out within `within_days` (or already out), soonest first."""
+    today = today or date.today()
+    return db.execute(
+        select(RestockForecast)
+        .where(
+            RestockForecast.user_id == user_id,
+            RestockForecast.run_out_on <= today + timedelta(days=within_days)
+        )
+        .order_by(RestockForecast.run_out_on, RestockForecast.product)
+    ).scalars().all()
@@ -0,0 +1,31 @@
+from app.services.search.trigram import (
+    PREFIX,
+    SIMILAR,
+    SUBSTRING,
+    TrigramHit,
+    TrigramIndex,
+    raw_trigrams,
+    word_trigrams,
+)
+from app.services.search.inventory_search import (
+    SEARCH_SIMILARITY_THRESHOLD,
+    InventorySearchHit,
+    SearchIndexCache,
+    search_index_cache,
+    search_inventory,
+)
+
+__all__ = [
+    "PREFIX",
+    "SIMILAR",
+    "SUBSTRING",
+    "TrigramHit",
+    "TrigramIndex",
+    "raw_trigrams",
+    "word_trigrams",
+    "SEARCH_SIMILARITY_THRESHOLD",
+    "InventorySearchHit",
+    "SearchIndexCache",
+    "search_index_cache",
+    "search_inventory",
+]
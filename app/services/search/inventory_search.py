@@ -0,0 +1,154 @@
+"""
+Inventory name search: substring, word-prefix and fuzzy matches.
+
+On Postgres the query runs against a pg_trgm GIN index on the item name
+(ILIKE '%q%' and the `%` similarity operator both use it); `%` compares
+against pg_trgm.similarity_threshold, which is set to
+SEARCH_SIMILARITY_THRESHOLD for the transaction first. Elsewhere a
+per-user `TrigramIndex` is built in process and cached by the user's
+change sequence, like recipe suggestions: an unchanged inventory costs
+one primary-key lookup plus one fetch of the matching rows.
+"""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import case, func, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.models.inventory_item import InventoryItem
+from app.services.search.trigram import PREFIX, SIMILAR, SUBSTRING, TrigramIndex
+from app.services.sync import current_change_seq
+
+SEARCH_CACHE_MAX_USERS = int(os.getenv("SEARCH_CACHE_MAX_USERS", "1000"))
+# Minimum trigram similarity for a fuzzy match on both paths (0.3 is pg_trgm's default)
+SEARCH_SIMILARITY_THRESHOLD = float(os.getenv("SEARCH_SIMILARITY_THRESHOLD", "0.3"))
+
+
+@dataclass
+class InventorySearchHit:
+    item: InventoryItem
+    match: str  # "prefix" | "substring" | "similar"
+    similarity: float
+
+
+@dataclass
+class _UserIndex:
+    seq: int
+    ids: List[UUID]
+    index: TrigramIndex
+
+
+class SearchIndexCache:
+    """Bounded LRU of per-user trigram indexes, each valid for one change sequence."""
+
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self._entries: "OrderedDict[UUID, _UserIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: UUID, seq: int) -> Optional[_UserIndex]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry.seq != seq:
+                return None
+            self._entries.move_to_end(user_id)
+            return entry
+
+    def put(self, user_id: UUID, entry: _UserIndex) -> None:
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Singleton instance
+search_index_cache = SearchIndexCache(max_users=SEARCH_CACHE_MAX_USERS)
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_postgres(db: Session, user_id: UUID, query: str, limit: int) -> List[InventorySearchHit]:
+    pattern = _escape_like(query)
+    prefix = or_(
+        InventoryItem.name.ilike(f"{pattern}%", escape="\\"),
+        InventoryItem.name.ilike(f"% {pattern}%", escape="\\")
+    )
+    substring = InventoryItem.name.ilike(f"%{pattern}%", escape="\\")
+    match_rank = case((prefix, 2), (substring, 1), else_=0)
+    similarity = func.similarity(InventoryItem.name, query)
+    # SET LOCAL: applies to `%` (and its index scan) until this transaction ends
+    db.execute(
+        text("SELECT set_config('pg_trgm.similarity_threshold', :threshold, true)"),
+        {"threshold": str(SEARCH_SIMILARITY_THRESHOLD)}
+    )
+
+    rows = db.execute(
+        select(InventoryItem, match_rank, similarity)
+        .where(InventoryItem.user_id == user_id, or_(substring, InventoryItem.name.op("%")(query)))
+        .order_by(match_rank.desc(), similarity.desc(), InventoryItem.expiry_date, InventoryItem.name)
+        .limit(limit)
+    ).all()
+    ranks = {2: PREFIX, 1: SUBSTRING, 0: SIMILAR}
+    return [
+        InventorySearchHit(item=item, match=ranks[rank], similarity=round(float(score), 4))
+        for item, rank, score in rows
+    ]
+
+
+def _user_index(db: Session, user_id: UUID) -> _UserIndex:
+    seq = current_change_seq(db, user_id)
+    entry = search_index_cache.get(user_id, seq)
+    if entry is None:
+        rows: List[Tuple[UUID, str, object]] = db.execute(
+            select(InventoryItem.id, InventoryItem.name, InventoryItem.expiry_date)
+            .where(InventoryItem.user_id == user_id)
+            .order_by(InventoryItem.expiry_date, InventoryItem.name)
+        ).all()
+        entry = _UserIndex(
+            seq=seq,
+            ids=[row.id for row in rows],
+            index=TrigramIndex([row.name for row in rows], [row.expiry_date for row in rows]),
+        )
+        search_index_cache.put(user_id, entry)
+    return entry
+
+
+def search_inventory(db: Session, user_id: UUID, query: str, limit: int) -> List[InventorySearchHit]:
+    """The user's items best matching `query`, ranked by match kind, similarity and expiry."""
+    query = query.strip()
+    if not query:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_postgres(db, user_id, query, limit)
+
+    entry = _user_index(db, user_id)
+    hits = entry.index.search(query, limit, SEARCH_SIMILARITY_THRESHOLD)
+    if not hits:
+        return []
+    ids = [entry.ids[hit.position] for hit in hits]
+    items = {
+        item.id: item
+        for item in db.query(InventoryItem).filter(
+            InventoryItem.id.in_(ids),
+            InventoryItem.user_id == user_id
+        )
+    }
+    return [
+        InventorySearchHit(item=items[item_id], match=hit.match, similarity=hit.similarity)
+        for item_id, hit in zip(ids, hits)
+        if item_id in items
+    ]
@@ -0,0 +1,128 @@
+"""
+In-process trigram index over item names, for databases without pg_trgm.
+
+Trigrams follow pg_trgm: each lower-cased word is padded with two spaces
+in front and one behind ("  milk " -> "  m", " mi", "mil", "ilk",
+"lk "), and similarity is shared / (|a| + |b| - shared) over the two
+trigram sets - so ranking matches the Postgres path. A second index of
+the raw lower-cased name's trigrams narrows substring matching to names
+containing every trigram of the query before the final `in` check.
+
+Posting lists are NumPy arrays: scoring a query is one vectorized add
+per query trigram, whatever the number of items.
+"""
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Sequence, Set
+
+import numpy as np
+
+PREFIX = "prefix"  # A word of the name starts with the query
+SUBSTRING = "substring"
+SIMILAR = "similar"  # Only close in spelling (similarity above the threshold)
+
+_MATCH_RANKS = {2: PREFIX, 1: SUBSTRING, 0: SIMILAR}
+_WORD = re.compile(r"[^\W_]+")
+
+
+def word_trigrams(text: str) -> Set[str]:
+    """pg_trgm's trigram set of `text`."""
+    trigrams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+def raw_trigrams(text: str) -> Set[str]:
+    """Every three-character window of `text` (already lower-cased)."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+@dataclass
+class TrigramHit:
+    position: int
+    match: str  # PREFIX, SUBSTRING or SIMILAR
+    similarity: float
+
+
+class TrigramIndex:
+    """Names (with expiry dates for tie-breaking) indexed by word and raw trigrams."""
+
+    def __init__(self, names: Sequence[str], expiry_dates: Sequence[date]):
+        self.names = [name.lower() for name in names]
+        self.expiry = np.fromiter((d.toordinal() for d in expiry_dates), dtype=np.int64, count=len(names))
+
+        word_postings: Dict[str, List[int]] = {}
+        raw_postings: Dict[str, List[int]] = {}
+        sizes = []
+        for position, name in enumerate(self.names):
+            trigrams = word_trigrams(name)
+            sizes.append(len(trigrams))
+            for trigram in trigrams:
+                word_postings.setdefault(trigram, []).append(position)
+            for trigram in raw_trigrams(name):
+                raw_postings.setdefault(trigram, []).append(position)
+
+        self._sizes = np.asarray(sizes, dtype=np.float64)
+        self._word_postings = {t: np.asarray(p, dtype=np.int64) for t, p in word_postings.items()}
+        self._raw_postings = {t: np.asarray(p, dtype=np.int64) for t, p in raw_postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _substring_positions(self, query: str) -> np.ndarray:
+        if len(query) < 3:
+            # Too short to have a trigram: a scan of a few thousand short strings
+            return np.fromiter(
+                (i for i, name in enumerate(self.names) if query in name), dtype=np.int64
+            )
+        postings = []
+        for trigram in raw_trigrams(query):
+            posting = self._raw_postings.get(trigram)
+            if posting is None:
+                return np.empty(0, dtype=np.int64)
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+        # Containing every trigram is necessary, not sufficient: "abab" vs "aba bab"
+        return np.fromiter((i for i in candidates if query in self.names[i]), dtype=np.int64)
+
+    def search(self, query: str, limit: int, threshold: float) -> List[TrigramHit]:
+        """
+        Best `limit` names for `query`: word-prefix matches, then other
+        substring matches, then names similar above `threshold`; within
+        each, by similarity and then soonest expiry.
+        """
+        query = query.strip().lower()
+        count = len(self.names)
+        if not query or count == 0:
+            return []
+
+        query_trigrams = word_trigrams(query)
+        shared = np.zeros(count)
+        for trigram in query_trigrams:
+            posting = self._word_postings.get(trigram)
+            if posting is not None:
+                shared[posting] += 1
+        union = self._sizes + len(query_trigrams) - shared
+        similarity = np.divide(shared, union, out=np.zeros(count), where=union > 0)
+
+        ranks = np.zeros(count, dtype=np.int8)
+        for position in self._substring_positions(query):
+            name = self.names[position]
+            ranks[position] = 2 if name.startswith(query) or f" {query}" in name else 1
+
+        candidates = np.flatnonzero((ranks > 0) | (similarity >= threshold))
+        order = np.lexsort((self.expiry[candidates], -similarity[candidates], -ranks[candidates]))[:limit]
+        return [
+            TrigramHit(
+                position=int(position),
+                match=_MATCH_RANKS[int(ranks[position])],
+                similarity=round(float(similarity[position]), 4),
+            )
+            for position in candidates[order]
+        ]
@@ -0,0 +1,27 @@
+from app.services.sync.change_log import (
+    DRAFT_ENTITY,
+    INVENTORY_ENTITY,
+    SYNC_TOMBSTONE_RETENTION_DAYS,
+    SyncChanges,
+    current_change_seq,
+    changes_since,
+    next_change_seq,
+    prune_tombstones,
+    record_tombstones,
+)
+from app.services.sync.etag import ETAG_FORMAT_VERSION, etag_matches, list_etag
+
+__all__ = [
+    "DRAFT_ENTITY",
+    "ETAG_FORMAT_VERSION",
+    "INVENTORY_ENTITY",
+    "SYNC_TOMBSTONE_RETENTION_DAYS",
+    "SyncChanges",
+    "current_change_seq",
+    "changes_since",
+    "etag_matches",
+    "list_etag",
+    "next_change_seq",
+    "prune_tombstones",
+    "record_tombstones",
+]
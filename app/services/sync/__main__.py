@@ -0,0 +1,18 @@
+"""
+Prune sync tombstones past the retention window:
+
+    python -m app.services.sync [--days 30]
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from app.core.database import SessionLocal
+from app.services.sync.change_log import SYNC_TOMBSTONE_RETENTION_DAYS, prune_tombstones
+
+parser = argparse.ArgumentParser(description="Delete sync tombstones older than the retention window")
+parser.add_argument("--days", type=int, default=SYNC_TOMBSTONE_RETENTION_DAYS)
+args = parser.parse_args()
+
+with SessionLocal() as db:
+    removed = prune_tombstones(db, datetime.now(timezone.utc) - timedelta(days=args.days))
+print(f"{removed} tombstones older than {args.days} days removed")
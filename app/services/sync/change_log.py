@@ -0,0 +1,170 @@
+"""
+Change tracking for delta sync.
+
+Each user has a monotonic change sequence. Every mutation of a draft or
+inventory item takes the next value and stamps it on the rows it writes
+(or on tombstones for rows it deletes). A client that remembers the last
+sequence it saw can then fetch only what changed since.
+
+Tombstones are kept for SYNC_TOMBSTONE_RETENTION_DAYS; schedule the
+pruning once a day, e.g. from cron:
+
+    python -m app.services.sync
+"""
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, List
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.draft_item import DraftItem
+from app.models.inventory_item import InventoryItem
+from app.models.sync_state import SyncTombstone, UserChangeCursor
+
+
+INVENTORY_ENTITY = "inventory"
+DRAFT_ENTITY = "draft"
+
+# Clients offline for longer than this get a full snapshot on their next sync
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+
+@dataclass
+class SyncChanges:
+    """Rows changed after a cursor, plus ids deleted after it."""
+    cursor: int
+    reset: bool  # True: full snapshot, client should replace its local copy
+    inventory_items: List[InventoryItem] = field(default_factory=list)
+    draft_items: List[DraftItem] = field(default_factory=list)
+    deleted_inventory_ids: List[UUID] = field(default_factory=list)
+    deleted_draft_ids: List[UUID] = field(default_factory=list)
+
+
+def next_change_seq(db: Session, user_id: UUID) -> int:
+    """
+    Allocate the user's next change sequence number.
+
+    Does not commit - the increment belongs to the caller's transaction,
+    so a rolled-back mutation never leaves a gap visible to clients.
+
+    One upsert creates the cursor on a user's first change or increments
+    it, so two concurrent first changes cannot both insert seq 1.
+    """
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(UserChangeCursor).values(user_id=user_id, seq=1, pruned_through=0)
+    return db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[UserChangeCursor.user_id],
+            set_={"seq": UserChangeCursor.seq + 1}
+        )
+        .returning(UserChangeCursor.seq)
+    ).scalar_one()
+
+
+def current_change_seq(db: Session, user_id: UUID) -> int:
+    """The user's latest change sequence (0 if nothing has changed yet)."""
+    seq = db.execute(
+        select(UserChangeCursor.seq).where(UserChangeCursor.user_id == user_id)
+    ).scalar()
+    return seq or 0
+
+
+def record_tombstones(
+    db: Session,
+    user_id: UUID,
+    entity: str,
+    entity_ids: Iterable[UUID],
+    seq: int
+) -> None:
+    """Remember deleted rows so delta sync can report them. Does not commit."""
+    rows = [
+        {"user_id": user_id, "entity": entity, "entity_id": entity_id, "change_seq": seq}
+        for entity_id in entity_ids
+    ]
+    if rows:
+        db.execute(insert(SyncTombstone), rows)
+
+
+def changes_since(db: Session, user_id: UUID, since: int) -> SyncChanges:
+    """
+    Collect everything that changed for a user after `since`.
+
+    since=0, or a cursor older than the pruned tombstones, returns a full
+    snapshot with reset=True instead of a delta.
+    """
+    cursor_row = db.execute(
+        select(UserChangeCursor.seq, UserChangeCursor.pruned_through)
+        .where(UserChangeCursor.user_id == user_id)
+    ).first()
+    cursor, pruned_through = cursor_row if cursor_row else (0, 0)
+
+    if since >= cursor and since > 0:
+        # Nothing changed - the steady-state case costs a single lookup
+        return SyncChanges(cursor=cursor, reset=False)
+
+    reset = since <= 0 or since < pruned_through
+
+    inventory_query = db.query(InventoryItem).filter(InventoryItem.user_id == user_id)
+    draft_query = db.query(DraftItem).filter(DraftItem.user_id == user_id)
+    if not reset:
+        inventory_query = inventory_query.filter(InventoryItem.change_seq > since)
+        draft_query = draft_query.filter(DraftItem.change_seq > since)
+
+    changes = SyncChanges(
+        cursor=cursor,
+        reset=reset,
+        inventory_items=inventory_query.order_by(InventoryItem.expiry_date).all(),
+        draft_items=draft_query.all(),
+    )
+
+    if not reset:
+        tombstones = db.execute(
+            select(SyncTombstone.entity, SyncTombstone.entity_id)
+            .where(SyncTombstone.user_id == user_id, SyncTombstone.change_seq > since)
+        ).all()
+        changes.deleted_inventory_ids = [
+            entity_id for entity, entity_id in tombstones if entity == INVENTORY_ENTITY
+        ]
+        changes.deleted_draft_ids = [
+            entity_id for entity, entity_id in tombstones if entity == DRAFT_ENTITY
+        ]
+
+    return changes
+
+
+def prune_tombstones(db: Session, older_than: datetime) -> int:
+    """
+    Delete tombstones older than a cutoff and commit.
+
+    Each user's pruned_through watermark is raised so that clients with
+    older cursors get a full snapshot instead of a delta with missing deletes.
+
+    Returns:
+        Number of tombstones removed
+    """
+    watermarks = db.execute(
+        select(SyncTombstone.user_id, func.max(SyncTombstone.change_seq))
+        .where(SyncTombstone.deleted_at < older_than)
+        .group_by(SyncTombstone.user_id)
+    ).all()
+
+    for user_id, max_seq in watermarks:
+        db.execute(
+            update(UserChangeCursor)
+            .where(
+                UserChangeCursor.user_id == user_id,
+                UserChangeCursor.pruned_through < max_seq
+            )
+            .values(pruned_through=max_seq)
+        )
+
+    removed = db.execute(
+        delete(SyncTombstone).where(SyncTombstone.deleted_at < older_than)
+    ).rowcount
+    db.commit()
+
+    return removed
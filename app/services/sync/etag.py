@@ -0,0 +1,31 @@
+"""
+Entity tags for user-scoped list responses.
+
+A user's change sequence (see change_log) is bumped by every mutation of
+their drafts or inventory, so it doubles as a version of everything
+listed for them. The tag also names the user - so a device that switches
+accounts never gets a 304 for the previous account's list - and a
+format version, bumped whenever a list's response shape changes.
+"""
+from typing import Optional
+from uuid import UUID
+
+ETAG_FORMAT_VERSION = 1
+
+
+def list_etag(user_id: UUID, seq: int) -> str:
+    """Weak ETag for the user's list responses at change sequence `seq`."""
+    return f'W/"v{ETAG_FORMAT_VERSION}.{user_id.hex}.{seq}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches the current tag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
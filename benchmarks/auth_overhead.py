@@ -0,0 +1,78 @@
+"""
+Measure per-request authentication overhead with and without the
+verified-token cache.
+
+Usage:
+    python -m benchmarks.auth_overhead --iterations 20000
+"""
+import argparse
+from uuid import uuid4
+
+from benchmarks.common import configure_environment, measure, quiet_sql_logging
+
+configure_environment()
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.core.security import (  # noqa: E402
+    create_access_token,
+    decode_token,
+    hash_password,
+    verified_token_cache,
+)
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+def seed_user() -> str:
+    db = SessionLocal()
+    try:
+        user = User(id=uuid4(), email="bench@example.com", hashed_password=hash_password("benchpass123"))
+        db.add(user)
+        db.commit()
+        return create_access_token(user_id=user.id)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000, help="decode_token calls per variant")
+    parser.add_argument("--requests", type=int, default=500, help="HTTP requests per variant")
+    args = parser.parse_args()
+
+    quiet_sql_logging()
+    token = seed_user()
+
+    def uncached():
+        verified_token_cache.clear()
+        return decode_token(token)
+
+    results = [
+        measure("decode_token (jwt.decode every time)", uncached, args.iterations),
+        measure("decode_token (cached)", lambda: decode_token(token), args.iterations),
+    ]
+
+    headers = {"Authorization": f"Bearer {token}"}
+    with TestClient(app) as client:
+        def get_sync(clear_cache):
+            if clear_cache:
+                verified_token_cache.clear()
+            response = client.get("/api/sync?since=1000000", headers=headers)
+            assert response.status_code == 200, response.text
+
+        results.append(measure("GET /api/sync (no change, uncached auth)",
+                               lambda: get_sync(True), args.requests))
+        results.append(measure("GET /api/sync (no change, cached auth)",
+                               lambda: get_sync(False), args.requests))
+
+    print()
+    for result in results:
+        print(result)
+    saved_us = (results[0].mean_ms - results[1].mean_ms) * 1000
+    print(f"\nAuth time saved per request: {saved_us:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
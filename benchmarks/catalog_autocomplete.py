@@ -0,0 +1,74 @@
+"""
+Measure per-keystroke autocomplete latency against a large synthetic catalog.
+
+Compares the compiled, memory-mapped trie (precomputed top-k per node)
+against filtering and sorting the catalog in Python on every keystroke.
+
+Usage:
+    python -m benchmarks.catalog_autocomplete --entries 100000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+
+from benchmarks.common import configure_environment, measure
+
+configure_environment()
+
+from app.services.catalog import CatalogTrie, build_trie_file, entry_keys, normalize_key  # noqa: E402
+
+
+def synthetic_catalog(count: int, rng: random.Random) -> list:
+    syllables = ["ba", "ce", "di", "fo", "gu", "ka", "le", "mo", "nu", "pa", "ri", "so", "ta", "ve", "zo"]
+    entries, seen = [], set()
+    while len(entries) < count:
+        name = " ".join(
+            "".join(rng.choices(syllables, k=rng.randint(2, 4))).capitalize() for _ in range(rng.randint(1, 3))
+        )
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            entries.append({"name": name, "category": "other", "unit": "Pieces", "popularity": rng.randint(1, 100)})
+    return entries
+
+
+def linear_scan(catalog: list, prefix: str, limit: int) -> list:
+    """Filter every entry's word suffixes and sort - what the trie avoids."""
+    key = normalize_key(prefix)
+    matches = [e for e in catalog if any(k.startswith(key) for k in entry_keys(e["name"]))]
+    matches.sort(key=lambda e: -e["popularity"])
+    return matches[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    catalog = synthetic_catalog(args.entries, rng)
+    path = os.path.join(tempfile.mkdtemp(prefix="snapshelf-catalog-"), "catalog.trie")
+    source = path.replace(".trie", ".json")
+    with open(source, "w", encoding="utf-8") as f:
+        json.dump(catalog, f)
+    size = build_trie_file(source, path)
+    trie = CatalogTrie.open(path)
+    print(f"{trie.entry_count} entries, {trie.node_count} nodes, {size / 1024 / 1024:.1f} MiB mapped")
+
+    # Successive keystrokes of a few real-looking names
+    keystrokes = [name[:i] for name in (e["name"] for e in catalog[:50]) for i in range(1, min(len(name), 8) + 1)]
+    cycle = iter(keystrokes * (args.iterations // len(keystrokes) + 1))
+    results = [
+        measure("linear scan + sort", lambda: linear_scan(catalog, rng.choice(keystrokes), args.limit), 20),
+        measure("mmap trie, precomputed top-k", lambda: trie.complete(next(cycle), args.limit), args.iterations),
+    ]
+    for result in results:
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Shared setup for the benchmark scripts.
+
+Points the app at a throwaway SQLite database (the same way
+tests/conftest.py does) and provides helpers to seed data and time
+requests through the FastAPI TestClient.
+"""
+import os
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, List
+
+
+def configure_environment() -> str:
+    """
+    Set environment variables for a throwaway database.
+    Must be called BEFORE importing anything from `app`.
+
+    Returns:
+        Path of the SQLite database file
+    """
+    db_path = os.path.join(tempfile.mkdtemp(prefix="snapshelf-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key")
+    os.environ.setdefault("JWT_ALGORITHM", "HS256")
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark-key-not-real")
+    return db_path
+
+
+def quiet_sql_logging() -> None:
+    """Turn off SQL echo so logging does not dominate the timings."""
+    from app.core.database import engine
+    engine.echo = False
+
+
+@dataclass
+class BenchmarkResult:
+    """Latency summary for one benchmarked operation."""
+    name: str
+    iterations: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+
+    @property
+    def per_second(self) -> float:
+        return 1000.0 / self.mean_ms if self.mean_ms else float("inf")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<40} {self.per_second:>10.1f} ops/s   "
+            f"mean {self.mean_ms:7.3f} ms   p50 {self.p50_ms:7.3f} ms   p95 {self.p95_ms:7.3f} ms"
+        )
+
+
+def measure(name: str, operation: Callable[[], object], iterations: int, warmup: int = 5) -> BenchmarkResult:
+    """Run an operation repeatedly and summarize its latency."""
+    for _ in range(warmup):
+        operation()
+
+    timings: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        mean_ms=statistics.fmean(timings),
+        p50_ms=timings[len(timings) // 2],
+        p95_ms=timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    )
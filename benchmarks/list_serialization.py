@@ -0,0 +1,89 @@
+"""
+Compare the ORM + Pydantic list path with the column-projected compact path.
+
+Usage:
+    python -m benchmarks.list_serialization --items 2000 --iterations 50
+"""
+import argparse
+from datetime import date, timedelta
+from uuid import uuid4
+
+from benchmarks.common import configure_environment, measure, quiet_sql_logging
+
+configure_environment()
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.core.security import create_access_token, hash_password  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.inventory_item import InventoryItem  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+def seed(item_count: int) -> str:
+    """Create a user with `item_count` inventory items and return a token."""
+    db = SessionLocal()
+    try:
+        user = User(id=uuid4(), email="bench@example.com", hashed_password=hash_password("benchpass123"))
+        db.add(user)
+        db.flush()
+        today = date.today()
+        db.add_all(
+            InventoryItem(
+                user_id=user.id,
+                name=f"Item {i}",
+                category="dairy",
+                quantity=1 + i % 5,
+                unit="Pieces",
+                storage_location="fridge",
+                expiry_date=today + timedelta(days=i % 30),
+            )
+            for i in range(item_count)
+        )
+        db.commit()
+        return create_access_token(user_id=user.id)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=2000, help="Inventory size")
+    parser.add_argument("--iterations", type=int, default=50, help="Requests per endpoint")
+    args = parser.parse_args()
+
+    quiet_sql_logging()
+    headers = {"Authorization": f"Bearer {seed(args.items)}"}
+
+    with TestClient(app) as client:
+        def fetch(path):
+            response = client.get(path, headers=headers)
+            assert response.status_code == 200, response.text
+            return response
+
+        full_bytes = len(fetch("/api/inventory").content)
+        compact_bytes = len(fetch("/api/inventory/compact").content)
+        narrow_bytes = len(fetch("/api/inventory/compact?fields=id,name,expiry_date").content)
+
+        results = [
+            measure("GET /api/inventory (ORM + Pydantic)",
+                    lambda: fetch("/api/inventory"), args.iterations),
+            measure("GET /api/inventory/compact",
+                    lambda: fetch("/api/inventory/compact"), args.iterations),
+            measure("GET /api/inventory/compact (3 fields)",
+                    lambda: fetch("/api/inventory/compact?fields=id,name,expiry_date"), args.iterations),
+        ]
+
+    print(f"\n{args.items} inventory items, {args.iterations} requests each\n")
+    for result in results:
+        print(result)
+    print(
+        f"\nPayload: full {full_bytes:,} B, compact {compact_bytes:,} B, "
+        f"3 fields {narrow_bytes:,} B"
+    )
+    print(f"Speed-up (compact vs full): {results[0].mean_ms / results[1].mean_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+In-process load test: how many concurrent ingestions and reads one
+worker sustains before tail latency degrades.
+
+Drives the ASGI app directly (no network, no external tools) from an
+asyncio load generator. Each virtual user loops for the run duration,
+picking requests from a weighted workload profile. Vision calls go to a
+local stub with configurable latency, so no API money is spent.
+
+Everything shares one event loop and thread pool, the way a single
+uvicorn worker does - including the load generator itself, so treat
+absolute numbers as a lower bound and compare runs against each other.
+
+Usage:
+    python -m benchmarks.load_test --profile mixed --concurrency 1,10,50 --duration 10
+    python -m benchmarks.load_test --profile ingest --vision-latency-ms 2000 --concurrency 20
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.common import configure_environment, quiet_sql_logging
+
+configure_environment()
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.core.security import create_access_token, hash_password  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.inventory_item import InventoryItem  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.inventory import rebuild_expiry_summary  # noqa: E402
+from benchmarks.vision_stub import StubOpenAI, install_vision_stub  # noqa: E402
+
+FAKE_JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 2048
+MULTIPART_BOUNDARY = "snapshelf-load-test"
+
+# Request = (method, path, headers, body)
+Request = Tuple[str, str, List[Tuple[str, str]], bytes]
+
+
+# ---------------------------------------------------------------------------
+# ASGI client
+
+
+async def asgi_request(method: str, path: str, headers: List[Tuple[str, str]], body: bytes = b"") -> int:
+    """Send one HTTP request straight to the ASGI app and return its status."""
+    path_only, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path_only,
+        "raw_path": path_only.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("loadtest", 80),
+    }
+    request_sent = False
+    response_complete = asyncio.Event()
+    status = 0
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Only report a disconnect once the response is done, like a patient client
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            response_complete.set()
+
+    await app(scope, receive, send)
+    return status
+
+
+def multipart_image_body() -> Tuple[str, bytes]:
+    """Content type and body for POST /api/ingest/image, a distinct photo each time."""
+    b = MULTIPART_BOUNDARY
+    # Unique bytes, or every upload after the first is a detection cache hit
+    photo = FAKE_JPEG + uuid.uuid4().bytes
+    body = (
+        f"--{b}\r\nContent-Disposition: form-data; name=\"storage_location\"\r\n\r\nfridge\r\n"
+        f"--{b}\r\nContent-Disposition: form-data; name=\"image\"; filename=\"fridge.jpg\"\r\n"
+        f"Content-Type: image/jpeg\r\n\r\n"
+    ).encode() + photo + f"\r\n--{b}--\r\n".encode()
+    return f"multipart/form-data; boundary={b}", body
+
+
+# ---------------------------------------------------------------------------
+# Workload
+
+
+def seed_users(user_count: int, items_per_user: int) -> List[str]:
+    """Create users with inventories and return one access token per user."""
+    db = SessionLocal()
+    try:
+        hashed = hash_password("loadtest-password")
+        today = date.today()
+        tokens = []
+        for u in range(user_count):
+            user = User(id=uuid.uuid4(), email=f"load{u}@example.com", hashed_password=hashed)
+            db.add(user)
+            db.flush()
+            db.add_all(
+                InventoryItem(
+                    user_id=user.id,
+                    name=f"Item {i % 40}",
+                    category="dairy",
+                    quantity=1 + i % 5,
+                    unit="Pieces",
+                    storage_location="fridge",
+                    expiry_date=today + timedelta(days=i % 30),
+                )
+                for i in range(items_per_user)
+            )
+            db.flush()
+            rebuild_expiry_summary(db, user.id)
+            tokens.append(create_access_token(user_id=user.id, expires_delta=timedelta(hours=12)))
+        db.commit()
+        return tokens
+    finally:
+        db.close()
+
+
+def _get(path: str) -> Callable[[str], Request]:
+    return lambda token: ("GET", path, [("authorization", f"Bearer {token}")], b"")
+
+
+def _ingest(token: str) -> Request:
+    content_type, body = multipart_image_body()
+    return (
+        "POST", "/api/ingest/image",
+        [("authorization", f"Bearer {token}"), ("content-type", content_type)],
+        body,
+    )
+
+
+OPERATIONS: Dict[str, Callable[[str], Request]] = {
+    "GET /api/inventory": _get("/api/inventory"),
+    "GET /api/inventory/compact": _get("/api/inventory/compact"),
+    "GET /api/inventory/summary": _get("/api/inventory/summary"),
+    "GET /api/sync": _get("/api/sync?since=1"),
+    "POST /api/ingest/image": _ingest,
+}
+
+# Profile -> [(operation, weight)]
+PROFILES: Dict[str, List[Tuple[str, float]]] = {
+    "reads": [
+        ("GET /api/inventory", 5),
+        ("GET /api/inventory/compact", 2),
+        ("GET /api/inventory/summary", 2),
+        ("GET /api/sync", 1),
+    ],
+    "ingest": [
+        ("POST /api/ingest/image", 1),
+    ],
+    "mixed": [
+        ("GET /api/inventory", 4),
+        ("GET /api/inventory/summary", 2),
+        ("GET /api/sync", 2),
+        ("POST /api/ingest/image", 2),
+    ],
+}
+
+
+# ---------------------------------------------------------------------------
+# Running and reporting
+
+
+@dataclass
+class OperationStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies_ms)
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+async def run_load(
+    profile: Sequence[Tuple[str, float]],
+    tokens: List[str],
+    concurrency: int,
+    duration: float,
+    seed: Optional[int] = None
+) -> Tuple[Dict[str, OperationStats], float]:
+    """Run `concurrency` virtual users for `duration` seconds; return stats and elapsed time."""
+    names = [name for name, _ in profile]
+    weights = [weight for _, weight in profile]
+    stats: Dict[str, OperationStats] = defaultdict(OperationStats)
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + duration
+
+    async def virtual_user(index: int) -> None:
+        token = tokens[index % len(tokens)]
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, path, headers, body = OPERATIONS[name](token)
+            started = time.perf_counter()
+            try:
+                status = await asgi_request(method, path, headers, body)
+            except Exception:
+                status = 500
+            stats[name].latencies_ms.append((time.perf_counter() - started) * 1000)
+            if status >= 400:
+                stats[name].errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user(i) for i in range(concurrency)))
+    return stats, time.perf_counter() - started
+
+
+def print_report(concurrency: int, stats: Dict[str, OperationStats], elapsed: float) -> None:
+    print(f"\nconcurrency={concurrency}  elapsed={elapsed:.1f}s")
+    print(f"  {'endpoint':<28} {'requests':>8} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    total = OperationStats()
+    for name in sorted(stats):
+        s = stats[name]
+        total.latencies_ms.extend(s.latencies_ms)
+        total.errors += s.errors
+        _print_row(name, s, elapsed)
+    _print_row("all", total, elapsed)
+
+
+def _print_row(name: str, s: OperationStats, elapsed: float) -> None:
+    error_rate = 100.0 * s.errors / s.count if s.count else 0.0
+    print(
+        f"  {name:<28} {s.count:>8} {s.count / elapsed:>8.1f} "
+        f"{s.percentile(50):>9.1f} {s.percentile(95):>9.1f} {s.percentile(99):>9.1f} {error_rate:>6.1f}%"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="mixed")
+    parser.add_argument("--concurrency", default="1,10,50", help="Comma-separated virtual-user counts to sweep")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--users", type=int, default=10, help="Distinct seeded accounts")
+    parser.add_argument("--items", type=int, default=100, help="Inventory items per account")
+    parser.add_argument("--vision-latency-ms", type=float, default=1500.0)
+    parser.add_argument("--vision-jitter-ms", type=float, default=500.0)
+    parser.add_argument("--vision-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    quiet_sql_logging()
+    stub = StubOpenAI(
+        latency_ms=args.vision_latency_ms,
+        jitter_ms=args.vision_jitter_ms,
+        error_rate=args.vision_error_rate,
+        seed=args.seed,
+    )
+    install_vision_stub(stub)
+    tokens = seed_users(args.users, args.items)
+
+    print(f"profile={args.profile}  vision latency={args.vision_latency_ms:.0f}±{args.vision_jitter_ms:.0f} ms")
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        stats, elapsed = asyncio.run(run_load(PROFILES[args.profile], tokens, concurrency, args.duration, args.seed))
+        print_report(concurrency, stats, elapsed)
+    print(f"\nvision stub calls: {stub.calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Measure recipe suggestion latency against a large synthetic dataset.
+
+Compares the NumPy inverted index with partial top-k selection against
+scoring every recipe in Python and sorting.
+
+Usage:
+    python -m benchmarks.recipe_suggestions --recipes 50000 --inventory 40
+"""
+import argparse
+import random
+from datetime import date, timedelta
+
+from benchmarks.common import configure_environment, measure, quiet_sql_logging
+
+configure_environment()
+
+from app.services.recipes import RecipeIndex  # noqa: E402
+from app.services.recipes.index import EXPIRY_HALF_LIFE_DAYS, EXPIRY_WEIGHT  # noqa: E402
+
+
+def synthetic_recipes(count: int, vocabulary: int, rng: random.Random) -> list:
+    # Zipf-like popularity: a few ingredients appear everywhere, most are rare
+    ingredients = [f"ingredient {i}" for i in range(vocabulary)]
+    popularity = [1.0 / (rank + 1) for rank in range(vocabulary)]
+    return [
+        {
+            "id": i,
+            "title": f"Recipe {i}",
+            "ingredients": sorted(set(rng.choices(ingredients, popularity, k=rng.randint(4, 12)))),
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def full_scan(index: RecipeIndex, inventory, today: date, limit: int):
+    """Score every recipe and sort - what the index avoids."""
+    weights = {}
+    for name, expiry_date in inventory:
+        weight = 1.0 + EXPIRY_WEIGHT * 0.5 ** ((expiry_date - today).days / EXPIRY_HALF_LIFE_DAYS)
+        for key in index.match_keys(name):
+            weights[key] = max(weight, weights.get(key, 0.0))
+    scored = [
+        (sum(weights.get(key, 0.0) for key in recipe.keys) / len(recipe.keys), recipe.id)
+        for recipe in index.recipes
+    ]
+    scored.sort(reverse=True)
+    return scored[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipes", type=int, default=50000)
+    parser.add_argument("--vocabulary", type=int, default=2000, help="Distinct ingredients")
+    parser.add_argument("--inventory", type=int, default=40, help="Items in the user's inventory")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    quiet_sql_logging()
+    rng = random.Random(args.seed)
+    today = date.today()
+    index = RecipeIndex(synthetic_recipes(args.recipes, args.vocabulary, rng))
+    inventory = [
+        (f"ingredient {rng.randrange(args.vocabulary // 4)}", today + timedelta(days=rng.randint(0, 14)))
+        for _ in range(args.inventory)
+    ]
+
+    print(f"{len(index)} recipes, {len(index.postings)} indexed ingredients, {args.inventory} inventory items")
+    results = [
+        measure("full scan + sort", lambda: full_scan(index, inventory, today, args.limit), max(10, args.iterations // 10)),
+        measure("inverted index + partial top-k", lambda: index.suggest(inventory, today, args.limit), args.iterations),
+    ]
+    for result in results:
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
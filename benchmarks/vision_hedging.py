@@ -0,0 +1,97 @@
+"""
+Measure detection tail latency with and without hedged requests.
+
+Two simulated providers with a heavy tail: most calls take about
+`--latency-ms`, but `--tail-rate` of them take `--tail-ms` (a stalled
+connection, a cold replica). Compares asking the primary alone with
+hedging to the secondary after the primary's observed p95, and reports
+the extra calls hedging cost.
+
+Usage:
+    python -m benchmarks.vision_hedging --requests 400 --latency-ms 40 --tail-ms 800
+"""
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import configure_environment
+
+configure_environment()
+
+from app.services.ingestion.backends import STUB_ITEMS  # noqa: E402
+from app.services.ingestion.hedging import HedgedDetector, HedgePolicy  # noqa: E402
+
+
+class HeavyTailBackend:
+    """Answers after latency_ms +/- 25%, or after tail_ms with probability tail_rate."""
+
+    def __init__(self, name: str, latency_ms: float, tail_ms: float, tail_rate: float, seed: int):
+        self.name = name
+        self.latency_ms = latency_ms
+        self.tail_ms = tail_ms
+        self.tail_rate = tail_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def detect_food_items(self, image_bytes: bytes):
+        with self._lock:
+            self.calls += 1
+            if self._random.random() < self.tail_rate:
+                latency = self.tail_ms
+            else:
+                latency = self._random.uniform(0.75, 1.25) * self.latency_ms
+        time.sleep(latency / 1000)
+        return list(STUB_ITEMS)
+
+
+def run(label: str, detector: HedgedDetector, backends: list, requests: int, concurrency: int) -> None:
+    def timed(_):
+        started = time.perf_counter()
+        detector.detect(backends, b"image")
+        return (time.perf_counter() - started) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        timings = sorted(pool.map(timed, range(requests)))
+    calls = sum(backend.calls for backend in backends)
+
+    def pct(fraction: float) -> float:
+        return timings[min(len(timings) - 1, int(len(timings) * fraction))]
+
+    print(
+        f"{label:<28} p50 {pct(0.50):7.1f} ms   p95 {pct(0.95):7.1f} ms   p99 {pct(0.99):7.1f} ms   "
+        f"max {timings[-1]:7.1f} ms   calls/request {calls / requests:.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--tail-ms", type=float, default=800.0)
+    parser.add_argument("--tail-rate", type=float, default=0.04)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    def backends():
+        return [
+            HeavyTailBackend(name, args.latency_ms, args.tail_ms, args.tail_rate, args.seed + i)
+            for i, name in enumerate(("primary", "secondary"))
+        ]
+
+    detector = HedgedDetector(HedgePolicy(min_samples=20), max_workers=args.concurrency * 2)
+    # Seed the latency windows from the same distribution, so hedging starts at the observed p95
+    rng = random.Random(args.seed)
+    for name in ("primary", "secondary"):
+        for _ in range(200):
+            latency = args.tail_ms if rng.random() < args.tail_rate else rng.uniform(0.75, 1.25) * args.latency_ms
+            detector.window(name).record(latency / 1000)
+    run("primary only", detector, backends()[:1], args.requests, args.concurrency)
+    run("hedged after primary p95", detector, backends(), args.requests, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Local stand-in for the OpenAI client used by the vision detector.
+
+Mimics `client.chat.completions.create(...)` closely enough for
+GPT4oVisionClient: it blocks for a configurable latency (like the real
+synchronous SDK waiting on the network) and returns a JSON detection
+result with token usage. Lets load tests exercise image ingestion without
+API spend.
+"""
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import List, Optional
+
+DEFAULT_ITEMS = [
+    {"name": "whole milk", "category": "dairy", "quantity": 1, "unit": "Liters", "quantity_confidence": 0.9},
+    {"name": "cheddar cheese", "category": "dairy", "quantity": 200, "unit": "Grams", "quantity_confidence": 0.7},
+    {"name": "spinach", "category": "produce", "quantity": 1, "unit": "Pieces", "quantity_confidence": 0.6},
+    {"name": "chicken breast", "category": "meat", "quantity": 500, "unit": "Grams", "quantity_confidence": 0.8},
+]
+
+
+class _Completions:
+    def __init__(self, stub: "StubOpenAI"):
+        self._stub = stub
+
+    def create(self, **kwargs):
+        return self._stub.complete(**kwargs)
+
+
+class StubOpenAI:
+    """
+    Fake OpenAI client with configurable latency and failure rate.
+
+    Latency is drawn uniformly from latency_ms +/- jitter_ms. A call
+    fails (raises, like an API error) with probability error_rate.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 1500.0,
+        jitter_ms: float = 500.0,
+        error_rate: float = 0.0,
+        items: Optional[List[dict]] = None,
+        seed: Optional[int] = None,
+        prompt_tokens: int = 1100
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.items = items or DEFAULT_ITEMS
+        self.prompt_tokens = prompt_tokens
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=_Completions(self))
+
+    def complete(self, **kwargs):
+        with self._lock:
+            self.calls += 1
+            latency = max(0.0, self._random.uniform(
+                self.latency_ms - self.jitter_ms, self.latency_ms + self.jitter_ms
+            ))
+            fail = self._random.random() < self.error_rate
+
+        time.sleep(latency / 1000)
+        if fail:
+            raise RuntimeError("stubbed API error")
+
+        content = json.dumps({"items": self.items})
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=self.prompt_tokens, completion_tokens=len(content) // 4)
+        )
+
+
+def install_vision_stub(stub: StubOpenAI) -> None:
+    """Route the app's vision detector through the stub."""
+    from app.services.ingestion.gpt4o_vision import gpt4o_vision_client
+    gpt4o_vision_client._client = stub
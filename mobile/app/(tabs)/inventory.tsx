@@ -14,7 +14,7 @@ import { useFocusEffect, useRouter } from 'expo-router';
 import { Ionicons } from '@expo/vector-icons';
 import * as Haptics from 'expo-haptics';
 import { api } from '../../services/api';
-import { InventoryItem, CATEGORIES } from '../../types';
+import { CATEGORIES } from '../../types';
 import { colors, typography, spacing, radius } from '../../theme';
 
 // Shared Components
@@ -28,7 +28,7 @@ import { InventoryFilters } from '../../components/inventory/InventoryFilters';
 
 
 // Utils
-import { mergeInventoryItems, MergedInventoryItem } from '../../utils/inventoryMerge';
+import { MergedInventoryItem } from '../../utils/inventoryMerge';
 
 // We'll keep the consumption modal logic and edit modal logic here for now, or extract further if needed.
 // For brevity in this refactor, I will inline the modals but use the new style tokens.
@@ -37,7 +37,6 @@ export default function InventoryScreen() {
   const router = useRouter();
 
   // Data State
-  const [items, setItems] = useState<InventoryItem[]>([]);
   const [displayItems, setDisplayItems] = useState<MergedInventoryItem[]>([]);
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
@@ -61,20 +60,10 @@ export default function InventoryScreen() {
     }).start();
   }, []);
 
-  // Sync Display Items
-  useEffect(() => {
-    if (items.length > 0) {
-      const merged = mergeInventoryItems(items);
-      setDisplayItems(merged);
-    } else {
-      setDisplayItems([]);
-    }
-  }, [items]);
-
   const fetchInventory = async () => {
     try {
-      const data = await api.getInventoryItems();
-      setItems(data);
+      const data = await api.getGroupedInventory();
+      setDisplayItems(data);
     } catch (error: any) {
       Alert.alert('Error', error.message || 'Failed to fetch inventory');
     } finally {
@@ -148,14 +137,16 @@ export default function InventoryScreen() {
     let expired = 0;
     let expiringSoon = 0;
     let fresh = 0;
-    items.forEach(item => {
+    let total = 0;
+    displayItems.forEach(item => {
       const days = getDaysUntilExpiry(item.expiry_date);
-      if (days < 0) expired++;
-      else if (days <= 3) expiringSoon++;
-      else fresh++;
+      if (days < 0) expired += item.mergedCount;
+      else if (days <= 3) expiringSoon += item.mergedCount;
+      else fresh += item.mergedCount;
+      total += item.mergedCount;
     });
-    return { expired, expiringSoon, fresh, total: items.length };
-  }, [items]);
+    return { expired, expiringSoon, fresh, total };
+  }, [displayItems]);
 
   // Filter Logic
   const filteredAndSortedItems = useMemo(() => {
@@ -201,7 +192,7 @@ export default function InventoryScreen() {
     <Screen safeArea={true} padding={false} style={{ backgroundColor: colors.background.primary }}>
       <Animated.View style={[styles.headerContainer, { opacity: headerOpacity }]}>
         <InventoryHeader statusCounts={statusCounts} />
-        {items.length > 0 && (
+        {displayItems.length > 0 && (
           <InventoryFilters
             searchQuery={searchQuery}
             onSearchChange={setSearchQuery}
@@ -222,7 +213,7 @@ export default function InventoryScreen() {
           <ActivityIndicator size="large" color={colors.primary.sage} />
           <Text style={styles.loadingText}>Loading...</Text>
         </View>
-      ) : items.length === 0 ? (
+      ) : displayItems.length === 0 ? (
         <View style={styles.emptyContainer}>
           <View style={styles.emptyIconContainer}>
             <Ionicons name="basket-outline" size={64} color={colors.primary.sageLight} />
@@ -141,23 +141,15 @@ export default function EditItemScreen() {
     try {
       const remaining = item.quantity - consumeQuantity;
       if (remaining <= 0) {
-        // Delete all merged items
-        await Promise.all(item.mergedIds.map(id => api.deleteInventoryItem(id)));
+        // Everything was consumed
+        await Promise.all(item.mergedIds.map(id => api.recordInventoryEvent(id, 'consumed')));
       } else {
-        // Update first item with remaining quantity, delete others if needed
-        const firstId = item.mergedIds[0];
-        await api.updateInventoryItem(firstId, {
-          name: item.name,
-          category: item.category.toLowerCase(),
-          quantity: remaining,
-          unit: item.unit.toLowerCase(),
-          storage_location: 'fridge',
-          expiry_date: item.expiry_date,
-        });
-        // Delete other merged items
-        for (let i = 1; i < item.mergedIds.length; i++) {
-          await api.deleteInventoryItem(item.mergedIds[i]);
-        }
+        // Fold the merged items into one on the server, without recording consumption
+        const merged = item.mergedIds.length > 1
+          ? await api.mergeInventoryItems(item.mergedIds, item.quantity, item.unit.toLowerCase())
+          : { id: item.mergedIds[0] };
+        // Then record only what was actually consumed; the server keeps the rest
+        await api.recordInventoryEvent(merged.id, 'consumed', consumeQuantity);
       }
       Alert.alert('Success', 'Item updated', [{ text: 'OK', onPress: closeSheet }]);
     } catch (e: any) {
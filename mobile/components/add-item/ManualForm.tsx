@@ -1,9 +1,10 @@
-import React, { useState } from 'react';
+import React, { useRef, useState } from 'react';
 import { View, Text, StyleSheet, ScrollView, TouchableOpacity, ActivityIndicator, Keyboard } from 'react-native';
 import { Ionicons } from '@expo/vector-icons';
 import { Calendar } from 'react-native-calendars';
 import { colors, radius, spacing, typography } from '../../theme';
-import { CATEGORIES, UNITS } from '../../types';
+import { CATEGORIES, CatalogSuggestion, UNITS } from '../../types';
+import { api } from '../../services/api';
 import { Input } from '../ui/Input';
 import { Button } from '../ui/Button';
 import { Card } from '../ui/Card';
@@ -29,6 +30,37 @@ export function ManualForm({ onSave, loading, onCancel }: ManualFormProps) {
         expiryDate: '',
     });
     const [showCategoryPicker, setShowCategoryPicker] = useState(false);
+    const [suggestions, setSuggestions] = useState<CatalogSuggestion[]>([]);
+    // Only the latest keystroke's response may update the list
+    const latestLookup = useRef(0);
+
+    const handleNameChange = async (text: string) => {
+        setForm((current) => ({ ...current, name: text }));
+        const lookup = ++latestLookup.current;
+        if (!text.trim()) {
+            setSuggestions([]);
+            return;
+        }
+        try {
+            const results = await api.autocompleteFood(text);
+            if (lookup === latestLookup.current) {
+                setSuggestions(results);
+            }
+        } catch {
+            // Suggestions are a convenience; typing still works without them
+        }
+    };
+
+    const pickSuggestion = (suggestion: CatalogSuggestion) => {
+        latestLookup.current++;
+        setSuggestions([]);
+        setForm((current) => ({
+            ...current,
+            name: suggestion.name,
+            category: suggestion.category.charAt(0).toUpperCase() + suggestion.category.slice(1),
+            unit: suggestion.unit,
+        }));
+    };
 
     const handleSave = () => {
         onSave(form);
@@ -43,10 +75,24 @@ export function ManualForm({ onSave, loading, onCancel }: ManualFormProps) {
                     label="Product Name"
                     placeholder="e.g. Organic Bananas"
                     value={form.name}
-                    onChangeText={(text) => setForm({ ...form, name: text })}
-                    containerStyle={{ marginBottom: spacing.lg }}
+                    onChangeText={handleNameChange}
+                    containerStyle={{ marginBottom: suggestions.length ? spacing.sm : spacing.lg }}
                 />
 
+                {suggestions.length > 0 && (
+                    <View style={styles.suggestions}>
+                        {suggestions.map((suggestion) => (
+                            <TouchableOpacity
+                                key={suggestion.name}
+                                style={styles.categoryOption}
+                                onPress={() => pickSuggestion(suggestion)}
+                            >
+                                <Text style={styles.categoryOptionText}>{suggestion.name}</Text>
+                            </TouchableOpacity>
+                        ))}
+                    </View>
+                )}
+
                 <Text style={[styles.label, { marginBottom: spacing.xs }]}>Category</Text>
                 <TouchableOpacity
                     style={styles.categoryRow}
@@ -195,6 +241,12 @@ const styles = StyleSheet.create({
         fontSize: typography.size.md,
         color: colors.text.primary,
     },
+    suggestions: {
+        flexDirection: 'row',
+        flexWrap: 'wrap',
+        gap: spacing.sm,
+        marginBottom: spacing.lg,
+    },
     categoryOptions: {
         flexDirection: 'row',
         flexWrap: 'wrap',
@@ -1,5 +1,6 @@
 import * as SecureStore from 'expo-secure-store';
-import { Token, User, DraftItem, DraftItemCreate, InventoryItem, InventoryItemCreate, InventoryItemUpdate, LoginCredentials, RegisterCredentials } from '../types';
+import { CatalogSuggestion, Token, User, DraftItem, DraftItemCreate, InventoryItem, InventoryItemCreate, InventoryItemUpdate, InventoryGroup, InventorySearchResult, LoginCredentials, RecipeSuggestion, RegisterCredentials, RestockSuggestion } from '../types';
+import { MergedInventoryItem } from '../utils/inventoryMerge';
 
 // Update this to your backend URL
 // const API_BASE_URL = 'http://10.0.2.2:8000'; // Android emulator localhost
@@ -7,12 +8,18 @@ import { Token, User, DraftItem, DraftItemCreate, InventoryItem, InventoryItemCr
 const API_BASE_URL = 'http://172.20.10.4:8000'; // Physical device (your WiFi IP)
 
 const TOKEN_KEY = 'auth_token';
+const REFRESH_TOKEN_KEY = 'refresh_token';
 
 class ApiService {
   private token: string | null = null;
+  private refreshToken: string | null = null;
+  private refreshing: Promise<boolean> | null = null;
+  // Last body and ETag per list URL, for If-None-Match polling
+  private listCache = new Map<string, { etag: string; body: unknown }>();
 
   async init() {
     this.token = await SecureStore.getItemAsync(TOKEN_KEY);
+    this.refreshToken = await SecureStore.getItemAsync(REFRESH_TOKEN_KEY);
   }
 
   private async getHeaders(): Promise<HeadersInit> {
@@ -27,14 +34,101 @@ class ApiService {
     return headers;
   }
 
-  async setToken(token: string) {
+  async setToken(token: string, refreshToken?: string | null) {
     this.token = token;
     await SecureStore.setItemAsync(TOKEN_KEY, token);
+    if (refreshToken) {
+      this.refreshToken = refreshToken;
+      await SecureStore.setItemAsync(REFRESH_TOKEN_KEY, refreshToken);
+    }
   }
 
   async clearToken() {
     this.token = null;
+    this.refreshToken = null;
+    this.listCache.clear();
     await SecureStore.deleteItemAsync(TOKEN_KEY);
+    await SecureStore.deleteItemAsync(REFRESH_TOKEN_KEY);
+  }
+
+  // Access tokens are short-lived: on 401, rotate the refresh token once and retry
+  private async authFetch(url: string, init: RequestInit = {}): Promise<Response> {
+    const response = await fetch(url, init);
+    if (response.status !== 401 || !this.refreshToken) {
+      return response;
+    }
+
+    // Concurrent 401s share one refresh - a second rotation would look like reuse
+    if (!this.refreshing) {
+      this.refreshing = this.refreshAccessToken().finally(() => {
+        this.refreshing = null;
+      });
+    }
+    if (!(await this.refreshing)) {
+      return response;
+    }
+
+    const headers = { ...(init.headers as Record<string, string>), Authorization: `Bearer ${this.token}` };
+    return fetch(url, { ...init, headers });
+  }
+
+  // POST that is safe to retry: every attempt carries the same Idempotency-Key,
+  // so the server replays (or waits for) the first attempt instead of redoing it
+  private async idempotentPost(url: string, init: RequestInit, attempts = 3): Promise<Response> {
+    const key = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+    const headers = { ...(init.headers as Record<string, string>), 'Idempotency-Key': key };
+    for (let attempt = 1; ; attempt++) {
+      try {
+        return await this.authFetch(url, { ...init, method: 'POST', headers });
+      } catch (error) {
+        // fetch only throws on network failures and timeouts
+        if (attempt >= attempts) {
+          throw error;
+        }
+      }
+    }
+  }
+
+  // GET a list, answering from the last copy when the server says 304 Not Modified
+  private async conditionalGet<T>(path: string, errorMessage: string): Promise<T> {
+    const url = `${API_BASE_URL}${path}`;
+    const cached = this.listCache.get(url);
+    const headers = (await this.getHeaders()) as Record<string, string>;
+    if (cached) {
+      headers['If-None-Match'] = cached.etag;
+    }
+
+    const response = await this.authFetch(url, { headers });
+    if (response.status === 304 && cached) {
+      return cached.body as T;
+    }
+    if (!response.ok) {
+      throw new Error(errorMessage);
+    }
+
+    const body: T = await response.json();
+    const etag = response.headers.get('ETag');
+    if (etag) {
+      this.listCache.set(url, { etag, body });
+    }
+    return body;
+  }
+
+  private async refreshAccessToken(): Promise<boolean> {
+    const response = await fetch(`${API_BASE_URL}/auth/refresh`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ refresh_token: this.refreshToken }),
+    });
+
+    if (!response.ok) {
+      await this.clearToken();
+      return false;
+    }
+
+    const data: Token = await response.json();
+    await this.setToken(data.access_token, data.refresh_token);
+    return true;
   }
 
   getToken() {
@@ -55,7 +149,7 @@ class ApiService {
     }
 
     const data: Token = await response.json();
-    await this.setToken(data.access_token);
+    await this.setToken(data.access_token, data.refresh_token);
     return data;
   }
 
@@ -72,16 +166,23 @@ class ApiService {
     }
 
     const data: Token = await response.json();
-    await this.setToken(data.access_token);
+    await this.setToken(data.access_token, data.refresh_token);
     return data;
   }
 
   async logout() {
+    if (this.token) {
+      // Best effort - local tokens are cleared even if the server is unreachable
+      await fetch(`${API_BASE_URL}/auth/logout`, {
+        method: 'POST',
+        headers: await this.getHeaders(),
+      }).catch(() => undefined);
+    }
     await this.clearToken();
   }
 
   async getCurrentUser(): Promise<User> {
-    const response = await fetch(`${API_BASE_URL}/auth/me`, {
+    const response = await this.authFetch(`${API_BASE_URL}/auth/me`, {
       headers: await this.getHeaders(),
     });
 
@@ -94,20 +195,11 @@ class ApiService {
 
   // Draft items endpoints
   async getDraftItems(): Promise<DraftItem[]> {
-    const response = await fetch(`${API_BASE_URL}/api/draft-items`, {
-      headers: await this.getHeaders(),
-    });
-
-    if (!response.ok) {
-      throw new Error('Failed to fetch draft items');
-    }
-
-    return response.json();
+    return this.conditionalGet<DraftItem[]>('/api/draft-items', 'Failed to fetch draft items');
   }
 
   async createDraftItem(data: DraftItemCreate): Promise<DraftItem> {
-    const response = await fetch(`${API_BASE_URL}/api/draft-items`, {
-      method: 'POST',
+    const response = await this.idempotentPost(`${API_BASE_URL}/api/draft-items`, {
       headers: await this.getHeaders(),
       body: JSON.stringify(data),
     });
@@ -121,7 +213,7 @@ class ApiService {
   }
 
   async deleteDraftItem(id: string): Promise<void> {
-    const response = await fetch(`${API_BASE_URL}/api/draft-items/${id}`, {
+    const response = await this.authFetch(`${API_BASE_URL}/api/draft-items/${id}`, {
       method: 'DELETE',
       headers: await this.getHeaders(),
     });
@@ -132,7 +224,7 @@ class ApiService {
   }
 
   async confirmDraftItem(draftId: string, data: InventoryItemCreate): Promise<InventoryItem> {
-    const response = await fetch(`${API_BASE_URL}/api/draft-items/${draftId}/confirm`, {
+    const response = await this.authFetch(`${API_BASE_URL}/api/draft-items/${draftId}/confirm`, {
       method: 'POST',
       headers: await this.getHeaders(),
       body: JSON.stringify(data),
@@ -148,19 +240,40 @@ class ApiService {
 
   // Inventory endpoints
   async getInventoryItems(): Promise<InventoryItem[]> {
-    const response = await fetch(`${API_BASE_URL}/api/inventory`, {
+    return this.conditionalGet<InventoryItem[]>('/api/inventory', 'Failed to fetch inventory items');
+  }
+
+  // Inventory merged server-side by name, expiry date and unit group
+  async getGroupedInventory(): Promise<MergedInventoryItem[]> {
+    const groups = await this.conditionalGet<InventoryGroup[]>(
+      '/api/inventory/grouped',
+      'Failed to fetch inventory items'
+    );
+    return groups.map(({ merged_ids, merged_count, base_quantity, base_unit, ...item }) => ({
+      ...item,
+      mergedIds: merged_ids,
+      mergedCount: merged_count,
+      baseQuantity: base_quantity,
+      baseUnit: base_unit,
+    }));
+  }
+
+  // Items matching a name or part of one, best matches first
+  async searchInventory(q: string, limit: number = 20): Promise<InventorySearchResult[]> {
+    const params = new URLSearchParams({ q, limit: String(limit) });
+    const response = await this.authFetch(`${API_BASE_URL}/api/inventory/search?${params}`, {
       headers: await this.getHeaders(),
     });
 
     if (!response.ok) {
-      throw new Error('Failed to fetch inventory items');
+      throw new Error('Failed to search inventory');
     }
 
     return response.json();
   }
 
   async deleteInventoryItem(id: string): Promise<void> {
-    const response = await fetch(`${API_BASE_URL}/api/inventory/${id}`, {
+    const response = await this.authFetch(`${API_BASE_URL}/api/inventory/${id}`, {
       method: 'DELETE',
       headers: await this.getHeaders(),
     });
@@ -170,8 +283,36 @@ class ApiService {
     }
   }
 
+  // Fold several items into the one with the lowest id; nothing is recorded as consumed
+  async mergeInventoryItems(ids: string[], quantity: number, unit: string): Promise<InventoryItem> {
+    const response = await this.authFetch(`${API_BASE_URL}/api/inventory/merge`, {
+      method: 'POST',
+      headers: await this.getHeaders(),
+      body: JSON.stringify({ ids, quantity, unit }),
+    });
+
+    if (!response.ok) {
+      throw new Error('Failed to merge inventory items');
+    }
+
+    return response.json();
+  }
+
+  // Take some or all of an item off the inventory as consumed or wasted (feeds waste analytics)
+  async recordInventoryEvent(id: string, kind: 'consumed' | 'wasted', quantity?: number): Promise<void> {
+    const response = await this.authFetch(`${API_BASE_URL}/api/inventory/${id}/events`, {
+      method: 'POST',
+      headers: await this.getHeaders(),
+      body: JSON.stringify({ kind, quantity }),
+    });
+
+    if (!response.ok) {
+      throw new Error('Failed to record inventory event');
+    }
+  }
+
   async updateInventoryItem(id: string, data: InventoryItemUpdate): Promise<InventoryItem> {
-    const response = await fetch(`${API_BASE_URL}/api/inventory/${id}`, {
+    const response = await this.authFetch(`${API_BASE_URL}/api/inventory/${id}`, {
       method: 'PUT',
       headers: await this.getHeaders(),
       body: JSON.stringify(data),
@@ -204,6 +345,46 @@ class ApiService {
     return this.confirmDraftItem(draft.id, data);
   }
 
+  // Recipes that use up the most of the inventory, favouring items about to expire
+  async getSuggestedRecipes(limit: number = 10): Promise<RecipeSuggestion[]> {
+    const response = await this.authFetch(`${API_BASE_URL}/api/recipes/suggested?limit=${limit}`, {
+      headers: await this.getHeaders(),
+    });
+
+    if (!response.ok) {
+      throw new Error('Failed to fetch recipe suggestions');
+    }
+
+    return response.json();
+  }
+
+  // Catalog foods matching what has been typed so far, with default category and unit
+  async autocompleteFood(prefix: string, limit: number = 5): Promise<CatalogSuggestion[]> {
+    const params = new URLSearchParams({ prefix, limit: String(limit) });
+    const response = await this.authFetch(`${API_BASE_URL}/api/catalog/autocomplete?${params}`, {
+      headers: await this.getHeaders(),
+    });
+
+    if (!response.ok) {
+      throw new Error('Failed to fetch food suggestions');
+    }
+
+    return response.json();
+  }
+
+  // Products forecast to run out within `within` days, from the nightly restock batch
+  async getSuggestedShoppingList(within: number = 7): Promise<RestockSuggestion[]> {
+    const response = await this.authFetch(`${API_BASE_URL}/api/shopping-list/suggested?within=${within}`, {
+      headers: await this.getHeaders(),
+    });
+
+    if (!response.ok) {
+      throw new Error('Failed to fetch shopping list suggestions');
+    }
+
+    return response.json();
+  }
+
   // Image ingestion endpoint
   async ingestImage(imageUri: string, storageLocation: string = 'fridge'): Promise<DraftItem[]> {
     const formData = new FormData();
@@ -225,8 +406,7 @@ class ApiService {
       headers['Authorization'] = `Bearer ${this.token}`;
     }
 
-    const response = await fetch(`${API_BASE_URL}/api/ingest/image`, {
-      method: 'POST',
+    const response = await this.idempotentPost(`${API_BASE_URL}/api/ingest/image`, {
       headers,
       body: formData,
     });
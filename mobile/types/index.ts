@@ -3,6 +3,8 @@
 export interface Token {
   access_token: string;
   token_type: string;
+  refresh_token?: string | null;
+  expires_in?: number | null;
 }
 
 export interface User {
@@ -38,6 +40,20 @@ export interface InventoryItem {
   storage_location: string;
   expiry_date: string;
   created_at: string;
+  updated_at: string;
+}
+
+// Search hit (GET /api/inventory/search)
+export interface InventorySearchResult extends InventoryItem {
+  match: 'prefix' | 'substring' | 'similar';
+  similarity: number;
+}
+
+export interface InventoryGroup extends InventoryItem {
+  base_quantity: number;
+  base_unit: string;
+  merged_ids: string[];
+  merged_count: number;
 }
 
 export interface InventoryItemCreate {
@@ -94,6 +110,37 @@ export const UNITS = [
   'Liters',
 ] as const;
 
+// Recipe Types
+export interface RecipeSuggestion {
+  id: number;
+  title: string;
+  score: number;
+  coverage: number;
+  matched_ingredients: string[];
+  missing_ingredients: string[];
+}
+
+// Food catalog autocomplete (GET /api/catalog/autocomplete)
+export interface CatalogSuggestion {
+  name: string;
+  category: string;
+  unit: string;
+  popularity: number;
+}
+
+// Product forecast to run out soon (GET /api/shopping-list/suggested)
+export interface RestockSuggestion {
+  name: string;
+  product: string;
+  unit: string;
+  daily_rate: number;
+  on_hand: number;
+  run_out_on: string;
+  days_left: number;
+  last_consumed_on: string;
+  computed_on: string;
+}
+
 // Auth Types
 export interface LoginCredentials {
   email: string;
@@ -2,10 +2,15 @@
 Test configuration and shared fixtures.
 
 Provides an in-memory SQLite database, FastAPI TestClient,
-and authenticated user fixtures for API endpoint testing.
+authenticated user fixtures for API endpoint testing, and a
+query-count / latency budget harness.
 """
 import os
+import time
 import pytest
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import List, Optional
 from uuid import uuid4
 
 # Set test environment variables BEFORE any app imports
@@ -14,14 +19,28 @@ os.environ["JWT_SECRET_KEY"] = "test-secret-key-for-unit-tests"
 os.environ["JWT_ALGORITHM"] = "HS256"
 os.environ["ACCESS_TOKEN_EXPIRE_MINUTES"] = "30"
 os.environ["OPENAI_API_KEY"] = "test-key-not-real"
+os.environ["BCRYPT_ROUNDS"] = "4"  # Cheapest cost keeps auth tests fast
+os.environ["ALERT_SCHEDULER_ENABLED"] = "false"  # Tests drive alert ticks directly
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
 
 from app.core.database import Base, get_db
+from app.core.idempotency import idempotency_store
+from app.core.metrics import metrics
 from app.core.security import hash_password, create_access_token
+from app.core.revocation import revocation_filter
+from app.core.throttling import login_throttle
+from app.core.user_cache import user_record_cache
 from app.models.user import User
+from app.services.alerts import expiry_alerts
+from app.services.analytics import columnar_event_cache
+from app.services.ingestion.accounting import vision_usage
+from app.services.ingestion.cache import detection_cache
+from app.services.inventory import backfilled_users
+from app.services.recipes import suggestion_cache
+from app.services.search import search_index_cache
 from app.main import app
 
 
@@ -71,6 +90,18 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    login_throttle.reset()
+    revocation_filter.reset()
+    user_record_cache.clear()
+    metrics.reset()
+    idempotency_store.clear()
+    expiry_alerts.reset()
+    columnar_event_cache.clear()
+    suggestion_cache.clear()
+    search_index_cache.clear()
+    vision_usage.clear()
+    detection_cache.clear()
+    backfilled_users.clear()
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -103,3 +134,75 @@ def auth_token(test_user):
 def auth_headers(auth_token):
     """Return Authorization headers for authenticated requests."""
     return {"Authorization": f"Bearer {auth_token}"}
+
+
+# Multiplies every latency budget - raise on slow CI machines. Latency
+# budgets are only checked with --perf or PERF_BUDGET_SCALE set: wall-clock
+# time is too noisy on shared hosts to fail an ordinary run.
+PERF_BUDGET_SCALE = float(os.getenv("PERF_BUDGET_SCALE", "1"))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--perf", action="store_true", default=False,
+        help="Also enforce perf_budget latency (max_ms) budgets"
+    )
+
+
+@dataclass
+class CapturedWork:
+    """SQL statements and commits issued inside a `perf_budget` block."""
+    statements: List[str] = field(default_factory=list)
+    commits: int = 0
+    elapsed_ms: float = 0.0
+
+
+@pytest.fixture
+def perf_budget(request):
+    """
+    Context manager failing the test if a block exceeds its budget.
+
+        with perf_budget(max_queries=4, max_commits=1, max_ms=100):
+            client.get("/api/inventory", headers=auth_headers)
+
+    Counts every statement sent to the test database (including auth
+    and change-tracking queries) and every COMMIT. The failure message
+    lists the captured SQL, so an N+1 regression is easy to spot.
+    max_ms is only enforced with --perf or PERF_BUDGET_SCALE set.
+    """
+    check_latency = request.config.getoption("--perf") or "PERF_BUDGET_SCALE" in os.environ
+
+    @contextmanager
+    def budget(max_queries: int, max_commits: Optional[int] = None, max_ms: Optional[float] = None):
+        captured = CapturedWork()
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            captured.statements.append(statement)
+
+        def on_commit(conn):
+            captured.commits += 1
+
+        event.listen(engine, "before_cursor_execute", on_execute)
+        event.listen(engine, "commit", on_commit)
+        started = time.perf_counter()
+        try:
+            yield captured
+        finally:
+            captured.elapsed_ms = (time.perf_counter() - started) * 1000
+            event.remove(engine, "before_cursor_execute", on_execute)
+            event.remove(engine, "commit", on_commit)
+
+        statements = "\n".join(f"  {i + 1}. {' '.join(sql.split())}" for i, sql in enumerate(captured.statements))
+        assert len(captured.statements) <= max_queries, (
+            f"{len(captured.statements)} queries, budget is {max_queries}:\n{statements}"
+        )
+        if max_commits is not None:
+            assert captured.commits <= max_commits, (
+                f"{captured.commits} commits, budget is {max_commits}"
+            )
+        if max_ms is not None and check_latency:
+            assert captured.elapsed_ms <= max_ms * PERF_BUDGET_SCALE, (
+                f"took {captured.elapsed_ms:.1f} ms, budget is {max_ms * PERF_BUDGET_SCALE:.0f} ms"
+            )
+
+    return budget
@@ -0,0 +1,61 @@
+"""
+Tests for the expiry alert scheduler and the notification outbox.
+
+Ticks are driven directly with a fixed clock (the background thread is
+disabled in tests). With the default one-day lead, an item expiring
+tomorrow is due at ALERT_HOUR today.
+"""
+from datetime import date, datetime, time, timedelta
+
+from app.services.alerts import expiry_alerts
+from tests.test_api import _create_inventory_item
+
+TODAY = date.today()
+BEFORE_ALERTS = datetime.combine(TODAY, time(0, 0))
+AFTER_ALERTS = datetime.combine(TODAY, time(23, 0))
+
+
+def _expiring_in(days: int) -> str:
+    return (TODAY + timedelta(days=days)).isoformat()
+
+
+def test_due_alerts_reach_the_outbox_once(client, db_session, auth_headers):
+    """Only items inside the lead time are alerted, and each only once."""
+    milk = _create_inventory_item(client, auth_headers, name="Milk", expiry_date=_expiring_in(1))
+    _create_inventory_item(client, auth_headers, name="Rice", expiry_date=_expiring_in(30))
+
+    assert expiry_alerts.tick(db_session, now=AFTER_ALERTS) == 1
+    assert expiry_alerts.tick(db_session, now=AFTER_ALERTS) == 0
+
+    alerts = client.get("/api/alerts", headers=auth_headers).json()
+    assert [(a["item_name"], a["inventory_item_id"]) for a in alerts] == [("Milk", milk["id"])]
+
+    ack = client.post("/api/alerts/ack", json={"ids": [alerts[0]["id"]]}, headers=auth_headers)
+    assert ack.json() == {"acknowledged": 1}
+    assert client.get("/api/alerts", headers=auth_headers).json() == []
+
+
+def test_confirm_update_and_delete_keep_the_schedule_current(client, db_session, auth_headers):
+    """Router hooks reschedule and cancel alerts without reloading the window."""
+    moved = _create_inventory_item(client, auth_headers, name="Yoghurt", expiry_date=_expiring_in(1))
+    eaten = _create_inventory_item(client, auth_headers, name="Ham", expiry_date=_expiring_in(1))
+    expiry_alerts.tick(db_session, now=BEFORE_ALERTS)
+    assert len(expiry_alerts) == 2
+
+    client.put(f"/api/inventory/{moved['id']}", json={"expiry_date": _expiring_in(20)}, headers=auth_headers)
+    client.delete(f"/api/inventory/{eaten['id']}", headers=auth_headers)
+    confirmed = _create_inventory_item(client, auth_headers, name="Cream", expiry_date=_expiring_in(1))
+
+    assert expiry_alerts.tick(db_session, now=AFTER_ALERTS) == 1
+    alerts = client.get("/api/alerts", headers=auth_headers).json()
+    assert [a["inventory_item_id"] for a in alerts] == [confirmed["id"]]
+
+
+def test_idle_tick_does_not_touch_the_database(client, db_session, auth_headers, perf_budget):
+    """Once the window is loaded, a tick with nothing due costs no queries."""
+    for i in range(10):
+        _create_inventory_item(client, auth_headers, name=f"Item {i}", expiry_date=_expiring_in(2 + i))
+    expiry_alerts.tick(db_session, now=BEFORE_ALERTS)
+
+    with perf_budget(max_queries=0, max_commits=0):
+        assert expiry_alerts.tick(db_session, now=BEFORE_ALERTS + timedelta(hours=1)) == 0
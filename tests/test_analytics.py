@@ -0,0 +1,107 @@
+"""
+Tests for consumption/waste events, rollups and range aggregation.
+"""
+from datetime import date, timedelta
+
+from decimal import Decimal
+
+from app.models.inventory_event import InventoryEvent
+from app.services.analytics import EventColumns, days_before_expiry_bucket, period_start
+from tests.conftest import TestSessionLocal
+from tests.test_api import _create_inventory_item
+
+TODAY = date.today()
+
+
+def test_events_update_item_and_rollups(client, test_user, auth_headers):
+    """Partial use shrinks the item, using the rest removes it, and both are counted."""
+    tomorrow = (TODAY + timedelta(days=1)).isoformat()
+    item = _create_inventory_item(client, auth_headers, quantity=2.0, expiry_date=tomorrow)
+
+    consumed = client.post(
+        f"/api/inventory/{item['id']}/events", json={"kind": "consumed", "quantity": 1}, headers=auth_headers
+    )
+    assert consumed.status_code == 201
+    assert consumed.json()["remaining_quantity"] == 1.0
+    assert consumed.json()["days_before_expiry"] == 1
+
+    wasted = client.post(f"/api/inventory/{item['id']}/events", json={"kind": "wasted"}, headers=auth_headers)
+    assert wasted.json()["quantity"] == 1.0
+    assert wasted.json()["remaining_quantity"] == 0.0
+    assert client.get(f"/api/inventory/{item['id']}", headers=auth_headers).status_code == 404
+
+    weeks = client.get("/api/analytics/waste/rollups?period=week", headers=auth_headers).json()
+    assert weeks == [{
+        "period_start": period_start("week", TODAY).isoformat(),
+        "consumed": 1,
+        "wasted": 1,
+        "buckets": [{"bucket": "dairy", "consumed": 1, "wasted": 1}],
+    }]
+
+    report = client.get("/api/analytics/waste?dimension=days_before_expiry", headers=auth_headers).json()
+    assert (report["consumed"], report["wasted"]) == (1, 1)
+    assert report["buckets"] == [{"bucket": "1-2", "consumed": 1, "wasted": 1}]
+
+
+def test_event_cannot_exceed_remaining_quantity(client, test_user, auth_headers):
+    item = _create_inventory_item(client, auth_headers, quantity=1.0)
+    response = client.post(
+        f"/api/inventory/{item['id']}/events", json={"kind": "wasted", "quantity": 5}, headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
+def test_range_report_picks_up_new_events(client, test_user, auth_headers):
+    """Columns loaded by one report are extended with events recorded later."""
+    first = _create_inventory_item(client, auth_headers, name="Bread", category="bakery")
+    client.post(f"/api/inventory/{first['id']}/events", json={"kind": "wasted"}, headers=auth_headers)
+    assert client.get("/api/analytics/waste", headers=auth_headers).json()["wasted"] == 1
+
+    second = _create_inventory_item(client, auth_headers, name="Milk")
+    client.post(f"/api/inventory/{second['id']}/events", json={"kind": "consumed"}, headers=auth_headers)
+    report = client.get("/api/analytics/waste", headers=auth_headers).json()
+    assert (report["consumed"], report["wasted"]) == (1, 1)
+    assert {b["bucket"] for b in report["buckets"]} == {"bakery", "dairy"}
+
+
+def test_range_report_picks_up_events_committed_out_of_id_order(client, test_user, auth_headers):
+    """An event whose id was allocated before an already loaded one, but committed after it, still counts."""
+    item = _create_inventory_item(client, auth_headers, quantity=2.0)
+    client.post(f"/api/inventory/{item['id']}/events", json={"kind": "wasted", "quantity": 1}, headers=auth_headers)
+    assert client.get("/api/analytics/waste", headers=auth_headers).json()["wasted"] == 1
+
+    db = TestSessionLocal()
+    try:
+        loaded = db.query(InventoryEvent).one()
+        db.add(InventoryEvent(
+            id=loaded.id - 1, user_id=loaded.user_id, inventory_item_id=loaded.inventory_item_id, kind="consumed",
+            name="Milk", category="dairy", storage_location="fridge", quantity=Decimal("1"), unit="liters",
+            expiry_date=loaded.expiry_date, days_before_expiry=loaded.days_before_expiry,
+            occurred_on=TODAY, change_seq=loaded.change_seq + 1,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+    report = client.get("/api/analytics/waste", headers=auth_headers).json()
+    assert (report["consumed"], report["wasted"]) == (1, 1)
+
+
+def test_columns_aggregate_inclusive_ranges():
+    """Ranges are inclusive at both ends, and out-of-order days are re-sorted."""
+    day = date(2026, 3, 10)
+    columns = EventColumns()
+    columns.append([
+        (1, day, "wasted", "dairy", "fridge", -2),
+        (2, day + timedelta(days=5), "consumed", "produce", "fridge", 4),
+    ])
+    columns.append([(3, day - timedelta(days=1), "consumed", "dairy", "pantry", 10)])
+
+    totals = columns.totals(day - timedelta(days=1), day, "category")
+    assert (totals.consumed, totals.wasted) == (1, 1)
+    assert [(b.bucket, b.consumed, b.wasted) for b in totals.buckets] == [("dairy", 1, 1)]
+
+    by_expiry = columns.totals(day, day + timedelta(days=5), "days_before_expiry")
+    assert [b.bucket for b in by_expiry.buckets] == ["expired", "3-6"]
+    assert days_before_expiry_bucket(0) == "0"
+    assert columns.last_change_seq == 3
@@ -4,12 +4,25 @@ Integration tests for API endpoints.
 Tests the core user flows: registration, login,
 draft-to-inventory promotion, and image ingestion.
 """
+import csv
+import io
+import json
 import pytest
-from datetime import date, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
 from unittest.mock import patch, MagicMock
 from uuid import uuid4
 
+from sqlalchemy import event
+
+from app.core.bcrypt_cost import apply_rounds
+from app.core.security import create_access_token, pwd_context
+from app.models.inventory_item import InventoryItem
+from app.models.user import User
 from app.services.ingestion.gpt4o_vision import DetectedFoodItem
+from app.services.sync import prune_tombstones
 
 
 class TestAuthFlow:
@@ -41,6 +54,104 @@ class TestAuthFlow:
         })
         assert response.status_code == 401
 
+    def test_repeated_failures_are_throttled(self, client, test_user):
+        """An account is locked out after repeated failed logins."""
+        for _ in range(5):
+            assert client.post("/auth/login", json={
+                "email": "test@example.com", "password": "wrongpassword",
+            }).status_code == 401
+
+        response = client.post("/auth/login", json={
+            "email": "test@example.com", "password": "testpassword123",
+        })
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+
+    def test_refresh_rotation_and_reuse_detection(self, client, test_user):
+        """Refresh tokens rotate; replaying a used one revokes the family."""
+        tokens = client.post("/auth/login", json={
+            "email": "test@example.com", "password": "testpassword123",
+        }).json()
+        assert tokens["refresh_token"] and tokens["expires_in"] > 0
+
+        rotated = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert rotated.status_code == 200
+        rotated = rotated.json()
+        rotated_headers = {"Authorization": f"Bearer {rotated['access_token']}"}
+        assert client.get("/auth/me", headers=rotated_headers).status_code == 200
+
+        # Replaying the consumed token revokes everything from this login
+        replay = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert replay.status_code == 401
+        assert client.post(
+            "/auth/refresh", json={"refresh_token": rotated["refresh_token"]}
+        ).status_code == 401
+        assert client.get("/auth/me", headers=rotated_headers).status_code == 401
+
+    def test_logout_revokes_tokens(self, client, test_user):
+        """After logout neither the access nor the refresh token works."""
+        tokens = client.post("/auth/login", json={
+            "email": "test@example.com", "password": "testpassword123",
+        }).json()
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        assert client.get("/auth/me", headers=headers).status_code == 200
+
+        assert client.post("/auth/logout", headers=headers).status_code == 204
+        assert client.get("/auth/me", headers=headers).status_code == 401
+        assert client.post(
+            "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        ).status_code == 401
+
+    def test_login_rehashes_stale_password_hash(self, client, test_user, db_session):
+        """A hash below the configured bcrypt cost is replaced on login; one above it is kept."""
+        user, password = test_user
+        apply_rounds(5)
+        try:
+            response = client.post("/auth/login", json={"email": user.email, "password": password})
+            assert response.status_code == 200
+            db_session.refresh(user)
+            assert user.hashed_password.startswith("$2b$05$")
+
+            stronger = pwd_context.handler("bcrypt").using(rounds=6).hash(password)
+            user.hashed_password = stronger
+            db_session.commit()
+            assert client.post(
+                "/auth/login", json={"email": user.email, "password": password}
+            ).status_code == 200
+            db_session.refresh(user)
+            assert user.hashed_password == stronger
+        finally:
+            apply_rounds(4)
+
+    def test_me_is_cached_and_invalidated_on_change(self, client, test_user, auth_headers, db_session):
+        """/auth/me is served from the user cache until a change to the user row commits."""
+        user, _ = test_user
+        user_queries = []
+
+        def count_user_queries(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+                user_queries.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count_user_queries)
+        try:
+            assert client.get("/auth/me", headers=auth_headers).json()["email"] == "test@example.com"
+            assert client.get("/auth/me", headers=auth_headers).status_code == 200
+            assert len(user_queries) == 1
+
+            # Flushed but rolled back: the snapshot stays valid and cached
+            user.email = "discarded@example.com"
+            db_session.flush()
+            db_session.rollback()
+            assert client.get("/auth/me", headers=auth_headers).json()["email"] == "test@example.com"
+            assert len(user_queries) == 1
+
+            user.email = "renamed@example.com"
+            db_session.commit()
+            assert client.get("/auth/me", headers=auth_headers).json()["email"] == "renamed@example.com"
+        finally:
+            event.remove(engine, "before_cursor_execute", count_user_queries)
+
     def test_protected_route_without_token(self, client):
         """Protected endpoints should reject unauthenticated requests."""
         assert client.get("/auth/me").status_code == 401
@@ -103,6 +214,425 @@ class TestDraftToInventoryFlow:
         assert client.get(f"/api/inventory/{item_id}", headers=auth_headers).status_code == 404
 
 
+def _create_inventory_item(client, headers, name="Milk", **overrides):
+    """Create a draft and confirm it, returning the inventory item JSON."""
+    draft = client.post("/api/draft-items", json={"name": name}, headers=headers)
+    payload = {
+        "name": name,
+        "category": "dairy",
+        "quantity": 1.0,
+        "unit": "Liters",
+        "storage_location": "fridge",
+        "expiry_date": (date.today() + timedelta(days=7)).isoformat(),
+    }
+    payload.update(overrides)
+    confirm = client.post(
+        f"/api/draft-items/{draft.json()['id']}/confirm", json=payload, headers=headers
+    )
+    assert confirm.status_code == 201
+    return confirm.json()
+
+
+class TestBulkInventoryOperations:
+    """Tests for the set-based bulk inventory endpoints."""
+
+    def test_bulk_delete(self, client, test_user, auth_headers):
+        """Only the requested items are deleted; unknown ids are ignored."""
+        first = _create_inventory_item(client, auth_headers, name="Milk")
+        second = _create_inventory_item(client, auth_headers, name="Eggs")
+        kept = _create_inventory_item(client, auth_headers, name="Butter")
+
+        response = client.post("/api/inventory/bulk/delete", json={
+            "ids": [first["id"], second["id"], str(uuid4())],
+        }, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["affected"] == 2
+
+        remaining = client.get("/api/inventory", headers=auth_headers).json()
+        assert [item["id"] for item in remaining] == [kept["id"]]
+
+        summary = client.get("/api/inventory/summary", headers=auth_headers).json()
+        assert summary["expiring_within_7_days"] == 1
+
+    def test_bulk_quantity_and_location(self, client, test_user, auth_headers):
+        """Quantities are set per item and locations are changed together."""
+        milk = _create_inventory_item(client, auth_headers, name="Milk")
+        cheese = _create_inventory_item(
+            client, auth_headers, name="Cheese", quantity=200, unit="Grams"
+        )
+
+        response = client.patch("/api/inventory/bulk/quantity", json={
+            "items": [
+                {"id": milk["id"], "quantity": 0.5},
+                {"id": cheese["id"], "quantity": 50},
+            ],
+        }, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["affected"] == 2
+
+        response = client.patch("/api/inventory/bulk/location", json={
+            "ids": [milk["id"], cheese["id"]],
+            "storage_location": "freezer",
+        }, headers=auth_headers)
+        assert response.json()["affected"] == 2
+
+        milk = client.get(f"/api/inventory/{milk['id']}", headers=auth_headers).json()
+        cheese = client.get(f"/api/inventory/{cheese['id']}", headers=auth_headers).json()
+        assert milk["quantity"] == 0.5
+        assert cheese["quantity"] == 50
+        assert milk["storage_location"] == cheese["storage_location"] == "freezer"
+
+    def test_bulk_operations_are_user_scoped(self, client, test_user, auth_headers):
+        """Items belonging to another user must not be touched."""
+        item = _create_inventory_item(client, auth_headers)
+        other = client.post("/auth/register", json={
+            "email": "other@example.com", "password": "otherpass123",
+        }).json()
+        other_headers = {"Authorization": f"Bearer {other['access_token']}"}
+
+        response = client.post("/api/inventory/bulk/delete", json={
+            "ids": [item["id"]],
+        }, headers=other_headers)
+        assert response.json() == {"affected": 0, "ids": []}
+        assert client.get(f"/api/inventory/{item['id']}", headers=auth_headers).status_code == 200
+
+
+class TestGroupedInventory:
+    """Tests for the server-side merged inventory view."""
+
+    def test_groups_by_name_expiry_and_unit_group(self, client, test_user, auth_headers):
+        """Same name/expiry/unit group merge with base-unit summing."""
+        expiry = (date.today() + timedelta(days=5)).isoformat()
+        first = _create_inventory_item(
+            client, auth_headers, name="Cheddar", quantity=800, unit="Grams", expiry_date=expiry
+        )
+        second = _create_inventory_item(
+            client, auth_headers, name="cheddar ", quantity=0.5, unit="Kilograms", expiry_date=expiry
+        )
+        _create_inventory_item(
+            client, auth_headers, name="Cheddar", quantity=2, unit="Pieces", expiry_date=expiry
+        )
+        _create_inventory_item(client, auth_headers, name="Milk")
+
+        response = client.get("/api/inventory/grouped", headers=auth_headers)
+        assert response.status_code == 200
+        groups = response.json()
+        assert len(groups) == 3
+
+        weight = next(g for g in groups if g["base_unit"] == "Grams")
+        assert weight["merged_count"] == 2
+        assert weight["merged_ids"] == sorted([first["id"], second["id"]])
+        assert weight["id"] == weight["merged_ids"][0]  # Stable representative
+        assert weight["base_quantity"] == 1300
+        assert (weight["quantity"], weight["unit"]) == (1.3, "Kilograms")
+
+        # Sorted by expiry: the cheddar rows (5 days) come before milk (7 days)
+        assert groups[-1]["name"] == "Milk"
+
+
+class TestExpiringInventory:
+    """Tests for the expiring-soon query and the incremental summary."""
+
+    def test_expiring_within(self, client, test_user, auth_headers):
+        """Only items expiring inside the window are returned, soonest first."""
+        today = date.today()
+        soon = _create_inventory_item(
+            client, auth_headers, name="Fish", expiry_date=(today + timedelta(days=2)).isoformat()
+        )
+        _create_inventory_item(
+            client, auth_headers, name="Rice", expiry_date=(today + timedelta(days=30)).isoformat()
+        )
+        expired = _create_inventory_item(
+            client, auth_headers, name="Yogurt", expiry_date=(today - timedelta(days=1)).isoformat()
+        )
+
+        response = client.get("/api/inventory/expiring?within=3", headers=auth_headers)
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()] == [soon["id"]]
+
+        response = client.get(
+            "/api/inventory/expiring?within=3&include_expired=true", headers=auth_headers
+        )
+        assert [item["id"] for item in response.json()] == [expired["id"], soon["id"]]
+
+    def test_summary_tracks_confirm_update_and_delete(self, client, test_user, auth_headers):
+        """Summary counts follow every mutation without a rebuild."""
+        today = date.today()
+        today_item = _create_inventory_item(
+            client, auth_headers, name="Bread", expiry_date=today.isoformat()
+        )
+        _create_inventory_item(
+            client, auth_headers, name="Ham", expiry_date=(today + timedelta(days=5)).isoformat()
+        )
+
+        summary = client.get("/api/inventory/summary", headers=auth_headers).json()
+        assert summary == {
+            "expired": 0,
+            "expiring_today": 1,
+            "expiring_within_3_days": 1,
+            "expiring_within_7_days": 2,
+            "earliest_expiry": today.isoformat(),
+        }
+
+        client.put(f"/api/inventory/{today_item['id']}", json={
+            "expiry_date": (today + timedelta(days=2)).isoformat(),
+        }, headers=auth_headers)
+        summary = client.get("/api/inventory/summary", headers=auth_headers).json()
+        assert summary["expiring_today"] == 0
+        assert summary["expiring_within_3_days"] == 1
+
+        client.delete(f"/api/inventory/{today_item['id']}", headers=auth_headers)
+        summary = client.get("/api/inventory/summary", headers=auth_headers).json()
+        assert summary["expiring_within_3_days"] == 0
+        assert summary["expiring_within_7_days"] == 1
+        assert summary["earliest_expiry"] == (today + timedelta(days=5)).isoformat()
+
+    def test_summary_backfills_inventory_without_buckets(self, client, db_session, test_user, auth_headers):
+        """Items written before the summary existed are counted on the first read."""
+        user, _ = test_user
+        today = date.today()
+        db_session.add_all([
+            InventoryItem(
+                user_id=user.id, name=name, category="dairy", quantity=Decimal("1"), unit="pieces",
+                storage_location="fridge", expiry_date=today + timedelta(days=days)
+            )
+            for name, days in (("Milk", 1), ("Yoghurt", 1), ("Butter", 30))
+        ])
+        db_session.commit()
+
+        summary = client.get("/api/inventory/summary", headers=auth_headers).json()
+        assert (summary["expiring_within_3_days"], summary["earliest_expiry"]) == (
+            2, (today + timedelta(days=1)).isoformat()
+        )
+        # Later changes apply on top of the backfilled buckets
+        _create_inventory_item(client, auth_headers, name="Cream", expiry_date=today.isoformat())
+        assert client.get("/api/inventory/summary", headers=auth_headers).json()["expiring_within_3_days"] == 3
+
+    def test_first_write_backfills_legacy_inventory(self, client, db_session, test_user, auth_headers):
+        """A legacy user's first write after the summary existed still counts their older items."""
+        user, _ = test_user
+        tomorrow = date.today() + timedelta(days=1)
+        db_session.add(InventoryItem(
+            user_id=user.id, name="Milk", category="dairy", quantity=Decimal("1"), unit="pieces",
+            storage_location="fridge", expiry_date=tomorrow
+        ))
+        db_session.commit()
+
+        _create_inventory_item(client, auth_headers, name="Cream", expiry_date=tomorrow.isoformat())
+        assert client.get("/api/inventory/summary", headers=auth_headers).json()["expiring_within_3_days"] == 2
+
+
+class TestDeltaSync:
+    """Tests for cursor-based delta sync."""
+
+    def test_full_then_delta_then_steady_state(self, client, test_user, auth_headers):
+        """First sync is a snapshot; later syncs only return changes."""
+        milk = _create_inventory_item(client, auth_headers, name="Milk")
+        eggs = _create_inventory_item(client, auth_headers, name="Eggs")
+
+        full = client.get("/api/sync", headers=auth_headers).json()
+        assert full["reset"] is True
+        assert {item["id"] for item in full["inventory_items"]} == {milk["id"], eggs["id"]}
+        cursor = full["cursor"]
+
+        steady = client.get(f"/api/sync?since={cursor}", headers=auth_headers).json()
+        assert steady["cursor"] == cursor
+        assert steady["inventory_items"] == steady["draft_items"] == []
+        assert steady["deleted_inventory_ids"] == []
+
+        client.patch(f"/api/inventory/{milk['id']}/quantity", json={"quantity": 0.5},
+                     headers=auth_headers)
+        client.delete(f"/api/inventory/{eggs['id']}", headers=auth_headers)
+        draft = client.post("/api/draft-items", json={"name": "Bread"}, headers=auth_headers).json()
+
+        delta = client.get(f"/api/sync?since={cursor}", headers=auth_headers).json()
+        assert delta["reset"] is False
+        assert delta["cursor"] > cursor
+        assert [item["id"] for item in delta["inventory_items"]] == [milk["id"]]
+        assert delta["inventory_items"][0]["quantity"] == 0.5
+        assert [item["id"] for item in delta["draft_items"]] == [draft["id"]]
+        assert delta["deleted_inventory_ids"] == [eggs["id"]]
+
+    def test_cursor_older_than_pruned_tombstones_resets(self, client, db_session, test_user, auth_headers):
+        """Clients behind the pruning watermark get a full snapshot."""
+        item = _create_inventory_item(client, auth_headers)
+        cursor = client.get("/api/sync", headers=auth_headers).json()["cursor"]
+        client.delete(f"/api/inventory/{item['id']}", headers=auth_headers)
+
+        prune_tombstones(db_session, older_than=datetime.now(timezone.utc) + timedelta(days=1))
+
+        response = client.get(f"/api/sync?since={cursor}", headers=auth_headers).json()
+        assert response["reset"] is True
+        assert response["inventory_items"] == []
+
+
+class TestConditionalListing:
+    """Tests for ETag / If-None-Match on list endpoints."""
+
+    def test_not_modified_until_a_mutation(self, client, test_user, auth_headers):
+        """The list ETag holds until any draft or inventory change."""
+        item = _create_inventory_item(client, auth_headers)
+        first = client.get("/api/inventory", headers=auth_headers)
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        cached = client.get("/api/inventory", headers={**auth_headers, "If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag and cached.content == b""
+
+        # Any mutation, even to a draft, moves the version on
+        client.post("/api/draft-items", json={"name": "Bread"}, headers=auth_headers)
+        assert client.get(
+            "/api/inventory", headers={**auth_headers, "If-None-Match": etag}
+        ).status_code == 200
+
+        etag = client.get("/api/inventory", headers=auth_headers).headers["etag"]
+        client.patch(f"/api/inventory/{item['id']}/quantity", json={"quantity": 2}, headers=auth_headers)
+        refreshed = client.get("/api/inventory", headers={**auth_headers, "If-None-Match": etag})
+        assert refreshed.status_code == 200
+        assert refreshed.json()[0]["quantity"] == 2
+
+    def test_etag_is_per_user(self, client, test_user, auth_headers, db_session):
+        """Another account at the same version does not match."""
+        other = User(id=uuid4(), email="other@example.com", hashed_password=test_user[0].hashed_password)
+        db_session.add(other)
+        db_session.commit()
+        other_headers = {"Authorization": f"Bearer {create_access_token(user_id=other.id)}"}
+
+        etag = client.get("/api/draft-items", headers=auth_headers).headers["etag"]
+        assert client.get(
+            "/api/draft-items", headers={**other_headers, "If-None-Match": etag}
+        ).status_code == 200
+
+
+class TestCompactListing:
+    """Tests for the column-projected list endpoints."""
+
+    def test_compact_inventory_rows(self, client, test_user, auth_headers):
+        """Rows contain only the requested fields, in request order."""
+        item = _create_inventory_item(client, auth_headers, name="Milk", quantity=1.5)
+
+        response = client.get(
+            "/api/inventory/compact?fields=id,quantity,name", headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "fields": ["id", "quantity", "name"],
+            "rows": [[item["id"], 1.5, "Milk"]],
+        }
+
+    def test_compact_rejects_unknown_fields(self, client, test_user, auth_headers):
+        """Unknown columns are a client error, not silently dropped."""
+        assert client.get(
+            "/api/draft-items/compact?fields=id,user_id", headers=auth_headers
+        ).status_code == 400
+        assert client.get(
+            "/api/draft-items/compact", headers=auth_headers
+        ).json()["rows"] == []
+
+
+class TestExport:
+    """Tests for the streaming export endpoints."""
+
+    def test_inventory_ndjson_export(self, client, test_user, auth_headers):
+        """NDJSON export has one JSON object per item, sorted by expiry."""
+        later = _create_inventory_item(client, auth_headers, name="Rice", expiry_date="2030-01-01")
+        sooner = _create_inventory_item(client, auth_headers, name="Milk", expiry_date="2029-01-01")
+
+        with patch("app.services.export.streaming.EXPORT_BATCH_SIZE", 1):
+            response = client.get("/api/inventory/export", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["id"] for row in rows] == [sooner["id"], later["id"]]
+        assert rows[0]["name"] == "Milk" and rows[0]["expiry_date"] == "2029-01-01"
+
+    def test_draft_csv_export(self, client, test_user, auth_headers):
+        """CSV export starts with a header row of the requested fields."""
+        client.post("/api/draft-items", json={"name": "Eggs", "quantity": 12, "unit": "pcs"}, headers=auth_headers)
+
+        response = client.get(
+            "/api/draft-items/export?format=csv&fields=name,quantity,unit", headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        header, row = csv.reader(io.StringIO(response.text))
+        assert header == ["name", "quantity", "unit"]
+        assert row[0] == "Eggs" and float(row[1]) == 12 and row[2] == "pcs"
+        assert client.get(
+            "/api/draft-items/export?format=xml", headers=auth_headers
+        ).status_code == 422
+
+
+class TestDraftImport:
+    """Tests for bulk import of draft items."""
+
+    def test_csv_import_in_chunks_with_row_errors(self, client, test_user, auth_headers):
+        """Valid rows are imported across chunks; invalid rows are reported by line."""
+        upload = (
+            "name,quantity,unit,category,location,expiration_date\n"
+            "Milk,1,L,dairy,fridge,\n"
+            ",2,pcs,,,\n"
+            "Rice,500,g,grains,pantry,2030-01-01\n"
+            "Eggs,twelve,pcs,,,\n"
+            "Milk,2,L,dairy,fridge,\n"
+        )
+        with patch("app.services.bulk_import.importer.IMPORT_CHUNK_SIZE", 2):
+            response = client.post(
+                "/api/draft-items/import",
+                files={"file": ("pantry.csv", upload, "text/csv")},
+                headers=auth_headers,
+            )
+        assert response.status_code == 200
+        result = response.json()
+        assert result["imported"] == 3 and result["failed"] == 2
+        assert [error["line"] for error in result["errors"]] == [3, 5]
+
+        drafts = {d["name"] + str(d["quantity"]): d for d in client.get("/api/draft-items", headers=auth_headers).json()}
+        assert len(drafts) == 3
+        assert drafts["Rice500.0"]["expiration_date"] == "2030-01-01"
+        assert drafts["Milk1.0"]["expiration_date"] is not None  # Predicted
+        assert drafts["Milk1.0"]["source"] == "import"
+
+    def test_ndjson_import_reports_malformed_lines(self, client, test_user, auth_headers):
+        """A malformed NDJSON line is a row error; format comes from the file name."""
+        upload = '{"name": "Butter", "category": "dairy"}\n{not json\n\n["Milk"]\n'
+        response = client.post(
+            "/api/draft-items/import?predict_expiry=false",
+            files={"file": ("pantry.ndjson", upload, "application/octet-stream")},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        result = response.json()
+        assert result["imported"] == 1
+        assert [error["line"] for error in result["errors"]] == [2, 4]
+        assert result["errors"][0]["error"].startswith("Invalid JSON")
+
+        assert client.post(
+            "/api/draft-items/import",
+            files={"file": ("pantry.txt", upload, "text/plain")},
+            headers=auth_headers,
+        ).status_code == 400
+
+    def test_unreadable_file_keeps_rows_before_the_failure(self, client, test_user, auth_headers):
+        """Rows read before invalid UTF-8 are saved, and the response says where reading stopped."""
+        rows = "".join(f"Item {i},1,pcs\n" for i in range(1000))
+        upload = ("name,quantity,unit\n" + rows).encode() + b"\xff\xfe,1,pcs\n"
+        response = client.post(
+            "/api/draft-items/import?predict_expiry=false",
+            files={"file": ("pantry.csv", upload, "text/csv")},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        result = response.json()
+        assert 0 < result["imported"] < 1000 and result["failed"] == 0
+        # Header on line 1, one row per line: reading stopped right after the last imported row
+        assert result["aborted"]["line"] == result["imported"] + 2
+        assert "UTF-8" in result["aborted"]["error"]
+        assert len(client.get("/api/draft-items", headers=auth_headers).json()) == result["imported"]
+
+
 class TestImageIngestion:
     """Tests for the image recognition endpoint."""
 
@@ -147,6 +677,87 @@ class TestImageIngestion:
         assert response.status_code == 400
 
 
+class TestIdempotencyKeys:
+    """Tests for Idempotency-Key replay and single-flight."""
+
+    def test_retry_replays_without_creating_a_duplicate(self, client, test_user, auth_headers):
+        """A repeated POST with the same key returns the first response."""
+        headers = {**auth_headers, "Idempotency-Key": "draft-1"}
+        first = client.post("/api/draft-items", json={"name": "Eggs"}, headers=headers)
+        retry = client.post("/api/draft-items", json={"name": "Eggs"}, headers=headers)
+
+        assert first.status_code == retry.status_code == 201
+        assert retry.json()["id"] == first.json()["id"]
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert len(client.get("/api/draft-items", headers=auth_headers).json()) == 1
+        # The replay is measured under the route like the original
+        assert (
+            'http_request_duration_seconds_count{method="POST",route="/api/draft-items",status="201"} 2'
+            in client.get("/metrics").text
+        )
+
+    def test_key_reused_for_different_request_is_rejected(self, client, test_user, auth_headers):
+        """The same key with a different body is a client error, not a replay."""
+        headers = {**auth_headers, "Idempotency-Key": "draft-2"}
+        client.post("/api/draft-items", json={"name": "Eggs"}, headers=headers)
+        response = client.post("/api/draft-items", json={"name": "Milk"}, headers=headers)
+        assert response.status_code == 422
+
+    @patch("app.services.ingestion.image_ingestion.gpt4o_vision_client")
+    def test_concurrent_ingest_makes_one_vision_call(self, mock_vision, client, test_user, auth_headers):
+        """A duplicate sent while the first upload is processing waits for it."""
+        def slow_detect(*args, **kwargs):
+            time.sleep(0.2)
+            return [DetectedFoodItem(name="whole milk", category="dairy", quantity=1, unit="Liters")]
+        mock_vision.detect_food_items.side_effect = slow_detect
+
+        def upload():
+            return client.post(
+                "/api/ingest/image",
+                files={"image": ("fridge.jpg", b"\xff\xd8\xff\xe0" + b"\x00" * 100, "image/jpeg")},
+                data={"storage_location": "fridge"},
+                headers={**auth_headers, "Idempotency-Key": "photo-1"},
+            )
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            responses = list(pool.map(lambda _: upload(), range(2)))
+
+        assert [r.status_code for r in responses] == [201, 201]
+        assert responses[0].json() == responses[1].json()
+        assert mock_vision.detect_food_items.call_count == 1
+
+
+class TestMetrics:
+    """Tests for the Prometheus metrics endpoint."""
+
+    def test_records_route_latency_and_query_counts(self, client, test_user, auth_headers):
+        """Requests are labelled by route template and count their queries."""
+        item = _create_inventory_item(client, auth_headers)
+        client.get(f"/api/inventory/{item['id']}", headers=auth_headers)
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+        text = response.text
+        assert 'http_request_duration_seconds_count{method="GET",route="/api/inventory/{item_id}",status="200"} 1' in text
+        assert 'http_request_db_queries_bucket{method="GET",route="/api/inventory/{item_id}",le="+Inf"} 1' in text
+        # The item lookup needs at least one query
+        assert 'http_request_db_queries_bucket{method="GET",route="/api/inventory/{item_id}",le="0.0"} 0' in text
+
+    @patch("app.services.ingestion.image_ingestion.gpt4o_vision_client")
+    def test_records_vision_call_duration(self, mock_vision, client, test_user, auth_headers):
+        """Vision calls are timed separately, by outcome."""
+        mock_vision.detect_food_items.side_effect = RuntimeError("API down")
+        client.post(
+            "/api/ingest/image",
+            files={"image": ("fridge.jpg", b"fake-image", "image/jpeg")},
+            data={"storage_location": "fridge"},
+            headers=auth_headers,
+        )
+        assert 'vision_call_duration_seconds_count{outcome="error"} 1' in client.get("/metrics").text
+
+
 class TestHealthCheck:
     """Smoke test for the health endpoint."""
 
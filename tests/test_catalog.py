@@ -0,0 +1,55 @@
+"""
+Tests for the food catalog trie and the autocomplete endpoint.
+"""
+import json
+
+from app.services.catalog import (
+    DEFAULT_CATALOG_SOURCE,
+    DEFAULT_CATALOG_TRIE_PATH,
+    CatalogTrie,
+    build_trie,
+    build_trie_file,
+)
+
+
+def test_autocomplete_endpoint(client, test_user, auth_headers):
+    """Any word of a name matches, most popular first, with the defaults to pre-fill."""
+    response = client.get("/api/catalog/autocomplete?prefix=Chee", headers=auth_headers)
+    assert response.status_code == 200
+    suggestions = response.json()
+    assert suggestions[0] == {"name": "Cheddar Cheese", "category": "dairy", "unit": "Grams", "popularity": 80}
+    assert {s["name"] for s in suggestions} >= {"Cream Cheese", "Cottage Cheese"}
+
+    limited = client.get("/api/catalog/autocomplete?prefix=m&limit=2", headers=auth_headers).json()
+    assert [s["name"] for s in limited] == ["Milk", "Beef Mince"]
+    assert client.get("/api/catalog/autocomplete?prefix=qqq", headers=auth_headers).json() == []
+    assert client.get("/api/catalog/autocomplete?prefix=", headers=auth_headers).status_code == 422
+
+
+def test_bundled_trie_matches_catalog():
+    """The committed trie file is the compiled catalog - rebuild it after editing catalog.json."""
+    with open(DEFAULT_CATALOG_SOURCE, encoding="utf-8") as f:
+        expected = build_trie(json.load(f))
+    with open(DEFAULT_CATALOG_TRIE_PATH, "rb") as f:
+        assert f.read() == expected
+
+
+def test_trie_file_round_trip(tmp_path):
+    """Mapped from disk: collapsed edges match part-way, entries appear once, top-k is capped."""
+    source = tmp_path / "catalog.json"
+    source.write_text(json.dumps([
+        {"name": "Crème Fraîche", "category": "dairy", "unit": "Milliliters", "popularity": 30},
+        {"name": "Cream", "category": "dairy", "unit": "Milliliters", "popularity": 40},
+        {"name": "Cream Cheese", "category": "dairy", "unit": "Grams", "popularity": 50},
+        {"name": "Ice Cream", "category": "frozen", "unit": "Milliliters", "popularity": 60},
+        {"name": "Cheese", "category": "dairy", "unit": "Grams", "popularity": 10},
+    ]), encoding="utf-8")
+    output = tmp_path / "catalog.trie"
+    build_trie_file(str(source), str(output), top_k=3)
+    trie = CatalogTrie.open(str(output))
+
+    assert [e.name for e in trie.complete("cr", 10)] == ["Ice Cream", "Cream Cheese", "Cream"]
+    assert [e.name for e in trie.complete("CREAM  CH", 10)] == ["Cream Cheese"]
+    assert [e.name for e in trie.complete("chee", 10)] == ["Cream Cheese", "Cheese"]
+    assert [(e.name, e.unit) for e in trie.complete("crè", 10)] == [("Crème Fraîche", "Milliliters")]
+    assert trie.complete("creamy", 10) == [] and trie.complete("x", 10) == []
@@ -4,14 +4,19 @@ Unit tests for image ingestion service.
 Tests GPT-5.2 vision integration, category/unit normalization,
 and the ingestion pipeline.
 """
+import time
+
 import pytest
 from unittest.mock import patch, MagicMock
 from datetime import date, timedelta
 
+from app.services.ingestion.backends import LocalStubBackend, detection_backends
 from app.services.ingestion.gpt4o_vision import (
     GPT4oVisionClient,
     DetectedFoodItem,
+    gpt4o_vision_client,
 )
+from app.services.ingestion.hedging import HedgedDetector, HedgePolicy
 from app.services.ingestion.image_ingestion import (
     ImageIngestionService,
     GPT4O_DEFAULT_CONFIDENCE,
@@ -161,3 +166,70 @@ class TestImageIngestionService:
 
         assert result.success is False
         assert "API failed" in result.error_message
+
+
+class _FailingBackend:
+    name = "failing"
+
+    def detect_food_items(self, image_bytes):
+        raise RuntimeError("provider down")
+
+
+class TestHedgedDetection:
+    """Tests for detection backends and hedged requests."""
+
+    def test_slow_primary_is_hedged(self):
+        """Past the primary's delay, the secondary's answer is used without waiting."""
+        slow = LocalStubBackend(latency_ms=500, name="slow")
+        fast = LocalStubBackend(items=[DetectedFoodItem(name="eggs")], latency_ms=10, name="fast")
+        detector = HedgedDetector(HedgePolicy(default_delay=0.05, min_delay=0.0))
+
+        started = time.perf_counter()
+        detection = detector.detect([slow, fast], b"\xff\xd8\xff")
+        assert time.perf_counter() - started < 0.3
+        assert (detection.backend, detection.hedged) == ("fast", True)
+        assert [item.name for item in detection.items] == ["eggs"]
+
+    def test_hedge_waits_for_observed_p95(self):
+        """A primary answering within its p95 is never hedged; a failure hands over at once."""
+        primary = LocalStubBackend(latency_ms=20, name="primary")
+        secondary = LocalStubBackend(name="secondary")
+        detector = HedgedDetector(HedgePolicy(min_samples=5, default_delay=0.0, min_delay=0.0))
+        for _ in range(5):
+            detector.window("primary").record(1.0)
+
+        detection = detector.detect([primary, secondary], b"img")
+        assert (detection.backend, detection.hedged, secondary.calls) == ("primary", False, 0)
+
+        detection = detector.detect([_FailingBackend(), secondary], b"img")
+        assert (detection.backend, detection.hedged) == ("secondary", True)
+        with pytest.raises(RuntimeError, match="provider down"):
+            detector.detect([_FailingBackend(), _FailingBackend()], b"img")
+
+    def test_empty_answer_only_wins_when_nothing_better_can_arrive(self):
+        """An empty answer hands over at once and is used only if every other backend fails."""
+        empty = LocalStubBackend(items=[], name="empty")
+        slow = LocalStubBackend(items=[DetectedFoodItem(name="eggs")], latency_ms=50, name="slow")
+        detector = HedgedDetector(HedgePolicy(default_delay=10.0, min_delay=0.0))
+
+        started = time.perf_counter()
+        detection = detector.detect([empty, slow], b"img")
+        assert time.perf_counter() - started < 1.0  # Not after the 10 s hedge delay
+        assert (detection.backend, detection.hedged) == ("slow", True)
+        assert [item.name for item in detection.items] == ["eggs"]
+
+        detection = detector.detect([empty, _FailingBackend()], b"img")
+        assert (detection.backend, detection.hedged, detection.items) == ("empty", True, [])
+
+    def test_registry_and_offline_service(self):
+        """Backends are created by name; the local stub runs the full pipeline offline."""
+        assert detection_backends.create("openai") is gpt4o_vision_client
+        assert detection_backends.create("openai:gpt-5-mini").model == "gpt-5-mini"
+        assert detection_backends.create("local:250").latency_ms == 250
+        with pytest.raises(ValueError, match="Unknown detection backend"):
+            detection_backends.create("tesseract")
+
+        service = ImageIngestionService(backends=[detection_backends.create("local")])
+        result = service.ingest_from_image(image_bytes=b"\xff\xd8\xff", storage_location="fridge")
+        assert result.success is True and result.backend == "local"
+        assert [item.unit for item in result.detected_items] == ["Liters", "Grams", "Pieces"]
@@ -0,0 +1,130 @@
+"""
+Query-count and latency budgets for API endpoints.
+
+Each endpoint declares how many SQL statements and commits it may issue
+and how long it may take against a populated inventory. A change that
+introduces an N+1 pattern or per-item commits fails here like a
+functional regression. Budgets are the current counts, so raise one only
+together with the change that justifies it.
+
+Latency budgets are loose ceilings for the SQLite test database and are
+only enforced with --perf or PERF_BUDGET_SCALE set (which also scales
+them, for slow machines); query and commit counts are always checked.
+"""
+import pytest
+from unittest.mock import patch
+
+from app.services.ingestion.gpt4o_vision import DetectedFoodItem
+from tests.test_api import _create_inventory_item
+
+ITEM_COUNT = 20
+
+# (method, path, max queries, max commits, max ms). {item_id} is the first item.
+# Lists with ETags spend one extra primary-key lookup on the data version.
+READ_BUDGETS = [
+    ("GET", "/api/inventory", 2, 0, 100),
+    ("GET", "/api/inventory/{item_id}", 1, 0, 50),
+    ("GET", "/api/inventory/compact", 2, 0, 50),
+    ("GET", "/api/inventory/grouped", 2, 0, 100),
+    ("GET", "/api/inventory/expiring?within=7", 1, 0, 50),
+    ("GET", "/api/inventory/summary", 1, 0, 50),
+    ("GET", "/api/inventory/export", 1, 0, 100),
+    ("GET", "/api/draft-items", 2, 0, 50),
+    ("GET", "/api/sync?since=0", 3, 0, 100),
+]
+
+
+@pytest.fixture
+def populated_inventory(client, test_user, auth_headers):
+    """ITEM_COUNT inventory items across a few names, returned as JSON."""
+    return [
+        _create_inventory_item(client, auth_headers, name=f"Item {i % 5}")
+        for i in range(ITEM_COUNT)
+    ]
+
+
+@pytest.mark.parametrize("method,path,max_queries,max_commits,max_ms", READ_BUDGETS)
+def test_read_endpoint_budgets(
+    client, auth_headers, populated_inventory, perf_budget,
+    method, path, max_queries, max_commits, max_ms
+):
+    """Reads cost a constant number of queries, whatever the inventory size."""
+    path = path.format(item_id=populated_inventory[0]["id"])
+    with perf_budget(max_queries=max_queries, max_commits=max_commits, max_ms=max_ms):
+        response = client.request(method, path, headers=auth_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("path", ["/api/inventory", "/api/inventory/compact", "/api/draft-items"])
+def test_unchanged_poll_is_one_lookup(client, auth_headers, populated_inventory, perf_budget, path):
+    """A conditional GET for an unchanged list never reads the item tables."""
+    etag = client.get(path, headers=auth_headers).headers["etag"]
+    with perf_budget(max_queries=1, max_commits=0, max_ms=50):
+        response = client.get(path, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_me_is_free_when_cached(client, test_user, auth_headers, perf_budget):
+    """A repeated /auth/me is served without touching the database."""
+    client.get("/auth/me", headers=auth_headers)
+    with perf_budget(max_queries=0, max_ms=50):
+        assert client.get("/auth/me", headers=auth_headers).status_code == 200
+
+
+def test_bulk_writes_are_single_statement(client, auth_headers, populated_inventory, perf_budget):
+    """
+    Bulk updates and deletes do not scale their queries with the item count.
+    Each spends one statement recording consumption history for restock forecasts.
+    """
+    items = populated_inventory
+    with perf_budget(max_queries=3, max_commits=1, max_ms=100):
+        response = client.patch(
+            "/api/inventory/bulk/quantity",
+            json={"items": [{"id": item["id"], "quantity": 3} for item in items[:10]]},
+            headers=auth_headers,
+        )
+    assert response.status_code == 200
+
+    with perf_budget(max_queries=6, max_commits=1, max_ms=100):
+        response = client.post(
+            "/api/inventory/bulk/delete",
+            json={"ids": [item["id"] for item in items[10:]]},
+            headers=auth_headers,
+        )
+    assert response.status_code == 200
+
+
+def test_confirm_draft_budget(client, test_user, auth_headers, perf_budget):
+    """Promoting a draft is one transaction with a fixed number of statements."""
+    draft = client.post("/api/draft-items", json={"name": "Eggs"}, headers=auth_headers).json()
+    # The user's first inventory change also builds their expiry summary:
+    # marker row and rebuild in place of one bucket upsert
+    with perf_budget(max_queries=10, max_commits=1, max_ms=100):
+        response = client.post(
+            f"/api/draft-items/{draft['id']}/confirm",
+            json={
+                "name": "Eggs", "category": "dairy", "quantity": 12, "unit": "pcs",
+                "storage_location": "fridge", "expiry_date": "2030-01-01",
+            },
+            headers=auth_headers,
+        )
+    assert response.status_code == 201
+
+
+@patch("app.services.ingestion.image_ingestion.gpt4o_vision_client")
+def test_ingest_image_writes_once(mock_vision, client, test_user, auth_headers, perf_budget):
+    """All detected items are inserted in one statement and one commit."""
+    mock_vision.detect_food_items.return_value = [
+        DetectedFoodItem(name=f"item {i}", category="dairy", quantity=1, unit="Liters")
+        for i in range(8)
+    ]
+    # One change-sequence upsert and one INSERT
+    with perf_budget(max_queries=2, max_commits=1, max_ms=200):
+        response = client.post(
+            "/api/ingest/image",
+            files={"image": ("fridge.jpg", b"\xff\xd8\xff\xe0" + b"\x00" * 100, "image/jpeg")},
+            data={"storage_location": "fridge"},
+            headers=auth_headers,
+        )
+    assert response.status_code == 201
+    assert len(response.json()) == 8
@@ -0,0 +1,61 @@
+"""
+Tests for the ingredient index and expiry-weighted recipe suggestions.
+"""
+from datetime import date, timedelta
+
+from app.services.recipes import RecipeIndex, normalize_ingredient
+from tests.test_api import _create_inventory_item
+
+TODAY = date(2026, 5, 4)
+
+RECIPES = [
+    {"id": 1, "title": "Omelette", "ingredients": ["Eggs", "Milk", "salt"]},
+    {"id": 2, "title": "Tomato salad", "ingredients": ["Tomatoes", "Red onion", "olive oil"]},
+    {"id": 3, "title": "Shakshuka", "ingredients": ["eggs", "tomatoes", "bell pepper", "onion"]},
+    {"id": 4, "title": "Cherry tomato pasta", "ingredients": ["pasta", "cherry tomatoes"]},
+]
+
+
+def test_normalization_and_matching():
+    """Plurals, case, synonyms and descriptive words all land on the index key."""
+    index = RecipeIndex(RECIPES)
+    assert normalize_ingredient("Cherry Tomatoes!") == "cherry tomato"
+    assert normalize_ingredient("Courgettes") == "zucchini"
+    assert index.match_keys("Free-range eggs") == ("egg",)
+    assert index.match_keys("cherry tomatoes") == ("cherry tomato",)
+    assert index.match_keys("red peppers") == ("bell pepper",)
+    assert index.match_keys("chocolate") == ()
+
+
+def test_ranking_prefers_coverage_of_expiring_items():
+    """Among equally covered recipes, the one using food about to expire wins."""
+    index = RecipeIndex(RECIPES)
+    inventory = [
+        ("eggs", TODAY + timedelta(days=10)),
+        ("milk", TODAY + timedelta(days=10)),
+        ("tomatoes", TODAY),
+        ("red onion", TODAY + timedelta(days=10)),
+        ("expired pasta", TODAY - timedelta(days=1)),
+    ]
+    suggestions = index.suggest(inventory, TODAY, limit=2)
+
+    # Staples (salt, olive oil) are neither required nor reported missing
+    assert [s.title for s in suggestions] == ["Tomato salad", "Omelette"]
+    assert suggestions[0].coverage == 1.0
+    assert suggestions[0].score > suggestions[1].score
+    assert suggestions[1].missing_ingredients == []
+
+
+def test_suggestions_are_cached_per_inventory_version(client, test_user, auth_headers, perf_budget):
+    """A repeat request is one lookup; changing the inventory recomputes."""
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    _create_inventory_item(client, auth_headers, name="Eggs", expiry_date=tomorrow)
+    first = client.get("/api/recipes/suggested?limit=3", headers=auth_headers).json()
+    assert first and all("eggs" in s["matched_ingredients"] for s in first)
+
+    with perf_budget(max_queries=1, max_commits=0):
+        assert client.get("/api/recipes/suggested?limit=3", headers=auth_headers).json() == first
+
+    _create_inventory_item(client, auth_headers, name="Bacon")
+    after = client.get("/api/recipes/suggested?limit=3", headers=auth_headers).json()
+    assert after[0]["title"] == "Spaghetti carbonara"
@@ -0,0 +1,103 @@
+"""
+Tests for consumption history, the restock forecast batch and the shopping list.
+"""
+from datetime import date, timedelta
+from uuid import uuid4
+
+import numpy as np
+
+from app.models.restock import QuantityChange
+from app.services.restock import ForecastParams, UserHistory, forecast_products, run_restock_batch
+from tests.conftest import TestSessionLocal
+from tests.test_api import _create_inventory_item
+
+TODAY = date.today()
+PARAMS = ForecastParams(half_life_days=14, min_span_days=7, min_events=2)
+
+
+def test_quantity_history_feeds_the_shopping_list(client, test_user, auth_headers):
+    """Decreases and consumption count as use; additions, waste and one-off deletions do not."""
+    milk = _create_inventory_item(client, auth_headers, name="Milk", quantity=4.0)
+    client.patch(f"/api/inventory/{milk['id']}/quantity", json={"quantity": 3}, headers=auth_headers)
+    client.patch(f"/api/inventory/{milk['id']}/quantity", json={"quantity": 3.5}, headers=auth_headers)
+    client.post(
+        f"/api/inventory/{milk['id']}/events", json={"kind": "consumed", "quantity": 1.5}, headers=auth_headers
+    )
+    client.post(f"/api/inventory/{milk['id']}/events", json={"kind": "wasted", "quantity": 1}, headers=auth_headers)
+    bread = _create_inventory_item(client, auth_headers, name="Bread", category="bakery", unit="pieces")
+    client.delete(f"/api/inventory/{bread['id']}", headers=auth_headers)
+
+    result = run_restock_batch(session_factory=TestSessionLocal, today=TODAY, workers=0)
+    assert (result.users, result.forecasts) == (1, 1)
+
+    suggested = client.get("/api/shopping-list/suggested", headers=auth_headers).json()
+    assert len(suggested) == 1
+    milk_forecast = suggested[0]
+    # 2.5 L used today, spread over the minimum 7-day span; 1 L left
+    assert (milk_forecast["product"], milk_forecast["unit"]) == ("milk", "Milliliters")
+    assert milk_forecast["on_hand"] == 1000.0
+    assert 400 < milk_forecast["daily_rate"] < 425
+    assert milk_forecast["days_left"] == 2
+    assert client.get("/api/shopping-list/suggested?within=1", headers=auth_headers).json() == []
+
+
+def test_merging_a_group_records_only_what_was_consumed(client, test_user, auth_headers):
+    """Folding grouped rows into one is not use; only the consumption recorded afterwards is."""
+    rows = [_create_inventory_item(client, auth_headers, name="Milk", quantity=q) for q in (1.0, 2.0)]
+    kept_id = min(row["id"] for row in rows)
+
+    response = client.post(
+        "/api/inventory/merge", json={"ids": [row["id"] for row in rows], "quantity": 3, "unit": "liters"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert (response.json()["id"], response.json()["quantity"]) == (kept_id, 3.0)
+    client.post(f"/api/inventory/{kept_id}/events", json={"kind": "consumed", "quantity": 1}, headers=auth_headers)
+
+    inventory = client.get("/api/inventory", headers=auth_headers).json()
+    assert [(item["id"], item["quantity"]) for item in inventory] == [(kept_id, 2.0)]
+    db = TestSessionLocal()
+    try:
+        assert [float(change.quantity) for change in db.query(QuantityChange)] == [1.0]
+    finally:
+        db.close()
+
+
+def test_batch_in_process_pool_replaces_stale_forecasts(client, test_user, auth_headers):
+    """Pool workers produce the same forecasts, and users without recent history lose theirs."""
+    eggs = _create_inventory_item(client, auth_headers, name="Eggs", quantity=12, unit="pieces")
+    for quantity in (10, 8, 6):
+        client.patch(f"/api/inventory/{eggs['id']}/quantity", json={"quantity": quantity}, headers=auth_headers)
+
+    inline = run_restock_batch(session_factory=TestSessionLocal, today=TODAY, workers=0)
+    before = client.get("/api/shopping-list/suggested?within=30", headers=auth_headers).json()
+    pooled = run_restock_batch(session_factory=TestSessionLocal, today=TODAY, workers=2, users_per_task=1)
+    assert pooled == inline
+    assert client.get("/api/shopping-list/suggested?within=30", headers=auth_headers).json() == before
+    assert before[0]["name"] == "Eggs" and before[0]["on_hand"] == 6.0
+
+    # Months later the history has aged out of the lookback window
+    later = run_restock_batch(session_factory=TestSessionLocal, today=TODAY + timedelta(days=120), workers=0)
+    assert (later.users, later.forecasts) == (0, 0)
+    assert client.get("/api/shopping-list/suggested?within=365", headers=auth_headers).json() == []
+
+
+def test_steady_use_forecasts_its_own_rate():
+    """Constant daily use rates at exactly that amount; sparse products are skipped."""
+    day = date(2026, 5, 20)
+    days = np.arange(day.toordinal() - 13, day.toordinal() + 1)
+    history = UserHistory(
+        user_id=uuid4(),
+        products=[("rice", "Grams"), ("coffee", "Grams"), ("saffron", "Grams")],
+        names=["Rice", "Coffee", "Saffron"],
+        codes=np.concatenate([np.zeros(14, dtype=np.int64), np.ones(14, dtype=np.int64), [2]]),
+        days=np.concatenate([days, days, [day.toordinal()]]),
+        amounts=np.concatenate([np.full(14, 100.0), np.full(14, 20.0), [1.0]]),
+        on_hand=np.array([250.0, 1000.0, 5.0]),
+    )
+
+    forecasts = forecast_products(history, day, PARAMS)
+    assert [(f.product, f.daily_rate) for f in forecasts] == [("rice", 100.0), ("coffee", 20.0)]
+    assert forecasts[0].run_out_on == day + timedelta(days=2)
+    assert forecasts[1].run_out_on == day + timedelta(days=50)
+    assert forecasts[0].last_consumed_on == day
@@ -0,0 +1,73 @@
+"""
+Tests for inventory name search and the in-process trigram index.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.models.inventory_item import InventoryItem
+from app.services.search import TrigramIndex, word_trigrams
+from tests.test_api import _create_inventory_item
+
+TODAY = date.today()
+
+
+def _expiring_in(days: int) -> str:
+    return (TODAY + timedelta(days=days)).isoformat()
+
+
+def test_search_ranks_prefix_substring_then_similar(client, test_user, auth_headers):
+    """Word-prefix matches lead, soonest expiry first; typos still find the item."""
+    block = _create_inventory_item(client, auth_headers, name="Parmesan", expiry_date=_expiring_in(20))
+    grated = _create_inventory_item(client, auth_headers, name="Grated Parmesan", expiry_date=_expiring_in(3))
+    _create_inventory_item(client, auth_headers, name="Cheddar", expiry_date=_expiring_in(1))
+
+    hits = client.get("/api/inventory/search?q=parm", headers=auth_headers).json()
+    assert [(h["id"], h["match"]) for h in hits] == [(block["id"], "prefix"), (grated["id"], "prefix")]
+
+    inside = client.get("/api/inventory/search?q=mesan", headers=auth_headers).json()
+    assert {h["match"] for h in inside} == {"substring"}
+
+    typo = client.get("/api/inventory/search?q=parmesean", headers=auth_headers).json()
+    assert [h["id"] for h in typo] == [block["id"], grated["id"]]
+    assert typo[0]["match"] == "similar" and typo[0]["similarity"] > 0.5
+
+    assert client.get("/api/inventory/search?q=zzz", headers=auth_headers).json() == []
+    assert client.get("/api/inventory/search?q=", headers=auth_headers).status_code == 422
+
+
+def test_search_large_pantry_within_budget(client, db_session, test_user, auth_headers, perf_budget):
+    """With thousands of items, a repeat search is two small queries and a few ms."""
+    user, _ = test_user
+    db_session.add_all([
+        InventoryItem(
+            user_id=user.id, name="Parmesan" if i % 500 == 0 else f"Product {i}",
+            category="pantry", quantity=Decimal("1"), unit="pieces", storage_location="pantry",
+            expiry_date=TODAY + timedelta(days=i % 90)
+        )
+        for i in range(3000)
+    ])
+    db_session.commit()
+    assert len(client.get("/api/inventory/search?q=parmesan", headers=auth_headers).json()) == 6
+
+    with perf_budget(max_queries=2, max_commits=0, max_ms=50):
+        hits = client.get("/api/inventory/search?q=parmesan&limit=3", headers=auth_headers).json()
+    assert [h["expiry_date"] for h in hits] == sorted(h["expiry_date"] for h in hits)
+    assert len(hits) == 3
+
+    # An inventory change rebuilds the index on the next search
+    _create_inventory_item(client, auth_headers, name="Parmesan", expiry_date=_expiring_in(-1))
+    assert client.get("/api/inventory/search?q=parmesan&limit=1", headers=auth_headers).json()[0]["name"] == "Parmesan"
+
+
+def test_trigram_index_matches_pg_trgm():
+    """Trigram sets follow pg_trgm, and shared trigrams alone are not a substring match."""
+    assert word_trigrams("Milk!") == {"  m", " mi", "mil", "ilk", "lk "}
+
+    names = ["aba bab", "abab", "Baba"]
+    index = TrigramIndex(names, [TODAY + timedelta(days=i) for i in range(len(names))])
+    hits = index.search("abab", limit=10, threshold=0.9)
+    assert [(names[h.position], h.match, h.similarity) for h in hits] == [("abab", "prefix", 1.0)]
+
+    short = index.search("ab", limit=10, threshold=1.0)
+    assert [(names[h.position], h.match) for h in short] == [("abab", "prefix"), ("aba bab", "prefix"), ("Baba", "substring")]
+    assert index.search("  ", limit=10, threshold=0.0) == []
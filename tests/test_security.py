@@ -0,0 +1,173 @@
+"""
+Unit tests for authentication infrastructure.
+
+Tests the bounded password-hashing executor, bcrypt calibration,
+attempt throttling, the verified-token and user-record caches and the
+revocation filter.
+"""
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.core import security
+from app.core.bcrypt_cost import calibrate_rounds
+from app.core.password_hashing import HashingOverloadedError, PasswordHashingExecutor
+from app.core.revocation import BloomFilter, RevocationFilter
+from app.core.security import TokenClaims, VerifiedTokenCache, create_access_token, decode_token
+from app.core.throttling import SlidingWindowLimiter
+from app.core.user_cache import CachedUser, UserRecordCache
+from app.models.auth_token import RevokedToken
+
+
+class TestPasswordHashingExecutor:
+    """Tests for the dedicated hashing pool."""
+
+    def test_runs_on_dedicated_threads(self):
+        """Work runs off the event loop thread, on the hashing pool."""
+        executor = PasswordHashingExecutor(max_workers=1, max_pending=2)
+        thread_name = asyncio.run(executor.run(lambda: threading.current_thread().name))
+        assert thread_name.startswith("password-hash")
+
+    def test_rejects_when_queue_is_full(self):
+        """Calls beyond max_pending fail fast instead of queueing."""
+        executor = PasswordHashingExecutor(max_workers=1, max_pending=1)
+        release = threading.Event()
+
+        async def scenario():
+            blocked = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0.01)
+            with pytest.raises(HashingOverloadedError):
+                await executor.run(lambda: None)
+            release.set()
+            await blocked
+            # Slot is released once the first call completes
+            assert await executor.run(lambda: "ok") == "ok"
+
+        asyncio.run(scenario())
+
+
+class TestBcryptCalibration:
+    """Tests for picking a bcrypt cost from a latency target."""
+
+    def test_picks_highest_cost_within_target(self):
+        measured = []
+
+        def fake_measure(rounds):
+            measured.append(rounds)
+            return 40.0  # ms at min_rounds; each extra round doubles
+
+        assert calibrate_rounds(250, min_rounds=10, measure=fake_measure) == 12  # 160 ms
+        assert measured == [10]  # Higher costs are extrapolated, not timed
+        assert calibrate_rounds(10, min_rounds=10, measure=fake_measure) == 10  # Never below the floor
+        assert calibrate_rounds(10_000_000, min_rounds=10, max_rounds=16, measure=fake_measure) == 16
+
+
+class TestSlidingWindowLimiter:
+    """Tests for the attempt limiter."""
+
+    def test_limit_and_window(self):
+        """Hits beyond the limit wait until the oldest leaves the window."""
+        limiter = SlidingWindowLimiter(limit=2, window_seconds=10)
+        limiter.hit("a", now=0)
+        limiter.hit("a", now=1)
+        assert limiter.retry_after("a", now=2) == pytest.approx(8)
+        assert limiter.retry_after("b", now=2) == 0
+        assert limiter.retry_after("a", now=10.5) == 0
+
+    def test_bounded_keys(self):
+        """Least recently used keys are evicted past max_keys."""
+        limiter = SlidingWindowLimiter(limit=1, window_seconds=60, max_keys=2)
+        for key in ("a", "b", "c"):
+            limiter.hit(key, now=0)
+        assert limiter.retry_after("a", now=1) == 0
+        assert limiter.retry_after("c", now=1) > 0
+
+
+class TestVerifiedTokenCache:
+    """Tests for the verified-token cache."""
+
+    def setup_method(self):
+        security.verified_token_cache.clear()
+
+    def test_second_decode_skips_verification(self):
+        """A token verified once is answered without calling jwt.decode."""
+        user_id = uuid4()
+        token = create_access_token(user_id=user_id)
+        assert decode_token(token) == user_id
+
+        with patch.object(security.jwt, "decode", side_effect=AssertionError("not cached")):
+            assert decode_token(token) == user_id
+
+    def test_invalid_and_expired_tokens_are_not_served(self):
+        """Bad signatures are never cached and entries die at exp."""
+        assert decode_token("not-a-token") is None
+        assert len(security.verified_token_cache) == 0
+
+        expired = create_access_token(user_id=uuid4(), expires_delta=timedelta(seconds=-1))
+        assert decode_token(expired) is None
+
+        cache = VerifiedTokenCache(max_entries=2)
+        cache.put("t", TokenClaims(user_id=uuid4(), expires_at=100))
+        assert cache.get("t", now=99) is not None
+        assert cache.get("t", now=100) is None
+        assert len(cache) == 0
+
+    def test_bounded_size(self):
+        """Least recently used tokens are evicted past max_entries."""
+        cache = VerifiedTokenCache(max_entries=2)
+        for token in ("a", "b", "c"):
+            cache.put(token, TokenClaims(user_id=uuid4(), expires_at=100))
+        assert cache.get("a", now=0) is None
+        assert cache.get("c", now=0) is not None
+
+
+class TestUserRecordCache:
+    """Tests for the TTL-bounded user-record cache."""
+
+    def test_entries_expire_and_can_be_invalidated(self):
+        cache = UserRecordCache(ttl_seconds=60, max_entries=10)
+        record = CachedUser(id=uuid4(), email="a@example.com", is_active=True, created_at=None)
+
+        cache.put(record, now=0)
+        assert cache.get(record.id, now=59) is record
+        assert cache.get(record.id, now=60) is None  # TTL elapsed
+
+        cache.put(record, now=100)
+        cache.invalidate(record.id)
+        assert cache.get(record.id, now=101) is None
+
+
+class TestRevocationFilter:
+    """Tests for the Bloom-filter backed revocation check."""
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, false_positive_rate=0.01)
+        keys = [f"key-{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        assert all(key in bloom for key in keys)
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        assert false_positives < 300  # ~1% expected
+
+    def test_syncs_revocations_from_database(self, db_session):
+        """Revocations written elsewhere are seen after the next sync."""
+        revocations = RevocationFilter(
+            session_factory=lambda: db_session,
+            sync_seconds=0,
+            rebuild_seconds=3600,
+            capacity=100
+        )
+        assert revocations.is_revoked(["jti-1"]) is False
+
+        db_session.add(RevokedToken(
+            token_key="jti-1",
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=5),
+        ))
+        db_session.commit()
+
+        assert revocations.is_revoked(["jti-1"]) is True
+        assert revocations.is_revoked(["jti-2"]) is False
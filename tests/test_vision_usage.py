@@ -0,0 +1,134 @@
+"""
+Tests for vision call accounting and the usage endpoint.
+"""
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import func, select
+
+from app.models.vision_call import VisionCall
+from app.services.ingestion.accounting import VisionUsageRecorder, encoded_size, vision_usage
+from app.services.ingestion.backends import LocalStubBackend
+from app.services.ingestion.gpt4o_vision import DETECTION_PROMPT_VERSION, GPT4oVisionClient
+from app.services.ingestion.hedging import HedgedDetector, HedgePolicy, accounted_call
+from tests.conftest import TestSessionLocal
+
+
+def _openai_client(calls: list) -> GPT4oVisionClient:
+    """GPT-5.2 client whose API answers one item and reports token usage."""
+    def create(**kwargs):
+        calls.append(kwargs)
+        content = json.dumps({"items": [{"name": "whole milk", "category": "Dairy", "quantity": 1, "unit": "Liters"}]})
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=1200, completion_tokens=80),
+        )
+
+    client = GPT4oVisionClient()
+    client._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return client
+
+
+def _upload(client, auth_headers, image: bytes):
+    return client.post(
+        "/api/ingest/image",
+        files={"image": ("fridge.jpg", image, "image/jpeg")},
+        data={"storage_location": "fridge"},
+        headers=auth_headers,
+    )
+
+
+def test_usage_endpoint_aggregates_calls_and_cache_hits(client, test_user, auth_headers):
+    """Tokens, payload and cache hits add up per day, prompt version and user; admins only."""
+    user, _ = test_user
+    calls = []
+    photo, other = b"\xff\xd8\xff\xe0" + b"\x00" * 100, b"\xff\xd8\xff\xe0" + b"\x01" * 200
+    with patch("app.services.ingestion.image_ingestion.gpt4o_vision_client", _openai_client(calls)):
+        for image in (photo, photo, other):
+            assert _upload(client, auth_headers, image).status_code == 201
+    assert len(calls) == 2  # The repeated photo was answered from the cache
+
+    assert client.get("/api/vision-usage", headers=auth_headers).status_code == 403
+    with patch("app.core.security.ADMIN_USER_IDS", frozenset({str(user.id)})):
+        day = client.get("/api/vision-usage?group_by=day", headers=auth_headers).json()["groups"]
+        by_prompt = client.get("/api/vision-usage?group_by=prompt_version", headers=auth_headers).json()["groups"]
+        by_user = client.get("/api/vision-usage?group_by=user", headers=auth_headers).json()["groups"]
+
+    assert len(day) == 1
+    assert {k: day[0][k] for k in ("calls", "cache_hits", "errors", "input_tokens", "output_tokens", "items")} == {
+        "calls": 3, "cache_hits": 1, "errors": 0, "input_tokens": 2400, "output_tokens": 160, "items": 3
+    }
+    assert day[0]["image_bytes"] == 2 * encoded_size(photo) + encoded_size(other)
+    assert [g["key"] for g in by_prompt] == [DETECTION_PROMPT_VERSION]
+    assert [(g["key"], g["calls"]) for g in by_user] == [(str(user.id), 3)]
+
+
+def _written_calls(expected: int) -> int:
+    """Rows in `vision_calls`, once the flush thread has written `expected` of them (or 2s passed)."""
+    deadline = time.monotonic() + 2
+    while True:
+        with TestSessionLocal() as db:
+            count = db.scalar(select(func.count()).select_from(VisionCall))
+        if count >= expected or time.monotonic() > deadline:
+            return count
+        time.sleep(0.01)
+
+
+def test_recorder_appends_in_batches():
+    """The flush thread writes a full batch in one multi-row INSERT; a failed write is kept for the next flush."""
+    recorder = VisionUsageRecorder(session_factory=TestSessionLocal, flush_size=3, flush_seconds=3600)
+    recorder.start()
+    try:
+        with patch("app.services.ingestion.hedging.vision_usage", recorder):
+            for _ in range(2):
+                accounted_call(LocalStubBackend(), b"img")
+            assert len(recorder.pending()) == 2
+            accounted_call(LocalStubBackend(), b"img")
+        assert _written_calls(3) == 3
+        assert recorder.pending() == []
+    finally:
+        recorder.stop()
+
+    with TestSessionLocal() as db:
+        row = db.scalars(select(VisionCall)).first()
+        assert (row.model, row.item_count, row.image_bytes, row.cache_hit, row.success) == ("local", 3, 4, False, True)
+
+    broken = MagicMock()
+    broken.execute.side_effect = RuntimeError("database unavailable")
+    failing = VisionUsageRecorder(session_factory=lambda: broken, flush_size=100, flush_seconds=3600)
+    with patch("app.services.ingestion.hedging.vision_usage", failing):
+        accounted_call(LocalStubBackend(), b"img")
+    assert failing.flush() == 0 and len(failing.pending()) == 1
+
+
+def test_recorder_flushes_on_a_timer_once_traffic_stops():
+    """A partial batch is written after flush_seconds without another record arriving."""
+    recorder = VisionUsageRecorder(session_factory=TestSessionLocal, flush_size=100, flush_seconds=0.05)
+    recorder.start()
+    try:
+        with patch("app.services.ingestion.hedging.vision_usage", recorder):
+            accounted_call(LocalStubBackend(), b"img")
+        assert _written_calls(1) == 1
+        assert recorder.pending() == []
+    finally:
+        recorder.stop()
+
+
+def test_hedged_calls_are_all_accounted():
+    """The losing primary is still recorded once it finishes, and the hedge is marked."""
+    vision_usage.clear()
+    slow = LocalStubBackend(latency_ms=150, name="slow")
+    fast = LocalStubBackend(name="fast")
+    detector = HedgedDetector(HedgePolicy(default_delay=0.02, min_delay=0.0))
+
+    detection = detector.detect([slow, fast], b"img", user_id=None)
+    assert (detection.record.model, detection.record.hedge) == ("fast", True)
+
+    deadline = time.monotonic() + 2
+    while len(vision_usage.pending()) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    records = sorted(vision_usage.pending(), key=lambda r: r.latency_ms)
+    assert [(r.model, r.hedge, r.success) for r in records] == [("fast", True, True), ("slow", False, True)]
+    vision_usage.clear()